@@ -1,5 +1,6 @@
 from flask import Flask
-from app.configs import env_configs, database, migration, jwt_auth
+from app.configs import env_configs, database, migration, jwt_auth, query_counter, query_inspection, request_metrics, tech_catalog
+from app.configs import commands as cli_commands
 from app.routes import api_blueprint
 
 
@@ -10,6 +11,11 @@ def create_app():
     database.init_app(app)
     migration.init_app(app)
     jwt_auth.init_app(app)
+    query_counter.init_app(app)
+    query_inspection.init_app(app)
+    request_metrics.init_app(app)
+    tech_catalog.init_app(app)
+    cli_commands.init_app(app)
     app.register_blueprint(api_blueprint.bp)
 
     return app
\ No newline at end of file
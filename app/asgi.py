@@ -0,0 +1,168 @@
+"""ASGI entry point, next to the WSGI one (``create_app``).
+
+    uvicorn --factory app.asgi:create_asgi_app
+    gunicorn -k uvicorn.workers.UvicornWorker "app.asgi:create_asgi_app()"
+
+The public read-only views (``ASYNC_VIEWS``) run on the worker's event loop against an
+asyncpg engine: each request gets an ``AsyncSession`` and the unchanged Flask view runs
+inside ``AsyncSession.run_sync``, so every query it sends waits on the loop and a single
+process serves many of these requests at once. Every other request, and NDJSON streams,
+go through the regular WSGI app, at most ``ASGI_SYNC_THREADS`` of them at a time.
+"""
+import asyncio
+import sys
+from io import BytesIO
+
+from app import create_app
+from app.configs.database import create_async_read_engine, db
+from app.controllers.contractor_controller import get_all_contractors
+from app.controllers.developer_controller import get_all_developers
+from app.controllers.job_controller import (filter_jobs, get_all_jobs,
+                                            get_job_by_id, get_job_by_tech,
+                                            get_job_facets)
+from app.services.streaming import is_stream_request
+from asgiref.sync import ThreadSensitiveContext
+from asgiref.wsgi import WsgiToAsgi
+from sqlalchemy.ext.asyncio import AsyncSession
+from werkzeug.exceptions import HTTPException
+
+
+# GET /api, /api/developers, /api/contractors, /api/job, /api/job/info, /api/job/info/<id>, /api/job/facets
+ASYNC_VIEWS = (get_all_jobs, get_all_developers, get_all_contractors, get_job_by_tech,
+               filter_jobs, get_job_by_id, get_job_facets)
+
+
+def read_environ(scope):
+    """The WSGI environ of a bodyless HTTP request, enough to route it and run a read view."""
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf8').decode('latin1'),
+        'PATH_INFO': scope['path'].encode('utf8').decode('latin1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin1'),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'SERVER_NAME': scope['server'][0] if scope.get('server') else 'localhost',
+        'SERVER_PORT': str(scope['server'][1]) if scope.get('server') else '80',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'] = scope['client'][0]
+
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin1').upper().replace('-', '_')
+        if name not in ('CONTENT_LENGTH', 'CONTENT_TYPE'):
+            name = f'HTTP_{name}'
+        value = value.decode('latin1')
+        environ[name] = f'{environ[name]},{value}' if name in environ else value
+
+    return environ
+
+
+class AsyncReadApp:
+
+    def __init__(self, app):
+        self.app = app
+        self.engine = create_async_read_engine(app) \
+            if app.config['SQLALCHEMY_DATABASE_URI'].startswith('postgresql') else None
+        self.wsgi = WsgiToAsgi(app)
+        self._sync_slots = asyncio.Semaphore(app.config.get('ASGI_SYNC_THREADS', 8))
+        self._views = set(ASYNC_VIEWS)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+
+        if scope['type'] == 'http' and self.engine is not None and scope['method'] in ('GET', 'HEAD'):
+            environ = read_environ(scope)
+
+            if self._is_async_view(environ):
+                response = await self._dispatch(environ)
+                if response is not None:
+                    return await self._send(send, *response)
+
+        await self._run_wsgi(scope, receive, send)
+
+    async def _run_wsgi(self, scope, receive, send):
+        # asgiref runs every WSGI call on one thread shared by the process; a
+        # ThreadSensitiveContext gives the request a thread of its own instead
+        async with self._sync_slots:
+            async with ThreadSensitiveContext():
+                await self.wsgi(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self.engine is not None:
+                    await self.engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def _is_async_view(self, environ):
+        try:
+            endpoint, _ = self.app.url_map.bind_to_environ(environ).match()
+        except HTTPException:
+            return False
+
+        return self.app.view_functions.get(endpoint) in self._views
+
+    async def _dispatch(self, environ):
+        async with AsyncSession(self.engine) as session:
+            return await session.run_sync(self._run_view, environ)
+
+    def _run_view(self, session, environ):
+        """What ``Flask.wsgi_app`` does, with ``db.session`` bound to the request's async session.
+
+        Runs in the greenlet ``run_sync`` starts, which is also the scope of ``db.session`` and
+        of the Flask contexts pushed here. Returns None for the requests that have to be served
+        by the WSGI app after all.
+        """
+        db.session.registry.set(session)
+        ctx = self.app.request_context(environ)
+        error = None
+        try:
+            try:
+                ctx.push()
+                if is_stream_request():
+                    return None
+                response = self.app.full_dispatch_request()
+            except Exception as e:
+                error = e
+                response = self.app.handle_exception(e)
+
+            app_iter, status, headers = response.get_wsgi_response(environ)
+            body = b''.join(app_iter)
+            response.close()
+
+            return int(status.split(' ', 1)[0]), headers, body
+        finally:
+            if self.app.should_ignore_error(error):
+                error = None
+            ctx.auto_pop(error)
+            db.session.registry.clear()
+
+    async def _send(self, send, status, headers, body):
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(name.lower().encode('latin1'), value.encode('latin1')) for name, value in headers],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+
+def create_asgi_app():
+    app = create_app()
+
+    # the first request hooks (loading the tech catalog) take a thread lock while they query,
+    # which concurrent requests on the event loop's thread cannot wait for: run them now
+    with app.app_context():
+        app.try_trigger_before_first_request_functions()
+
+    return AsyncReadApp(app)
@@ -0,0 +1,389 @@
+import timeit
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+
+import click
+from flask.cli import AppGroup
+
+bench_cli = AppGroup('bench', help='Micro and endpoint benchmarks.')
+
+
+def _sample_jobs(rows: int):
+    from app.models.contractor_model import ContractorModel
+    from app.models.developer_model import DeveloperModel
+    from app.models.job_model import JobModel
+
+    contractor = ContractorModel(id=1, name='Pedro Musk', email='pedro.space@mail.com', cnpj='13.339.532/0001-09')
+    developer = DeveloperModel(id=1, name='Vitor Menezes', email='menezes.vitor@mail.com',
+                               birthdate=datetime(1990, 10, 17, tzinfo=timezone.utc))
+    expiration = datetime(2030, 12, 12, 23, 59, tzinfo=timezone.utc)
+
+    return [
+        JobModel(id=index, name=f'Job {index}', description='a website about astronomy, using python and react',
+                 price=3000.0 + index, difficulty_level='beginner', expiration_date=expiration + timedelta(minutes=index),
+                 progress='ongoing' if index % 3 else None,
+                 developer=developer if index % 3 else None, contractor=contractor)
+        for index in range(rows)
+    ]
+
+
+def _asdict_public_job(job):
+    job = asdict(job)
+    job['expiration_date'] = datetime.strftime(job['expiration_date'], "%d/%m/%Y %H:%M")
+    if job.get('developer'):
+        job['developer']['birthdate'] = datetime.strftime(job['developer']['birthdate'], "%d/%m/%Y")
+    return job
+
+
+@bench_cli.command('serializers')
+@click.option('--rows', default=5000, show_default=True, help='Jobs serialized per run.')
+@click.option('--repeat', default=5, show_default=True, help='Runs per encoder; the best one is reported.')
+def bench_serializers(rows, repeat):
+    """Compare dataclasses.asdict with the compiled job_public encoder (GET /api)."""
+    from app.services.serializers import encode_many, job_public
+
+    jobs = _sample_jobs(rows)
+
+    if [_asdict_public_job(job) for job in jobs] != encode_many(job_public, jobs):
+        raise click.ClickException('job_public does not produce the same JSON shape as asdict')
+
+    legacy = min(timeit.repeat(lambda: [_asdict_public_job(job) for job in jobs], number=1, repeat=repeat))
+    compiled = min(timeit.repeat(lambda: encode_many(job_public, jobs), number=1, repeat=repeat))
+
+    click.echo(f'{rows} jobs, best of {repeat}')
+    click.echo(f'  asdict + strftime  {legacy * 1000:9.2f} ms  {legacy / rows * 1e6:7.2f} us/job')
+    click.echo(f'  job_public         {compiled * 1000:9.2f} ms  {compiled / rows * 1e6:7.2f} us/job')
+    click.echo(f'  speedup            {legacy / compiled:9.1f}x')
+
+
+@bench_cli.command('login')
+@click.option('--email', help='Log in as this existing account through POST /api/login; '
+                               'without it only the password check is measured.')
+@click.option('--password', help='Password of --email.')
+@click.option('--threads', default=1, show_default=True, help='Concurrent logins.')
+@click.option('--seconds', default=5.0, show_default=True, help='How long to run.')
+def bench_login(email, password, threads, seconds):
+    """Measure logins per second with the configured password hashing."""
+    import os
+    import threading
+    import time
+
+    from app.services.password_hashing import password_hasher
+    from flask import current_app
+
+    app = current_app._get_current_object()
+
+    if email:
+        if password is None:
+            raise click.UsageError('--password is required with --email')
+
+        def login_once(client):
+            response = client.post('/api/login', json={'email': email, 'password': password})
+            if response.status_code != 200:
+                raise click.ClickException(f'login failed: {response.status_code} {response.get_json()}')
+
+    else:
+        password = 'Bench123!'
+        password_hash = password_hasher.hash(password)
+
+        def login_once(client):
+            with app.app_context():
+                password_hasher.verify(password_hash, password)
+
+    counts = [0] * threads
+    deadline = time.perf_counter() + seconds
+
+    def worker(index):
+        client = app.test_client()
+        while time.perf_counter() < deadline:
+            login_once(client)
+            counts[index] += 1
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    cores = min(threads, os.cpu_count() or 1)
+    rate = sum(counts) / elapsed
+
+    click.echo(f"{'POST /api/login' if email else 'password check'}, {app.config.get('PASSWORD_HASH_METHOD')}, "
+               f"{threads} thread(s), concurrent hashes: {app.config.get('PASSWORD_HASH_CONCURRENCY') or 'unbounded'}")
+    click.echo(f'  logins         {sum(counts):9d}')
+    click.echo(f'  logins/s       {rate:9.1f}')
+    click.echo(f'  logins/s/core  {rate / cores:9.1f}')
+
+
+@bench_cli.command('reads')
+@click.option('--path', 'paths', multiple=True, default=['/api', '/api/developers', '/api/job/info?difficulty=beginner'],
+              show_default=True, help='Read endpoint to request, with its query string; repeatable.')
+@click.option('--requests', 'total', default=500, show_default=True, help='Requests per path and mode.')
+@click.option('--concurrency', default=50, show_default=True, help='Requests in flight on the async path.')
+def bench_reads(paths, total, concurrency):
+    """Compare the sync read views with the async path of app.asgi, in this process.
+
+    The sync path serves one request at a time, like a gunicorn sync worker; the async path
+    has up to --concurrency requests in flight on one event loop. The response cache is
+    turned off for both.
+    """
+    import asyncio
+    import time
+
+    from app.asgi import AsyncReadApp
+    from flask import current_app
+
+    app = current_app._get_current_object()
+    app.config['RESPONSE_CACHE_TTL'] = 0
+
+    if not app.config['SQLALCHEMY_DATABASE_URI'].startswith('postgresql'):
+        raise click.ClickException('the async read path runs on Postgres')
+
+    client = app.test_client()
+    read_app = AsyncReadApp(app)
+
+    def run_sync(path):
+        started = time.perf_counter()
+        for _ in range(total):
+            response = client.get(path)
+            if response.status_code != 200:
+                raise click.ClickException(f'GET {path}: {response.status_code}')
+        return time.perf_counter() - started
+
+    async def request_once(path, query_string):
+        scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': query_string, 'root_path': '',
+                 'headers': [], 'http_version': '1.1', 'scheme': 'http', 'server': ('localhost', 80)}
+        statuses = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b''}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                statuses.append(message['status'])
+
+        await read_app(scope, receive, send)
+        if statuses != [200]:
+            raise click.ClickException(f'GET {path}: {statuses}')
+
+    async def run_async(path):
+        path, _, query_string = path.partition('?')
+        slots = asyncio.Semaphore(concurrency)
+
+        async def limited():
+            async with slots:
+                await request_once(path, query_string.encode())
+
+        await request_once(path, query_string.encode())
+        started = time.perf_counter()
+        await asyncio.gather(*(limited() for _ in range(total)))
+        return time.perf_counter() - started
+
+    async def run_all_async():
+        try:
+            return [await run_async(path) for path in paths]
+        finally:
+            await read_app.engine.dispose()
+
+    for path in paths:
+        client.get(path)
+    sync_times = [run_sync(path) for path in paths]
+    async_times = asyncio.run(run_all_async())
+
+    click.echo(f'{total} requests per path, async concurrency {concurrency}')
+    click.echo(f"  {'path':40} {'sync req/s':>10} {'async req/s':>11} {'ratio':>6}")
+    for path, sync_time, async_time in zip(paths, sync_times, async_times):
+        click.echo(f'  {path:40} {total / sync_time:10.1f} {total / async_time:11.1f} {sync_time / async_time:5.1f}x')
+
+
+def _percentile(sorted_values, percent):
+    return sorted_values[min(len(sorted_values) - 1, max(0, -(-len(sorted_values) * percent // 100) - 1))]
+
+
+def _default_baseline(dialect):
+    import os
+
+    from flask import current_app
+
+    return os.path.join(os.path.dirname(current_app.root_path), 'benchmarks', f'endpoints-{dialect}.json')
+
+
+def _regressions(results, baseline, tolerance, slack_ms):
+    """What got worse than ``baseline``: more statements per request, or a p95 over the tolerance."""
+    for route, result in results.items():
+        recorded = baseline.get(route)
+        if recorded is None:
+            continue
+        if result['queries'] > recorded['queries']:
+            yield route, f"{result['queries']:g} statements per request, baseline {recorded['queries']:g}"
+        if result['p95_ms'] > recorded['p95_ms'] * (1 + tolerance) + slack_ms:
+            yield route, f"p95 {result['p95_ms']:.2f} ms, baseline {recorded['p95_ms']:.2f} ms"
+
+
+@bench_cli.command('endpoints')
+@click.option('--contractors', default=100, show_default=True, help='Contractors to seed.')
+@click.option('--developers', default=500, show_default=True, help='Developers to seed.')
+@click.option('--techs', default=20, show_default=True, help='Technologies to seed.')
+@click.option('--jobs', default=5000, show_default=True, help='Jobs to seed.')
+@click.option('--seed', default=1, show_default=True, help='Random seed of the dataset.')
+@click.option('--requests', 'total', default=100, show_default=True, help='Timed requests per route.')
+@click.option('--hashing-requests', default=10, show_default=True,
+              help='Timed requests for the routes that hash a password (login, signups).')
+@click.option('--route', 'only', multiple=True, help="Only this route, as '<METHOD> <rule>'; repeatable.")
+@click.option('--cache/--no-cache', default=False, show_default=True, help='Keep the response cache on.')
+@click.option('--baseline', type=click.Path(dir_okay=False),
+              help='Baseline JSON file  [default: benchmarks/endpoints-<dialect>.json]')
+@click.option('--save', is_flag=True, help='Write the results as the new baseline instead of comparing.')
+@click.option('--tolerance', default=0.5, show_default=True, help='Allowed p95 slowdown over the baseline, as a fraction.')
+@click.option('--slack-ms', default=2.0, show_default=True, help='Allowed p95 slowdown in milliseconds, on top of --tolerance.')
+@click.option('--keep', is_flag=True, help='Leave the seeded data in the database.')
+def bench_endpoints(contractors, developers, techs, jobs, seed, total, hashing_requests, only, cache, baseline, save,
+                    tolerance, slack_ms, keep):
+    """Seed a dataset, request every route of the API and compare the results with a baseline.
+
+    Runs against the configured database (SQLite or Postgres), which must be migrated and
+    empty: the dataset is drawn from --seed, so the same options always produce the same
+    rows. Every route registered on the app has a request in
+    app/commands/endpoint_scenarios.py; reads run first, then writes. For each route the
+    latency percentiles, the requests per second of one client and the SQL statements per
+    request are reported.
+
+    The run fails when a route sends more statements than in the baseline, or its p95 is
+    slower than the baseline's by more than --tolerance and --slack-ms. Baselines hold
+    timings of the machine they were saved on: --save them where they are compared.
+    """
+    import json
+    import os
+    import time
+
+    from app.commands.endpoint_scenarios import build_scenarios, clear_dataset, seed_dataset
+    from app.configs.database import db
+    from app.models.contractor_model import ContractorModel
+    from app.models.developer_model import DeveloperModel
+    from app.models.job_model import JobModel
+    from app.models.tech_model import TechModel
+    from app.services.tech_catalog import tech_catalog
+    from flask import current_app
+    from sqlalchemy import event
+
+    app = current_app._get_current_object()
+    if not cache:
+        app.config['RESPONSE_CACHE_TTL'] = 0
+
+    dialect = db.engine.dialect.name
+    baseline = baseline or _default_baseline(dialect)
+    dataset_options = {'contractors': contractors, 'developers': developers, 'techs': techs, 'jobs': jobs, 'seed': seed}
+
+    recorded = None
+    if not save and os.path.exists(baseline):
+        with open(baseline) as file:
+            recorded = json.load(file)
+        if recorded['dataset'] != dataset_options:
+            raise click.ClickException(f"{baseline} was recorded with {recorded['dataset']}: "
+                                       'run with the same options, or --save a new baseline')
+
+    if any(model.query.first() for model in (ContractorModel, DeveloperModel, JobModel, TechModel)):
+        raise click.ClickException('the benchmark seeds its own data: run it against an empty, migrated database')
+
+    routes = [f'{method} {rule.rule}'
+              for rule in app.url_map.iter_rules() if rule.endpoint != 'static'
+              for method in sorted(rule.methods - {'HEAD', 'OPTIONS'})]
+
+    started = time.perf_counter()
+    dataset = seed_dataset(contractors, developers, techs, jobs, seed)
+    if dialect == 'postgresql':
+        db.session.execute('ANALYZE')
+        db.session.commit()
+    tech_catalog.refresh(force=True)
+    click.echo(f'seeded {contractors} contractors, {developers} developers, {techs} techs and {jobs} jobs '
+               f'on {dialect} in {time.perf_counter() - started:.1f} s')
+
+    statements = [0]
+
+    def count_statement(*args):
+        statements[0] += 1
+
+    results = {}
+    skipped = []
+    try:
+        scenarios = build_scenarios(dataset, hashing_requests)
+        missing = [route for route in routes if route not in scenarios]
+        if missing:
+            raise click.ClickException(f"no request for {', '.join(missing)} in app/commands/endpoint_scenarios.py")
+
+        selected = [route for route in routes if not only or route in only]
+        selected.sort(key=lambda route: not route.startswith('GET '))
+        skipped = [route for route in selected if scenarios[route].postgres_only and dialect != 'postgresql']
+        selected = [route for route in selected if route not in skipped]
+        client = app.test_client()
+        event.listen(db.engine, 'before_cursor_execute', count_statement)
+
+        for route in selected:
+            scenario = scenarios[route]
+            method = route.split(' ', 1)[0]
+            count = min(total, scenario.max_requests or total)
+            if scenario.setup:
+                scenario.setup(count + 1)
+
+            # the first request warms up the view and the caches behind it and is not timed
+            latencies = []
+            queries = 0
+            for index in range(count + 1):
+                kwargs = scenario.request(index)
+                before = statements[0]
+                request_started = time.perf_counter()
+                response = client.open(method=method, **kwargs)
+                elapsed = time.perf_counter() - request_started
+
+                if response.status_code != scenario.expected_status:
+                    raise click.ClickException(f'{route}: {response.status_code} {response.get_data(as_text=True)[:200]}')
+                if index:
+                    latencies.append(elapsed)
+                    queries += statements[0] - before
+
+            latencies.sort()
+            results[route] = {
+                'requests': count,
+                'p50_ms': round(_percentile(latencies, 50) * 1000, 3),
+                'p95_ms': round(_percentile(latencies, 95) * 1000, 3),
+                'p99_ms': round(_percentile(latencies, 99) * 1000, 3),
+                'rps': round(count / sum(latencies), 1),
+                'queries': round(queries / count, 2),
+            }
+    finally:
+        if event.contains(db.engine, 'before_cursor_execute', count_statement):
+            event.remove(db.engine, 'before_cursor_execute', count_statement)
+        if not keep:
+            clear_dataset()
+
+    for route in skipped:
+        click.echo(f'skipped on {dialect}: {route}')
+
+    regressions = list(_regressions(results, recorded['endpoints'], tolerance, slack_ms)) if recorded else []
+    regressed = {route for route, _ in regressions}
+
+    click.echo(f"  {'route':40} {'n':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8} {'queries':>7}")
+    for route, result in results.items():
+        mark = '  REGRESSED' if route in regressed else ''
+        click.echo(f"  {route:40} {result['requests']:4d} {result['p50_ms']:8.2f} {result['p95_ms']:8.2f} "
+                   f"{result['p99_ms']:8.2f} {result['rps']:8.1f} {result['queries']:7g}{mark}")
+
+    if save:
+        os.makedirs(os.path.dirname(os.path.abspath(baseline)), exist_ok=True)
+        with open(baseline, 'w') as file:
+            json.dump({'dialect': dialect, 'dataset': dataset_options, 'endpoints': results}, file, indent=2, sort_keys=True)
+            file.write('\n')
+        click.echo(f'baseline saved to {baseline}')
+        return
+
+    if recorded is None:
+        click.echo(f'no baseline at {baseline}: --save one to compare the next runs with')
+        return
+
+    for route, reason in regressions:
+        click.echo(f'  {route}: {reason}')
+    if regressions:
+        raise click.ClickException(f'{len(regressed)} route(s) regressed against {baseline}')
+    click.echo(f'no regression against {baseline}')
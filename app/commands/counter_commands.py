@@ -0,0 +1,35 @@
+import time
+
+import click
+from flask.cli import AppGroup
+
+counters_cli = AppGroup('counters', help='Per user job counters.')
+
+
+@counters_cli.command('reconcile')
+@click.option('--dry-run', is_flag=True, help='Only report the drift; fails if there is some.')
+@click.option('--show', default=20, show_default=True, help='Drifted users to list.')
+def reconcile_counters(dry_run, show):
+    """Recount the jobs of every contractor and developer and repair the counters that drifted.
+
+    The counters follow every job write of the API; rows written around it (bulk loads,
+    manual SQL) make them drift. The recount is one grouped query over ``jobs``.
+    """
+    from app.configs.database import db
+    from app.models.user_job_counters import COUNTERS, UserJobCountersModel
+
+    started = time.perf_counter()
+    drifted = UserJobCountersModel.reconcile(apply=not dry_run)
+    db.session.commit()
+    elapsed = time.perf_counter() - started
+
+    for (role, user_id), (stored, recounted) in list(drifted.items())[:show]:
+        changes = ', '.join(f'{counter} {stored[counter]} -> {recounted[counter]}'
+                            for counter in COUNTERS if stored[counter] != recounted[counter])
+        click.echo(f'{role:10} {user_id:8d}  {changes}')
+    if len(drifted) > show:
+        click.echo(f'... and {len(drifted) - show} more')
+
+    if dry_run and drifted:
+        raise click.ClickException(f'{len(drifted)} user(s) with drifted counters')
+    click.echo(f'{len(drifted)} user(s) {"drifted" if dry_run else "repaired"} in {elapsed:.1f} s')
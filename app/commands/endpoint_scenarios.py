@@ -0,0 +1,178 @@
+"""Seeded dataset and per-route requests for ``flask bench endpoints``."""
+from datetime import datetime, timezone
+from typing import Callable, NamedTuple, Optional
+
+BENCH_PASSWORD = 'Bench123!'
+_EXPIRATION = datetime(2031, 1, 1, tzinfo=timezone.utc)
+
+
+class Scenario(NamedTuple):
+    """How to call one route: ``request(index)`` returns the test client keyword arguments.
+
+    ``setup(count)``, when set, creates what ``count`` calls consume (jobs to delete or claim,
+    accounts to delete) before the timed run. Password hashing endpoints are capped to
+    ``max_requests`` calls. ``postgres_only`` routes store dates as the client sent them,
+    which only Postgres parses, and are skipped on other databases.
+    """
+    request: Callable[[int], dict]
+    expected_status: int = 200
+    setup: Optional[Callable[[int], None]] = None
+    max_requests: Optional[int] = None
+    postgres_only: bool = False
+
+
+def seed_dataset(contractors: int, developers: int, techs: int, jobs: int, seed: int):
+    """``seed_database`` into an empty database, quietly, with the benchmark's accounts."""
+    from app.commands.seed_commands import seed_database
+
+    return seed_database(contractors, developers, techs, jobs, seed, domain='bench.dev', password=BENCH_PASSWORD,
+                         progress=False)
+
+
+def clear_dataset():
+    """Delete every row of the tables ``seed_dataset`` fills."""
+    from app.configs.database import db
+    from app.models.contractor_model import ContractorModel
+    from app.models.developer_model import DeveloperModel
+    from app.models.developers_techs import DevelopersTechsModel
+    from app.models.job_model import JobModel
+    from app.models.jobs_techs import JobsTechsModel
+    from app.models.tech_model import TechModel
+    from app.models.user_job_counters import UserJobCountersModel
+
+    db.session.rollback()
+    for model in (JobsTechsModel, DevelopersTechsModel, JobModel, DeveloperModel, ContractorModel, TechModel,
+                  UserJobCountersModel):
+        model.query.delete(synchronize_session=False)
+    db.session.commit()
+
+
+def build_scenarios(dataset, hashing_requests: int):
+    """One ``Scenario`` per route of the ``seed_dataset`` ``dataset``, keyed by ``'<METHOD> <rule>'``.
+
+    The authenticated requests act as the first contractor and the first developer of the
+    dataset; the routes that use up what they act on get it from their ``setup``.
+    """
+    from app.commands.seed_commands import _cnpj
+    from app.configs.database import db
+    from app.models.contractor_model import ContractorModel
+    from app.models.developer_model import DeveloperModel
+    from app.models.job_model import JobModel
+    from app.models.user_job_counters import UserJobCountersModel
+    from flask import current_app
+    from flask_jwt_extended import create_access_token
+    from sqlalchemy import select
+
+    contractor = db.session.get(ContractorModel, dataset.contractor_ids[0])
+    developer = db.session.get(DeveloperModel, dataset.developer_ids[0])
+    as_contractor = {'Authorization': f'Bearer {create_access_token(identity=contractor)}'}
+    as_developer = {'Authorization': f'Bearer {create_access_token(identity=developer)}'}
+    # the ops routes 404 unless OPS_TOKEN is set
+    ops_token = current_app.config.get('OPS_TOKEN')
+    as_ops = {'Authorization': f'Bearer {ops_token}'}
+    ops_status = 200 if ops_token else 404
+
+    open_job_id = db.session.execute(select(JobModel.id).where(JobModel.developer_id == None)
+                                     .order_by(JobModel.id)).scalar()
+    contractor_job_id = db.session.execute(select(JobModel.id).where(JobModel.contractor_id == contractor.id,
+                                                                     JobModel.developer_id == None)
+                                           .order_by(JobModel.id)).scalar()
+    techs = dataset.tech_names[:2]
+
+    spare = {}
+
+    def spare_jobs(key):
+        def setup(count):
+            jobs = [JobModel(name=f'Spare job {index}', description='a spare job', price=1.0, difficulty_level='beginner',
+                             expiration_date=_EXPIRATION, contractor_id=contractor.id)
+                    for index in range(count)]
+            db.session.add_all(jobs)
+            UserJobCountersModel.move_job(None, (contractor.id, None, None), count)
+            db.session.commit()
+            spare[key] = [job.id for job in jobs]
+        return setup
+
+    def spare_users(model, key):
+        def setup(count):
+            users = [model(name=f'Spare {index}', email=f'spare.{key}.{index}@bench.dev', password_hash=dataset.password_hash,
+                           **({'birthdate': _EXPIRATION} if model is DeveloperModel else {}))
+                     for index in range(count)]
+            db.session.add_all(users)
+            db.session.commit()
+            spare[key] = [{'Authorization': f'Bearer {create_access_token(identity=user)}'} for user in users]
+        return setup
+
+    def get(path, headers=None):
+        return lambda index: {'path': path, 'headers': headers}
+
+    return {
+        'POST /api/login': Scenario(
+            lambda index: {'path': '/api/login', 'json': {'email': 'developer0@bench.dev', 'password': BENCH_PASSWORD}},
+            max_requests=hashing_requests),
+        'GET /api': Scenario(get('/api')),
+        'POST /api/batch': Scenario(
+            lambda index: {'path': '/api/batch', 'headers': as_contractor, 'json': {'requests': [
+                {'path': '/api/contractors/profile'}, {'path': '/api/contractors/jobs'},
+                {'path': f'/api/job/info/aut/{contractor_job_id}'}, {'path': '/api/contractors/dashboard'},
+            ]}}),
+
+        'POST /api/contractors/signup': Scenario(
+            lambda index: {'path': '/api/contractors/signup', 'json': {
+                'name': f'New contractor {index}', 'email': f'signup.contractor{index}@bench.dev',
+                'cnpj': _cnpj(10 ** 9 + index), 'password': BENCH_PASSWORD}},
+            max_requests=hashing_requests),
+        'GET /api/contractors/profile': Scenario(get('/api/contractors/profile', as_contractor)),
+        'GET /api/contractors': Scenario(get('/api/contractors')),
+        'GET /api/contractors/jobs': Scenario(get('/api/contractors/jobs', as_contractor)),
+        'GET /api/contractors/dashboard': Scenario(get('/api/contractors/dashboard', as_contractor)),
+        'PATCH /api/contractors/update': Scenario(
+            lambda index: {'path': '/api/contractors/update', 'headers': as_contractor,
+                           'json': {'name': f'Contractor 0 v{index}'}}),
+        'DELETE /api/contractors/delete': Scenario(
+            lambda index: {'path': '/api/contractors/delete', 'headers': spare['contractors'][index]},
+            expected_status=204, setup=spare_users(ContractorModel, 'contractors')),
+
+        'POST /api/developers/signup': Scenario(
+            lambda index: {'path': '/api/developers/signup', 'json': {
+                'name': f'New developer {index}', 'email': f'signup.developer{index}@bench.dev',
+                'password': BENCH_PASSWORD, 'birthdate': '17/10/1990',
+                'technologies': [{'name': tech} for tech in techs]}},
+            expected_status=201, max_requests=hashing_requests, postgres_only=True),
+        'GET /api/developers/profile': Scenario(get('/api/developers/profile', as_developer)),
+        'GET /api/developers': Scenario(get('/api/developers')),
+        'GET /api/developers/jobs': Scenario(get('/api/developers/jobs', as_developer)),
+        'GET /api/developers/dashboard': Scenario(get('/api/developers/dashboard', as_developer)),
+        'PATCH /api/developers/update': Scenario(
+            lambda index: {'path': '/api/developers/update', 'headers': as_developer,
+                           'json': {'name': f'Developer 0 v{index}', 'technologies': [{'name': techs[index % len(techs)]}]}}),
+        'DELETE /api/developers/delete': Scenario(
+            lambda index: {'path': '/api/developers/delete', 'headers': spare['developers'][index]},
+            expected_status=204, setup=spare_users(DeveloperModel, 'developers')),
+
+        'GET /api/job': Scenario(get(f'/api/job?tech={techs[0]}&tech={techs[-1]}')),
+        'POST /api/job/create': Scenario(
+            lambda index: {'path': '/api/job/create', 'headers': as_contractor, 'json': {
+                'name': f'New job {index}', 'description': f'a website built with {techs[0]}', 'price': 1000,
+                'difficulty_level': 'beginner', 'expiration_date': '12/12/2031 23:59'}},
+            postgres_only=True),
+        'GET /api/job/info/<int:job_id>': Scenario(get(f'/api/job/info/{open_job_id}')),
+        'GET /api/job/info/aut/<int:job_id>': Scenario(get(f'/api/job/info/aut/{contractor_job_id}', as_contractor)),
+        'PATCH /api/job/update/<int:job_id>': Scenario(
+            lambda index: {'path': f'/api/job/update/{contractor_job_id}', 'headers': as_contractor,
+                           'json': {'price': 1000 + index}}),
+        'DELETE /api/job/delete/<int:job_id>': Scenario(
+            lambda index: {'path': f"/api/job/delete/{spare['delete'][index]}", 'headers': as_contractor},
+            expected_status=204, setup=spare_jobs('delete')),
+        'GET /api/job/info': Scenario(get('/api/job/info?min_price=1000&max_price=5000&difficulty=beginner&sort=price&limit=20')),
+        'GET /api/job/facets': Scenario(get('/api/job/facets?max_price=5000')),
+        'POST /api/job/claim': Scenario(
+            lambda index: {'path': '/api/job/claim', 'headers': as_developer, 'json': {'jobs': spare['claim']}},
+            setup=spare_jobs('claim')),
+        'POST /api/job/claim/<int:job_id>': Scenario(
+            lambda index: {'path': f"/api/job/claim/{spare['claim_by_id'][index]}", 'headers': as_developer},
+            setup=spare_jobs('claim_by_id')),
+
+        'GET /api/ops/cache': Scenario(get('/api/ops/cache', as_ops), expected_status=ops_status),
+        'GET /api/ops/pool': Scenario(get('/api/ops/pool', as_ops), expected_status=ops_status),
+        'GET /api/ops/metrics': Scenario(get('/api/ops/metrics', as_ops), expected_status=ops_status),
+    }
@@ -0,0 +1,134 @@
+import json
+
+import click
+from flask.cli import AppGroup
+
+plans_cli = AppGroup('plans', help='Query plan checks.')
+
+
+def _controller_queries():
+    """The statements the controllers run, with sample arguments, by name."""
+    from app.controllers.job_controller import JOB_WITH_USERS
+    from app.models.contractor_model import ContractorModel
+    from app.models.developer_model import DeveloperModel
+    from app.models.developers_techs import DevelopersTechsModel
+    from app.models.job_model import JobModel
+    from app.models.jobs_techs import JobsTechsModel
+    from app.models.user_job_counters import UserJobCountersModel
+    from app.services.job_facets import facet_counts
+    from app.services.job_filter import build_job_filter
+    from app.services.job_search import search_open_jobs
+    from app.services.pagination import encode_cursor, keyset
+    from sqlalchemy import select
+    from sqlalchemy.orm import joinedload
+    from werkzeug.datastructures import MultiDict
+
+    after = encode_cursor([100])
+    jobs = select(JobModel).options(*JOB_WITH_USERS)
+    contractor_jobs = select(JobModel).options(joinedload(JobModel.developer)).where(JobModel.contractor_id == 1)
+    developer_jobs = select(JobModel).options(joinedload(JobModel.contractor)).where(JobModel.developer_id == 1)
+    search, search_order = search_open_jobs(['python', 'react'])
+
+    def filtered(after=None, **args):
+        job_filter = build_job_filter(MultiDict(args))
+        return keyset(job_filter.statement.options(*JOB_WITH_USERS), job_filter.order_by, 20, after)
+
+    return {
+        'login developer': select(DeveloperModel).where(DeveloperModel.email == 'dev@mail.com'),
+        'login contractor': select(ContractorModel).where(ContractorModel.email == 'con@mail.com'),
+        'open jobs page': keyset(jobs.where(JobModel.progress == None), [JobModel.id], 20),
+        'open jobs next page': keyset(jobs.where(JobModel.progress == None), [JobModel.id], 20, after),
+        'job by id': jobs.where(JobModel.id == 1),
+        'jobs by price page': filtered(min_price='1000', sort='price'),
+        'jobs by price descending next page': filtered(encode_cursor([5000.0, 100]), max_price='5000', sort='-price'),
+        'jobs by difficulty page': filtered(difficulty='beginner'),
+        'jobs by price range and difficulty page': filtered(min_price='1000', max_price='5000', difficulty='beginner', sort='price'),
+        'open jobs by difficulty expiring first page': filtered(difficulty='advanced', open='true', sort='expiration',
+                                                                expires_after='01/01/2031', expires_before='01/07/2031'),
+        'jobs expiring in a window page': filtered(expires_after='01/01/2031', expires_before='01/02/2031', sort='expiration'),
+        'open job facets': facet_counts(MultiDict()),
+        'open job facets by difficulty and price': facet_counts(MultiDict({'difficulty': 'advanced', 'min_price': '1000',
+                                                                           'max_price': '2500'})),
+        'contractor jobs page': keyset(contractor_jobs, [JobModel.id], 20),
+        'contractor jobs by progress page': keyset(contractor_jobs.where(JobModel.progress == 'ongoing'), [JobModel.id], 20),
+        'developer jobs page': keyset(developer_jobs, [JobModel.id], 20),
+        'developer jobs by progress page': keyset(developer_jobs.where(JobModel.progress == 'ongoing'), [JobModel.id], 20),
+        'contractor jobs numbered page': contractor_jobs.order_by(JobModel.id).limit(5).offset(5),
+        'developer jobs numbered page': developer_jobs.order_by(JobModel.id).limit(5).offset(5),
+        'user job counters': select(UserJobCountersModel).where(UserJobCountersModel.role == 'developer',
+                                                                UserJobCountersModel.user_id == 1),
+        'developers page': keyset(DeveloperModel.select_with_technologies(), [DeveloperModel.id], 20, after),
+        'developer profile': DeveloperModel.select_with_technologies().where(DeveloperModel.id == 1),
+        'developer tech ids': select(DevelopersTechsModel.tech_id).where(DevelopersTechsModel.developer_id == 1),
+        'contractors page': keyset(select(ContractorModel), [ContractorModel.id], 20, after),
+        'jobs by tech search': keyset(search, search_order, 20),
+        'jobs by tags': jobs.where(JobModel.id.in_(JobsTechsModel.select_job_ids([1, 2], 'all')), JobModel.developer_id == None)
+                            .order_by(JobModel.id),
+        'job tech ids': select(JobsTechsModel.tech_id).where(JobsTechsModel.job_id == 1),
+    }
+
+
+# a LIMIT costing less than this fraction of its input is expected to stop reading it early
+EARLY_STOP_FRACTION = 0.1
+
+# nodes that pass their first input's rows on as they come, so a LIMIT above stops it too
+_STREAMING_NODES = ('Limit', 'Nested Loop', 'Merge Join', 'Hash Join', 'Memoize', 'Result', 'Subquery Scan')
+
+
+def _sequential_scans(plan, stops_early=False):
+    """Tables read whole: sequential scans, and index scans that walk the entire index to filter it.
+
+    An index walked under a LIMIT the planner expects to fill early (a page in index order,
+    with a filter most rows pass) is not read whole and is not reported.
+    """
+    node_type = plan.get('Node Type')
+    children = plan.get('Plans', ())
+
+    if node_type == 'Seq Scan':
+        yield plan.get('Relation Name')
+    elif node_type in ('Index Scan', 'Index Only Scan') and 'Filter' in plan and 'Index Cond' not in plan and not stops_early:
+        yield f"{plan.get('Relation Name')} via {plan.get('Index Name')}"
+
+    if node_type == 'Limit' and children:
+        stops_early = plan['Total Cost'] < EARLY_STOP_FRACTION * children[0]['Total Cost']
+
+    for position, child in enumerate(children):
+        yield from _sequential_scans(child, stops_early and position == 0 and node_type in _STREAMING_NODES)
+
+
+@plans_cli.command('check')
+@click.option('--verbose', is_flag=True, help='Print every plan.')
+def check_plans(verbose):
+    """EXPLAIN every controller query and fail if any of them needs a sequential scan.
+
+    Sequential scans are disabled for the check, so the planner only falls back to one when no
+    index can serve the query: what it would have to do on a large table, whatever the data in
+    the database the command runs against.
+    """
+    from app.configs.database import db
+
+    if db.engine.dialect.name != 'postgresql':
+        raise click.ClickException('query plans are checked against Postgres')
+
+    connection = db.session.connection()
+    connection.exec_driver_sql('SET LOCAL enable_seqscan = off')
+
+    failures = []
+    try:
+        for name, statement in _controller_queries().items():
+            compiled = statement.compile(dialect=db.engine.dialect, compile_kwargs={'render_postcompile': True})
+            plan = connection.exec_driver_sql('EXPLAIN (FORMAT JSON) ' + str(compiled), compiled.params).scalar()
+            plan = (json.loads(plan) if isinstance(plan, str) else plan)[0]['Plan']
+
+            scanned = sorted(set(_sequential_scans(plan)))
+            if scanned:
+                failures.append(name)
+
+            click.echo(f"{'FULL SCAN' if scanned else 'ok':9}  {name}{'  (' + ', '.join(scanned) + ')' if scanned else ''}")
+            if verbose:
+                click.echo(json.dumps(plan, indent=2))
+    finally:
+        db.session.rollback()
+
+    if failures:
+        raise click.ClickException(f'{len(failures)} query(ies) read a whole table: {", ".join(failures)}')
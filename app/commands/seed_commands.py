@@ -0,0 +1,243 @@
+import csv
+import io
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from typing import NamedTuple
+
+import click
+from flask.cli import with_appcontext
+
+SEED_PASSWORD = 'Seed123!'
+
+# roughly by popularity: the first ones are picked the most (see _TECH_POPULARITY)
+TECH_NAMES = ('Python', 'JavaScript', 'TypeScript', 'Java', 'Go', 'Rust', 'Ruby', 'PHP', 'Kotlin', 'Swift',
+              'React', 'Vue', 'Angular', 'Django', 'Flask', 'Node', 'Postgres', 'Docker', 'Kubernetes', 'AWS',
+              'C#', 'C++', 'Scala', 'Elixir', 'Dart', 'Flutter', 'Svelte', 'Spring', 'Rails', 'Laravel',
+              'MySQL', 'MongoDB', 'Redis', 'GraphQL', 'Terraform', 'Azure', 'GCP', 'Kafka', 'Spark', 'Haskell')
+# of app.models.job_model.DIFFICULTIES
+_DIFFICULTY_WEIGHTS = (4, 4, 2)
+_PROGRESS = (None, 'ongoing', 'completed')
+_PROGRESS_WEIGHTS = (6, 3, 1)
+_KINDS = ('website', 'api', 'dashboard', 'mobile app', 'integration', 'landing page', 'migration', 'bot')
+_TECH_POPULARITY = 1.1
+_EXPIRATION = datetime(2031, 1, 1, tzinfo=timezone.utc)
+_BIRTHDATE = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class Seeded(NamedTuple):
+    contractor_ids: list
+    developer_ids: list
+    tech_names: list
+    password_hash: str
+
+
+def _cnpj(number: int):
+    digits = f'{number:014d}'
+    return f'{digits[:2]}.{digits[2:5]}.{digits[5:8]}/{digits[8:12]}-{digits[12:]}'
+
+
+def _reserve_ids(table, count: int):
+    """Ids for ``count`` new rows of ``table``, taken from its sequence so they can be sent with the rows."""
+    from app.configs.database import db
+    from sqlalchemy import func, select, text
+
+    if db.engine.dialect.name == 'postgresql':
+        return list(db.session.execute(text("SELECT nextval(pg_get_serial_sequence(:table, 'id')) "
+                                            "FROM generate_series(1, :count)"),
+                                       {'table': table.name, 'count': count}).scalars())
+
+    start = db.session.execute(select(func.coalesce(func.max(table.c.id), 0))).scalar() + 1
+    return list(range(start, start + count))
+
+
+def _insert(table, rows):
+    """Insert ``rows`` (dicts with the same keys) with COPY on Postgres, one executemany elsewhere."""
+    from app.configs.database import db
+
+    if not rows:
+        return
+
+    if db.engine.dialect.name != 'postgresql':
+        db.session.execute(table.insert(), rows)
+        return
+
+    # in CSV, an unquoted empty field is NULL; none of the seeded strings are empty
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([row[column] for column in columns] for row in rows)
+    buffer.seek(0)
+
+    cursor = db.session.connection().connection.cursor()
+    cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    cursor.close()
+
+
+def _load(table, count: int, chunk_size: int, make_rows, progress: bool):
+    """Insert ``count`` rows of ``table``, ``chunk_size`` per transaction.
+
+    ``make_rows(ids)`` returns the rows for a chunk, keyed by table, given the ids reserved
+    for it: rows of tables referencing ``table`` go in the same transaction.
+    """
+    from app.configs.database import db
+
+    started = time.perf_counter()
+    with click.progressbar(length=count, label=f'{table.name:12}', show_pos=True, file=None if progress else io.StringIO()) as bar:
+        for start in range(0, count, chunk_size):
+            ids = _reserve_ids(table, min(chunk_size, count - start))
+            for chunk_table, rows in make_rows(ids).items():
+                _insert(chunk_table, rows)
+            db.session.commit()
+            bar.update(len(ids))
+
+    elapsed = time.perf_counter() - started
+    if progress:
+        click.echo(f'{table.name:12} {count:10d} rows in {elapsed:7.1f} s  ({count / elapsed if elapsed else 0:,.0f} rows/s)')
+
+
+def _pick_techs(rng, tech_ids, cum_weights, count):
+    picked = set()
+    while len(picked) < count:
+        picked.add(rng.choices(tech_ids, cum_weights=cum_weights)[0])
+    return sorted(picked)
+
+
+def seed_database(contractors: int, developers: int, techs: int, jobs: int, seed: int = 1, domain: str = 'seed.dev',
+                  password: str = SEED_PASSWORD, chunk_size: int = 50000, progress: bool = True):
+    """Bulk-load a synthetic dataset drawn from ``random.Random(seed)``: the same arguments load the same rows.
+
+    The first ``techs`` names of ``TECH_NAMES`` are used, adding the ones the catalog lacks,
+    and picked with a Zipf-like popularity. Accounts get ``name<n>@domain`` emails, distinct
+    CNPJs and all share the hash of ``password``, computed once. A third of the jobs are
+    ongoing and a tenth completed, with a developer assigned. The job counters are recounted
+    once the jobs are in.
+    """
+    from app.configs.database import db
+    from app.models.contractor_model import ContractorModel
+    from app.models.developer_model import DeveloperModel
+    from app.models.developers_techs import DevelopersTechsModel
+    from app.models.job_model import DIFFICULTIES, JobModel
+    from app.models.jobs_techs import JobsTechsModel
+    from app.models.tech_model import TechModel
+    from app.models.user_job_counters import UserJobCountersModel
+    from app.services.password_hashing import password_hasher
+    from sqlalchemy import select
+
+    if techs < 1:
+        raise click.BadParameter('at least one tech is needed to tag jobs', param_hint='--techs')
+    if jobs and not contractors:
+        raise click.BadParameter('jobs need contractors', param_hint='--contractors')
+
+    for model in (ContractorModel, DeveloperModel):
+        if db.session.execute(select(model.id).where(model.email.like(f'%@{domain}')).limit(1)).first():
+            raise click.ClickException(f'{model.__tablename__} with @{domain} emails exist already: '
+                                       'seed with another --domain')
+
+    rng = random.Random(seed)
+    password_hash = password_hasher.hash(password)
+
+    tech_names = [TECH_NAMES[index] if index < len(TECH_NAMES) else f'Tech{index}' for index in range(techs)]
+    existing = {name.casefold(): tech_id for tech_id, name in db.session.execute(select(TechModel.id, TechModel.name))}
+    missing = [name for name in tech_names if name.casefold() not in existing]
+    _load(TechModel.__table__, len(missing), chunk_size,
+          lambda ids: {TechModel.__table__: [{'id': tech_id, 'name': name} for tech_id, name in zip(ids, missing)]}, progress)
+    existing = {name.casefold(): tech_id for tech_id, name in db.session.execute(select(TechModel.id, TechModel.name))}
+
+    tech_ids = [existing[name.casefold()] for name in tech_names]
+    tech_name_of = dict(zip(tech_ids, tech_names))
+    cum_weights = list(accumulate(1 / (rank + 1) ** _TECH_POPULARITY for rank in range(len(tech_ids))))
+
+    taken_cnpjs = set(db.session.execute(select(ContractorModel.cnpj).where(ContractorModel.cnpj != None)).scalars())
+    cnpj_numbers = (number for number in range(10 ** 14) if _cnpj(number) not in taken_cnpjs)
+    contractor_ids = []
+
+    def contractor_rows(ids):
+        offset = len(contractor_ids)
+        contractor_ids.extend(ids)
+        return {ContractorModel.__table__: [
+            {'id': contractor_id, 'name': f'Contractor {offset + index}', 'email': f'contractor{offset + index}@{domain}',
+             'cnpj': _cnpj(next(cnpj_numbers)), 'password_hash': password_hash}
+            for index, contractor_id in enumerate(ids)
+        ]}
+
+    developer_ids = []
+
+    def developer_rows(ids):
+        offset = len(developer_ids)
+        developer_ids.extend(ids)
+        return {
+            DeveloperModel.__table__: [
+                {'id': developer_id, 'name': f'Developer {offset + index}', 'email': f'developer{offset + index}@{domain}',
+                 'password_hash': password_hash, 'birthdate': _BIRTHDATE + timedelta(days=rng.randrange(365 * 35))}
+                for index, developer_id in enumerate(ids)
+            ],
+            DevelopersTechsModel.__table__: [
+                {'developer_id': developer_id, 'tech_id': tech_id}
+                for developer_id in ids
+                for tech_id in _pick_techs(rng, tech_ids, cum_weights, rng.randint(1, min(5, len(tech_ids))))
+            ],
+        }
+
+    job_count = [0]
+
+    def job_rows(ids):
+        rows, tags = [], []
+        for job_id in ids:
+            index = job_count[0]
+            job_count[0] += 1
+            picked = _pick_techs(rng, tech_ids, cum_weights, rng.randint(1, min(3, len(tech_ids))))
+            kind = rng.choice(_KINDS)
+            progress_value = rng.choices(_PROGRESS, _PROGRESS_WEIGHTS)[0] if developer_ids else None
+            rows.append({
+                'id': job_id,
+                'name': f'{tech_name_of[picked[0]]} {kind} {index}',
+                'description': f'a {kind} built with ' + ' and '.join(tech_name_of[tech_id] for tech_id in picked),
+                'price': float(max(50, round(rng.lognormvariate(7.5, 0.8) / 50) * 50)),
+                'difficulty_level': rng.choices(DIFFICULTIES, _DIFFICULTY_WEIGHTS)[0],
+                'expiration_date': _EXPIRATION + timedelta(hours=rng.randrange(24 * 365)),
+                'progress': progress_value,
+                'contractor_id': rng.choice(contractor_ids),
+                'developer_id': rng.choice(developer_ids) if progress_value else None,
+            })
+            tags.extend({'job_id': job_id, 'tech_id': tech_id} for tech_id in picked)
+        return {JobModel.__table__: rows, JobsTechsModel.__table__: tags}
+
+    _load(ContractorModel.__table__, contractors, chunk_size, contractor_rows, progress)
+    _load(DeveloperModel.__table__, developers, chunk_size, developer_rows, progress)
+    _load(JobModel.__table__, jobs, chunk_size, job_rows, progress)
+
+    # the jobs went in with COPY, past the writes that keep the counters
+    started = time.perf_counter()
+    UserJobCountersModel.reconcile()
+    db.session.commit()
+    if progress:
+        click.echo(f'{"counters":12} recounted in {time.perf_counter() - started:7.1f} s')
+
+    if db.engine.dialect.name == 'postgresql':
+        db.session.execute('ANALYZE')
+        db.session.commit()
+
+    return Seeded(contractor_ids, developer_ids, tech_names, password_hash)
+
+
+@click.command('seed')
+@click.option('--contractors', default=10000, show_default=True, help='Contractors to create.')
+@click.option('--developers', default=100000, show_default=True, help='Developers to create.')
+@click.option('--techs', default=len(TECH_NAMES), show_default=True, help='Technologies to use, created if missing.')
+@click.option('--jobs', default=1000000, show_default=True, help='Jobs to create.')
+@click.option('--seed', default=1, show_default=True, help='Random seed: the same options create the same rows.')
+@click.option('--domain', default='seed.dev', show_default=True, help='Domain of the accounts emails.')
+@click.option('--password', default=SEED_PASSWORD, show_default=True, help='Password of every account.')
+@click.option('--chunk-size', default=50000, show_default=True, help='Rows per transaction.')
+@with_appcontext
+def seed_command(contractors, developers, techs, jobs, seed, domain, password, chunk_size):
+    """Bulk-load synthetic contractors, developers, techs and jobs into the configured database.
+
+    Rows are sent with COPY on Postgres and executemany on SQLite, --chunk-size per
+    transaction, along with the developers' and jobs' technologies. Accounts log in with
+    their email (developer<n>@<domain>, contractor<n>@<domain>) and --password.
+    """
+    started = time.perf_counter()
+    seed_database(contractors, developers, techs, jobs, seed, domain, password, chunk_size)
+    click.echo(f'seeded in {time.perf_counter() - started:.1f} s')
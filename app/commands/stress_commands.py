@@ -0,0 +1,217 @@
+import random
+import threading
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import click
+from flask.cli import AppGroup
+
+stress_cli = AppGroup('stress', help='Concurrency checks against the configured database.')
+
+
+@contextmanager
+def _scratch_users(developers: int):
+    """A contractor and ``developers`` developers made for the run, deleted with their jobs afterwards."""
+    from app.configs.database import db
+    from app.models.contractor_model import ContractorModel
+    from app.models.developer_model import DeveloperModel
+    from app.models.job_model import JobModel
+    from app.models.user_job_counters import UserJobCountersModel
+
+    run = uuid.uuid4().hex[:8]
+    contractor = ContractorModel(name='Stress', email=f'stress.{run}@mail.com', password_hash='-')
+    users = [DeveloperModel(name=f'Stress {index}', email=f'stress.{run}.{index}@mail.com', password_hash='-',
+                            birthdate=datetime(1990, 1, 1, tzinfo=timezone.utc))
+             for index in range(developers)]
+    db.session.add_all([contractor, *users])
+    db.session.commit()
+
+    try:
+        yield contractor, users
+    finally:
+        db.session.rollback()
+        JobModel.query.filter_by(contractor_id=contractor.id).delete(synchronize_session=False)
+        DeveloperModel.query.filter(DeveloperModel.id.in_([user.id for user in users])).delete(synchronize_session=False)
+        ContractorModel.query.filter_by(id=contractor.id).delete(synchronize_session=False)
+        UserJobCountersModel.forget('contractor', contractor.id)
+        for user in users:
+            UserJobCountersModel.forget('developer', user.id)
+        db.session.commit()
+
+
+def _open_jobs(contractor, count: int):
+    from app.configs.database import db
+    from app.models.job_model import JobModel
+    from app.models.user_job_counters import UserJobCountersModel
+
+    expiration = datetime.now(timezone.utc) + timedelta(days=30)
+    jobs = [JobModel(name=f'Stress job {index}', description='stress', price=1, difficulty_level='beginner',
+                     expiration_date=expiration, contractor_id=contractor.id)
+            for index in range(count)]
+    db.session.add_all(jobs)
+    UserJobCountersModel.move_job(None, (contractor.id, None, None), count)
+    db.session.commit()
+
+    return [job.id for job in jobs]
+
+
+def _race(app, tokens, request_once):
+    """Run ``request_once(client, headers)`` on one thread per token, all released at once."""
+    start = threading.Barrier(len(tokens))
+    errors = []
+
+    def worker(token):
+        client = app.test_client()
+        headers = {'Authorization': f'Bearer {token}'}
+        start.wait()
+        try:
+            request_once(client, headers)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(token,)) for token in tokens]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        raise errors[0]
+
+
+@stress_cli.command('claims')
+@click.option('--jobs', 'job_count', default=20, show_default=True, help='Open jobs to race for.')
+@click.option('--developers', default=12, show_default=True, help='Developers (one thread each) racing.')
+def stress_claims(job_count, developers):
+    """Race developers for the same open jobs and check every job gets exactly one developer.
+
+    Each developer first tries to claim every job by id (POST /api/job/claim/<id>), in a
+    shuffled order, then a second round of jobs is drained with POST /api/job/claim limited
+    to the jobs of the run. The command fails if a job ends up with no developer, with
+    several winners, or with a developer other than the one its claim answered to, and if
+    the job counters of the run's users don't match a recount.
+    """
+    from app.configs.database import db
+    from app.models.job_model import JobModel
+    from app.models.user_job_counters import UserJobCountersModel
+    from flask import current_app
+    from flask_jwt_extended import create_access_token
+
+    app = current_app._get_current_object()
+
+    with _scratch_users(developers) as (contractor, users):
+        tokens = {create_access_token(identity=user): user.id for user in users}
+        failures = []
+
+        for mode in ('by id', 'next open'):
+            job_ids = _open_jobs(contractor, job_count)
+            winners = {}
+            statuses = Counter()
+            lock = threading.Lock()
+
+            def claim(client, headers, job_id=None):
+                if job_id is None:
+                    response = client.post('/api/job/claim', headers=headers, json={'jobs': job_ids})
+                else:
+                    response = client.post(f'/api/job/claim/{job_id}', headers=headers)
+                with lock:
+                    statuses[response.status_code] += 1
+                    if response.status_code == 200:
+                        winners.setdefault(response.get_json()['id'], []).append(headers['Authorization'][7:])
+                return response.status_code
+
+            def claim_by_id(client, headers):
+                for job_id in random.sample(job_ids, len(job_ids)):
+                    claim(client, headers, job_id)
+
+            def claim_next(client, headers):
+                while claim(client, headers) == 200:
+                    pass
+
+            _race(app, list(tokens), claim_by_id if mode == 'by id' else claim_next)
+
+            db.session.expire_all()
+            assigned = dict(db.session.query(JobModel.id, JobModel.developer_id).filter(JobModel.id.in_(job_ids)))
+
+            for job_id in job_ids:
+                claimed_by = winners.get(job_id, [])
+                if len(claimed_by) != 1:
+                    failures.append(f'{mode}: job {job_id} was claimed {len(claimed_by)} times')
+                elif assigned[job_id] != tokens[claimed_by[0]]:
+                    failures.append(f'{mode}: job {job_id} belongs to developer {assigned[job_id]}, '
+                                    f'its claim answered developer {tokens[claimed_by[0]]}')
+
+            click.echo(f'{mode:9}  {job_count} jobs, {developers} developers: '
+                       + ', '.join(f'{count} x {status}' for status, count in sorted(statuses.items())))
+
+        run_users = {('contractor', contractor.id), *(('developer', user.id) for user in users)}
+        for (role, user_id), (stored, recounted) in UserJobCountersModel.reconcile(apply=False).items():
+            if (role, user_id) in run_users:
+                failures.append(f'{role} {user_id} counters {stored}, recounted {recounted}')
+
+    for failure in failures:
+        click.echo(f'  {failure}')
+    if failures:
+        raise click.ClickException(f'{len(failures)} job(s) without exactly one winner or user(s) miscounted')
+    click.echo('every job has exactly one developer, every counter matches')
+
+
+@stress_cli.command('updates')
+@click.option('--writers', default=12, show_default=True, help='Concurrent updates of the same job.')
+@click.option('--rounds', default=10, show_default=True, help='How many times to race.')
+def stress_updates(writers, rounds):
+    """Race updates of one job based on the same version and check exactly one of them wins.
+
+    Every round, --writers threads PATCH /api/job/update/<id> with a different price and the
+    version they all read; one must answer 200 and the others 409, and the stored price must
+    be the winner's.
+    """
+    from app.configs.database import db
+    from app.models.job_model import JobModel
+    from flask import current_app
+    from flask_jwt_extended import create_access_token
+
+    app = current_app._get_current_object()
+
+    with _scratch_users(0) as (contractor, _):
+        token = create_access_token(identity=contractor)
+        job_id = _open_jobs(contractor, 1)[0]
+        failures = []
+
+        for round_number in range(rounds):
+            db.session.expire_all()
+            version = db.session.get(JobModel, job_id).version_id
+            prices = iter(range(1, writers + 1))
+            results = []
+            lock = threading.Lock()
+
+            def update(client, headers):
+                with lock:
+                    price = next(prices)
+                response = client.patch(f'/api/job/update/{job_id}', headers=headers,
+                                        json={'price': price, 'version': version})
+                with lock:
+                    results.append((response.status_code, price))
+
+            _race(app, [token] * writers, update)
+
+            db.session.expire_all()
+            stored = db.session.get(JobModel, job_id)
+            won = [price for status, price in results if status == 200]
+            others = Counter(status for status, _ in results if status != 200)
+
+            if len(won) != 1 or set(others) - {409}:
+                failures.append(f'round {round_number}: {len(won)} winner(s), other answers {dict(others)}')
+            elif stored.price != won[0] or stored.version_id != version + 1:
+                failures.append(f'round {round_number}: stored price {stored.price} v{stored.version_id}, '
+                                f'winner wrote {won[0]} on v{version}')
+
+        click.echo(f'{rounds} rounds of {writers} concurrent updates')
+
+    for failure in failures:
+        click.echo(f'  {failure}')
+    if failures:
+        raise click.ClickException(f'{len(failures)} round(s) without exactly one winner')
+    click.echo('every round has exactly one winner')
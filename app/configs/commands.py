@@ -0,0 +1,15 @@
+from flask import Flask
+
+
+def init_app(app: Flask):
+    from app.commands.bench_commands import bench_cli
+    from app.commands.counter_commands import counters_cli
+    from app.commands.plan_commands import plans_cli
+    from app.commands.seed_commands import seed_command
+    from app.commands.stress_commands import stress_cli
+
+    app.cli.add_command(bench_cli)
+    app.cli.add_command(counters_cli)
+    app.cli.add_command(plans_cli)
+    app.cli.add_command(seed_command)
+    app.cli.add_command(stress_cli)
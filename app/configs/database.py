@@ -1,8 +1,78 @@
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool
 
 db = SQLAlchemy()
 
+def _engine_options(app: Flask):
+  from app.services.pool_metrics import InstrumentedQueuePool
+
+  options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+  statement_timeout = app.config.get('DB_STATEMENT_TIMEOUT')
+
+  if app.config.get('DB_PGBOUNCER'):
+    # pgbouncer in transaction mode owns the pooling: hold no idle connections here, and send
+    # no session settings since the next transaction may run on another server connection
+    options['poolclass'] = NullPool
+    return options
+
+  options.update({
+    'poolclass': InstrumentedQueuePool,
+    'pool_size': app.config.get('DB_POOL_SIZE', 5),
+    'max_overflow': app.config.get('DB_MAX_OVERFLOW', 10),
+    'pool_timeout': app.config.get('DB_POOL_TIMEOUT', 30),
+    'pool_pre_ping': app.config.get('DB_POOL_PRE_PING', False),
+    'pool_recycle': app.config.get('DB_POOL_RECYCLE', -1),
+  })
+
+  if statement_timeout:
+    options['connect_args'] = {**options.get('connect_args', {}), 'options': f'-c statement_timeout={statement_timeout}'}
+
+  return options
+
+def _set_local_statement_timeout(statement_timeout):
+  def set_timeout(connection):
+    connection.exec_driver_sql(f'SET LOCAL statement_timeout = {int(statement_timeout)}')
+  return set_timeout
+
+def create_async_read_engine(app: Flask):
+  """Engine on asyncpg for the ASGI read path (``app.asgi``), with the same pool settings."""
+  from sqlalchemy.ext.asyncio import create_async_engine
+
+  url = make_url(app.config['SQLALCHEMY_DATABASE_URI']).set(drivername='postgresql+asyncpg')
+  statement_timeout = app.config.get('DB_STATEMENT_TIMEOUT')
+
+  if app.config.get('DB_PGBOUNCER'):
+    # asyncpg prepares every statement, and so does SQLAlchemy's cache on top of it; the
+    # prepared statements live on a server connection pgbouncer may not hand back
+    url = url.update_query_dict({'prepared_statement_cache_size': '0'})
+    engine = create_async_engine(url, poolclass=NullPool, connect_args={'statement_cache_size': 0})
+
+    if statement_timeout:
+      event.listen(engine.sync_engine, 'begin', _set_local_statement_timeout(statement_timeout))
+    return engine
+
+  connect_args = {'server_settings': {'statement_timeout': str(statement_timeout)}} if statement_timeout else {}
+
+  return create_async_engine(
+    url,
+    pool_size=app.config.get('DB_POOL_SIZE', 5),
+    max_overflow=app.config.get('DB_MAX_OVERFLOW', 10),
+    pool_timeout=app.config.get('DB_POOL_TIMEOUT', 30),
+    pool_pre_ping=app.config.get('DB_POOL_PRE_PING', False),
+    pool_recycle=app.config.get('DB_POOL_RECYCLE', -1),
+    connect_args=connect_args,
+  )
+
 def init_app(app:Flask):
+  if (app.config.get('SQLALCHEMY_DATABASE_URI') or '').startswith('postgresql'):
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = _engine_options(app)
+
   db.init_app(app)
   app.db = db
+
+  if app.config.get('DB_PGBOUNCER') and app.config.get('DB_STATEMENT_TIMEOUT'):
+    with app.app_context():
+      event.listen(db.engine, 'begin', _set_local_statement_timeout(app.config['DB_STATEMENT_TIMEOUT']))
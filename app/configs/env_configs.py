@@ -8,6 +8,33 @@ load_dotenv()
 def init_app(app: Flask):
   app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('SQLALCHEMY_DATABASE_URI')
   app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = bool(os.environ.get('SQLALCHEMY_TRACK_MODIFICATIONS'))
+  app.config['DB_POOL_SIZE'] = int(os.environ.get('DB_POOL_SIZE', 5))
+  app.config['DB_MAX_OVERFLOW'] = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+  app.config['DB_POOL_TIMEOUT'] = float(os.environ.get('DB_POOL_TIMEOUT', 30))
+  app.config['DB_POOL_PRE_PING'] = bool(os.environ.get('DB_POOL_PRE_PING'))
+  app.config['DB_POOL_RECYCLE'] = int(os.environ.get('DB_POOL_RECYCLE', -1))
+  app.config['DB_STATEMENT_TIMEOUT'] = int(os.environ.get('DB_STATEMENT_TIMEOUT', 0))
+  app.config['DB_PGBOUNCER'] = bool(os.environ.get('DB_PGBOUNCER'))
+  app.config['REQUEST_METRICS'] = os.environ.get('REQUEST_METRICS', '1').strip().lower() not in ('', '0', 'false', 'off')
+  app.config['OPS_TOKEN'] = os.environ.get('OPS_TOKEN') or None
+  app.config['ASGI_SYNC_THREADS'] = int(os.environ.get('ASGI_SYNC_THREADS', 8))
+  app.config['BATCH_MAX_REQUESTS'] = int(os.environ.get('BATCH_MAX_REQUESTS', 20))
+  app.config['BATCH_READ_WORKERS'] = int(os.environ.get('BATCH_READ_WORKERS', 4))
   app.config['JSON_SORT_KEYS'] = bool(os.environ.get('JSON_SORT_KEYS'))
   app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY')
+  app.config['PAGINATION_DEFAULT_LIMIT'] = int(os.environ.get('PAGINATION_DEFAULT_LIMIT', 20))
+  app.config['PAGINATION_MAX_LIMIT'] = int(os.environ.get('PAGINATION_MAX_LIMIT', 100))
+  app.config['TECH_CATALOG_CHECK_INTERVAL'] = float(os.environ.get('TECH_CATALOG_CHECK_INTERVAL', 30))
+  app.config['ENFORCE_QUERY_BUDGETS'] = bool(os.environ.get('ENFORCE_QUERY_BUDGETS'))
+  app.config['N_PLUS_ONE_THRESHOLD'] = int(os.environ.get('N_PLUS_ONE_THRESHOLD', 5))
+  app.config['SLOW_QUERY_MS'] = float(os.environ.get('SLOW_QUERY_MS', 250))
+  app.config['STREAM_YIELD_PER'] = int(os.environ.get('STREAM_YIELD_PER', 500))
+  app.config['RESPONSE_CACHE_BACKEND'] = os.environ.get('RESPONSE_CACHE_BACKEND', 'app.services.response_cache.TTLCache')
+  app.config['RESPONSE_CACHE_SIZE'] = int(os.environ.get('RESPONSE_CACHE_SIZE', 1024))
+  app.config['RESPONSE_CACHE_TTL'] = float(os.environ.get('RESPONSE_CACHE_TTL', 30))
+  app.config['USER_CACHE_SIZE'] = int(os.environ.get('USER_CACHE_SIZE', 1024))
+  app.config['USER_CACHE_TTL'] = float(os.environ.get('USER_CACHE_TTL', 60))
+  app.config['PASSWORD_HASH_METHOD'] = os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256')
+  app.config['PASSWORD_SALT_LENGTH'] = int(os.environ.get('PASSWORD_SALT_LENGTH', 16))
+  app.config['PASSWORD_HASH_CONCURRENCY'] = int(os.environ.get('PASSWORD_HASH_CONCURRENCY', 0))
  
@@ -2,4 +2,9 @@ from flask_jwt_extended import JWTManager
 from flask import Flask
 
 def init_app(app: Flask):
-    JWTManager(app)
\ No newline at end of file
+    from app.services.current_user import load_user, user_identity, user_not_found
+
+    jwt = JWTManager(app)
+    jwt.user_identity_loader(user_identity)
+    jwt.user_lookup_loader(load_user)
+    jwt.user_lookup_error_loader(user_not_found)
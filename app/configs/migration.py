@@ -7,5 +7,7 @@ def init_app(app: Flask):
   from app.models.job_model import JobModel
   from app.models.tech_model import TechModel
   from app.models.developers_techs import DevelopersTechsModel
+  from app.models.jobs_techs import JobsTechsModel
+  from app.models.user_job_counters import UserJobCountersModel
 
   Migrate(app, app.db)
\ No newline at end of file
@@ -0,0 +1,100 @@
+import logging
+from contextlib import contextmanager
+from functools import wraps
+
+from app.exceptions.query_budget_exceptions import QueryBudgetExceededError
+from flask import Flask, current_app, g, has_app_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger('app.queries')
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    if has_app_context() and not g.get('statement_count_paused'):
+        g.statement_count = g.get('statement_count', 0) + 1
+
+
+def statement_count():
+    """SQL statements sent to the database so far in the current app context."""
+    return g.get('statement_count', 0)
+
+
+@contextmanager
+def uncounted():
+    """Leave the statements run inside out of ``statement_count``.
+
+    For periodic upkeep of process-wide caches, which runs inside whichever request happens
+    to find them stale and should not count against that view's budget.
+    """
+    paused = g.get('statement_count_paused', False)
+    g.statement_count_paused = True
+    try:
+        yield
+    finally:
+        g.statement_count_paused = paused
+
+
+class _Budget:
+    def __init__(self, view_name, max_statements):
+        self.view_name = view_name
+        self.max_statements = max_statements
+        self.start = statement_count()
+        self.committed = False
+
+    def check(self):
+        used = statement_count() - self.start
+        if used > self.max_statements:
+            raise QueryBudgetExceededError(self.view_name, used, self.max_statements)
+
+
+def _check_budgets_before_commit(session):
+    # an over budget view fails before its writes are in, so a retry can't apply them twice
+    if not has_app_context():
+        return
+
+    for budget in g.get('query_budgets', ()):
+        budget.check()
+        budget.committed = True
+
+
+def query_budget(max_statements: int):
+    """Declare how many statements a view may run.
+
+    The budget is only enforced when ``ENFORCE_QUERY_BUDGETS`` is set (tests, CI), where going
+    over it raises ``QueryBudgetExceededError`` so N+1 regressions fail loudly. It is checked
+    when the view commits, failing the commit, and when it returns; statements run after a
+    commit that went through are only logged, as the request can't be failed anymore.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not current_app.config.get('ENFORCE_QUERY_BUDGETS'):
+                return view(*args, **kwargs)
+
+            budget = _Budget(view.__name__, max_statements)
+            budgets = g.setdefault('query_budgets', [])
+            budgets.append(budget)
+            try:
+                response = view(*args, **kwargs)
+            finally:
+                budgets.remove(budget)
+
+            try:
+                budget.check()
+            except QueryBudgetExceededError as e:
+                if not budget.committed:
+                    raise
+                logger.warning('%s, after its commit', e.message)
+
+            return response
+        return wrapper
+    return decorator
+
+
+def init_app(app: Flask):
+    if not event.contains(Engine, 'before_cursor_execute', _count_statement):
+        event.listen(Engine, 'before_cursor_execute', _count_statement)
+    if not event.contains(Session, 'before_commit', _check_budgets_before_commit):
+        event.listen(Session, 'before_commit', _check_budgets_before_commit)
@@ -0,0 +1,157 @@
+"""Slow statement log and N+1 detector, on SQLAlchemy engine events.
+
+Every statement sent while handling a request is fingerprinted: its SQL with the bound
+parameters left out and ``IN`` lists collapsed, so ``WHERE id = 1`` and ``WHERE id = 2``
+share one shape. A shape sent ``N_PLUS_ONE_THRESHOLD`` times or more in one request is the
+sign of a loop issuing one query per item; it is logged when the request ends, with the
+function that issued it. Statements slower than ``SLOW_QUERY_MS`` are logged as they
+finish, with the shape of their parameters but never their values.
+"""
+import logging
+import re
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
+
+from flask import Flask, current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger('app.queries')
+
+_IN_LIST = re.compile(r'\bIN \((?:\s*(?:%\(\w+\)s|\?|:\w+|\$\d+)\s*,?)+\)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+# callbacks getting every N+1 found, while repeated_statements() blocks are open
+_collectors = []
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str):
+    """The shape of ``statement``: the same for every call of a query, whatever its arguments."""
+    return _IN_LIST.sub('IN (...)', _WHITESPACE.sub(' ', statement).strip())
+
+
+def parameter_shape(parameters):
+    """The names (or positions) and types of the bound parameters, without their values."""
+    if isinstance(parameters, (list, tuple)) and parameters and isinstance(parameters[0], (dict, list, tuple)):
+        return f'{parameter_shape(parameters[0])} x {len(parameters)}'
+    if isinstance(parameters, dict):
+        return '{' + ', '.join(f'{name}: {type(value).__name__}' for name, value in parameters.items()) + '}'
+    return '(' + ', '.join(type(value).__name__ for value in parameters or ()) + ')'
+
+
+def originating_function():
+    """The controller function that sent the statement being run, or the closest app function."""
+    frame = sys._getframe(1)
+    fallback = None
+
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if module.startswith('app.controllers.'):
+            return f'{module}.{frame.f_code.co_name}'
+        if fallback is None and module.startswith('app.') and not module.startswith('app.configs.'):
+            fallback = f'{module}.{frame.f_code.co_name}'
+        frame = frame.f_back
+
+    return fallback or (request.endpoint if has_request_context() else None) or '?'
+
+
+def _threshold():
+    thresholds = [current_app.config.get('N_PLUS_ONE_THRESHOLD', 0)] + [threshold for threshold, _ in _collectors]
+    thresholds = [threshold for threshold in thresholds if threshold]
+    return min(thresholds) if thresholds else 0
+
+
+def _before_statement(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._inspection_started = time.perf_counter()
+
+    if executemany or not has_request_context():
+        return
+
+    threshold = _threshold()
+    if not threshold:
+        return
+
+    app_globals = g._get_current_object()
+    shapes = getattr(app_globals, 'statement_shapes', None)
+    if shapes is None:
+        shapes = app_globals.statement_shapes = Counter()
+        app_globals.repeated_statements = {}
+
+    shape = fingerprint(statement)
+    shapes[shape] += 1
+    if shapes[shape] == threshold:
+        # only looked up once per repeated shape: walking the stack is the costly part
+        app_globals.repeated_statements[shape] = originating_function()
+
+
+def _after_statement(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_inspection_started', None)
+    if started is None or not has_request_context():
+        return
+
+    slow_ms = current_app.config.get('SLOW_QUERY_MS', 0)
+    if not slow_ms:
+        return
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if elapsed_ms >= slow_ms:
+        logger.warning('slow statement: %.1f ms in %s, parameters %s: %s', elapsed_ms, originating_function(),
+                       parameter_shape(parameters), fingerprint(statement))
+
+
+def _start_request():
+    # g outlives the request when an app context was pushed around it (CLI commands, tests)
+    app_globals = g._get_current_object()
+    app_globals.statement_shapes = Counter()
+    app_globals.repeated_statements = {}
+
+
+def _report_repeated_statements(response):
+    app_globals = g._get_current_object()
+    repeated = getattr(app_globals, 'repeated_statements', None)
+    if not repeated:
+        return response
+
+    log_threshold = current_app.config.get('N_PLUS_ONE_THRESHOLD', 0)
+
+    for shape, origin in repeated.items():
+        count = app_globals.statement_shapes[shape]
+        if log_threshold and count >= log_threshold:
+            logger.warning('N+1: %s %s sent the same statement %d times from %s: %s',
+                           request.method, request.path, count, origin, shape)
+        for threshold, collect in _collectors:
+            if count >= threshold:
+                collect({'request': f'{request.method} {request.path}', 'origin': origin, 'count': count, 'statement': shape})
+
+    return response
+
+
+@contextmanager
+def repeated_statements(threshold: int = 3):
+    """Collect the N+1 patterns of the requests made inside the block.
+
+    Yields the list they are appended to, as dicts with the request, the function that sent
+    the statement, how many times and the statement. ``threshold`` applies even when
+    ``N_PLUS_ONE_THRESHOLD`` is off.
+    """
+    found = []
+    collector = (threshold, found.append)
+    _collectors.append(collector)
+    try:
+        yield found
+    finally:
+        _collectors.remove(collector)
+
+
+def init_app(app: Flask):
+    if not event.contains(Engine, 'before_cursor_execute', _before_statement):
+        event.listen(Engine, 'before_cursor_execute', _before_statement)
+        event.listen(Engine, 'after_cursor_execute', _after_statement)
+
+    app.before_request(_start_request)
+    app.after_request(_report_repeated_statements)
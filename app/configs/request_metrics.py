@@ -0,0 +1,71 @@
+import time
+
+from app.services.request_metrics import PHASES, request_metrics, timed
+from flask import Flask, g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+def _start_statement(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_started = time.perf_counter()
+
+
+def _end_statement(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_metrics_started', None)
+    if started is not None and has_app_context():
+        # resolve the proxy once: this runs for every statement
+        app_globals = g._get_current_object()
+        app_globals.sql_seconds = getattr(app_globals, 'sql_seconds', 0.0) + time.perf_counter() - started
+
+
+def _timed_json_encoder(encoder):
+    class TimedJSONEncoder(encoder):
+        def encode(self, o):
+            with timed('json'):
+                return super().encode(o)
+
+    return TimedJSONEncoder
+
+
+def server_timing(total, sql_seconds, statements, phases):
+    """The ``Server-Timing`` header value: durations in milliseconds, SQL with its statement count."""
+    metrics = [f'db;dur={sql_seconds * 1000:.2f};desc="{statements} statement{"" if statements == 1 else "s"}"']
+    metrics += [f'{phase};dur={phases[phase] * 1000:.2f}' for phase in PHASES if phase in phases]
+    metrics.append(f'total;dur={total * 1000:.2f}')
+    return ', '.join(metrics)
+
+
+def init_app(app: Flask):
+    if not app.config.get('REQUEST_METRICS'):
+        return
+
+    if not event.contains(Engine, 'before_cursor_execute', _start_statement):
+        event.listen(Engine, 'before_cursor_execute', _start_statement)
+        event.listen(Engine, 'after_cursor_execute', _end_statement)
+
+    app.json_encoder = _timed_json_encoder(app.json_encoder)
+
+    @app.before_request
+    def start_request_timer():
+        app_globals = g._get_current_object()
+        app_globals.request_started = time.perf_counter()
+        app_globals.request_statements_start = getattr(app_globals, 'statement_count', 0)
+
+    @app.after_request
+    def record_request_metrics(response):
+        app_globals = g._get_current_object()
+        started = getattr(app_globals, 'request_started', None)
+        if started is None:
+            return response
+
+        total = time.perf_counter() - started
+        sql_seconds = getattr(app_globals, 'sql_seconds', 0.0)
+        statements = getattr(app_globals, 'statement_count', 0) - app_globals.request_statements_start
+        phases = getattr(app_globals, 'phase_timings', None) or {}
+
+        current_request = request._get_current_object()
+        response.headers['Server-Timing'] = server_timing(total, sql_seconds, statements, phases)
+        request_metrics.observe(current_request.endpoint or 'unmatched', current_request.method, response.status_code,
+                                total, sql_seconds, statements, phases)
+        return response
@@ -0,0 +1,9 @@
+from flask import Flask
+
+
+def init_app(app: Flask):
+    from app.services.tech_catalog import tech_catalog
+
+    @app.before_first_request
+    def load_tech_catalog():
+        tech_catalog.refresh(force=True)
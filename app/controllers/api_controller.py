@@ -1,7 +1,9 @@
+from app.configs.database import db
 from app.exceptions.users_exceptions import (InvalidPasswordError,
                                              UserNotFoundError)
 from app.models.contractor_model import ContractorModel
 from app.models.developer_model import DeveloperModel
+from app.services.password_hashing import password_hasher
 from flask import jsonify, request
 from flask_jwt_extended import create_access_token
 
@@ -12,31 +14,24 @@ def login():
     
     try:
         
-        found_contractor = ContractorModel.query.filter_by(email=data['email']).first()
-        found_developer = DeveloperModel.query.filter_by(email=data['email']).first()
+        # an email belongs to a developer or to a contractor, never both
+        found_user = DeveloperModel.query.filter_by(email=data['email']).first() \
+            or ContractorModel.query.filter_by(email=data['email']).first()
         
-        if not found_contractor and not found_developer:
+        if not found_user:
             raise UserNotFoundError
         
-        if found_developer:
-            is_valid_password = found_developer.verify_password(data['password'])
-            
-            if is_valid_password:
-                access_token = create_access_token(identity=found_developer)
-                return jsonify(access_token=access_token), 200
-            
-            else:
-                raise InvalidPasswordError
-            
-        elif found_contractor:
-            is_valid_password = found_contractor.verify_password(data['password'])
-            
-            if is_valid_password:
-                access_token = create_access_token(identity=found_contractor)
-                return jsonify(access_token=access_token), 200
-            
-            else:
-                raise InvalidPasswordError
+        is_valid_password = found_user.verify_password(data['password'])
+        
+        if not is_valid_password:
+            raise InvalidPasswordError
+        
+        if password_hasher.needs_rehash(found_user.password_hash):
+            found_user.password = data['password']
+            db.session.commit()
+        
+        access_token = create_access_token(identity=found_user)
+        return jsonify(access_token=access_token), 200
             
     except UserNotFoundError as e:
         return {'message': str(e)}, 404
@@ -0,0 +1,17 @@
+from app.exceptions.batch_exceptions import InvalidBatchError
+from app.services.batch import batch_runner, parse_batch, shared_authentication
+from flask import current_app, jsonify, request
+
+
+def run_batch():
+    try:
+        items, parallel = parse_batch(request.get_json(silent=True), current_app.config.get('BATCH_MAX_REQUESTS', 20))
+
+    except InvalidBatchError as e:
+        return {'message': str(e)}, 400
+
+    # a bad token fails the whole batch; no token only fails the requests that need one
+    with shared_authentication():
+        responses = batch_runner.run(items, parallel)
+
+    return jsonify({'responses': responses}), 200
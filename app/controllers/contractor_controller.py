@@ -1,21 +1,30 @@
-from dataclasses import asdict
-
 import psycopg2
 import sqlalchemy
 from app.configs.database import db
+from app.configs.query_counter import query_budget
 from app.exceptions.contractor_exceptions import FieldCreateContractorError
 from app.exceptions.field_upgrade_exeptions import FieldUpdateContractorError
 from app.exceptions.invalid_email_exceptions import InvalidEmailError
 from app.exceptions.invalid_password_exceptions import InvalidPasswordError
+from app.exceptions.pagination_exceptions import InvalidCursorError, InvalidLimitError
 from app.models.contractor_model import ContractorModel
 from app.models.developer_model import DeveloperModel
 from app.models.job_model import JobModel
+from app.models.user_job_counters import PROGRESS_COUNTERS, UserJobCountersModel
+from app.services.serializers import (contractor_public, encode_many,
+                                      job_for_contractor)
+from app.services.pagination import (cursor_response, get_cursor_args,
+                                     get_page_args, is_cursor_request, keyset,
+                                     next_page, offset_page, total_count_header)
+from app.services.current_user import (current_contractor, forget_user,
+                                       jwt_required, request_user)
+from app.services.response_cache import cached_response, invalidates
+from app.services.streaming import is_stream_request, stream_ndjson
 from flask import current_app, jsonify, request
-from flask_jwt_extended import (get_jwt_identity,
-                                jwt_required)
-from sqlalchemy import exc
-from datetime import datetime
+from sqlalchemy import exc, select
+from sqlalchemy.orm import joinedload
 
+@invalidates('contractors')
 def create_profile():
     
     try:
@@ -59,19 +68,28 @@ def create_profile():
 
 @jwt_required()
 def get_profile_info():
-    profile_info = get_jwt_identity()
+    profile_info = request_user()
     
     return jsonify(profile_info), 200
 
 @jwt_required()
+@query_budget(1)
+def get_dashboard():
+    found_contractor = current_contractor()
+    if found_contractor == None:
+        return {"message": "Contractor account not found"}, 404
+    
+    # the jobs the contractor created, by progress, read from the counters rather than counted
+    return jsonify(UserJobCountersModel.of('contractor', found_contractor.id)), 200
+
+@jwt_required()
+@invalidates('contractors')
 def update_profile_info():
         
     try:
         data = request.json
         
-        current_user = get_jwt_identity()
-        
-        user = ContractorModel.query.filter(ContractorModel.email == current_user['email']).first()
+        user = current_contractor()
         
         if 'email' in data.keys():
             found_email = DeveloperModel.query.filter(DeveloperModel.email == data['email']).first()
@@ -99,6 +117,8 @@ def update_profile_info():
         ContractorModel.query.filter_by(id=user.id).update(data)
             
         db.session.commit()
+        
+        forget_user(user)
     
         updated_data = ContractorModel.query.get(user.id)
         
@@ -132,68 +152,98 @@ def update_profile_info():
         return {'Message': "Password must contain from 6 to maximum 20 characters, at least one number, upper and lower case and one special character"}, 406
     
 @jwt_required()
+@invalidates('contractors')
 def delete_profile():
-    contractor = get_jwt_identity()
-    found_contractor = ContractorModel.query.filter_by(email=contractor["email"]).first()
+    found_contractor = current_contractor()
     if found_contractor is None:
         return {"message": "Contractor not found!"}, 404
-    if contractor['email'] == found_contractor.email:
-        current_app.db.session.delete(found_contractor)
-        current_app.db.session.commit()
+    current_app.db.session.delete(found_contractor)
+    UserJobCountersModel.forget('contractor', found_contractor.id)
+    current_app.db.session.commit()
+    forget_user(found_contractor)
     return "", 204
 
     
+@cached_response('contractors')
+@query_budget(1)
 def get_all_contractors():
     session = current_app.db.session
-    contractors = session.query(ContractorModel)\
-                  .all()
-    return jsonify(contractors)
+    
+    if is_stream_request():
+        return stream_ndjson(select(ContractorModel).order_by(ContractorModel.id), contractor_public)
+    
+    if is_cursor_request():
+        try:
+            limit, after = get_cursor_args()
+            
+            statement = keyset(select(ContractorModel), [ContractorModel.id], limit, after)
+            
+        except (InvalidCursorError, InvalidLimitError) as e:
+            return {'message': str(e)}, 400
+        
+        contractors, next_cursor = next_page(session.execute(statement).scalars(), limit, lambda contractor: [contractor.id])
+        
+        return cursor_response(encode_many(contractor_public, contractors), next_cursor)
+    
+    try:
+        page, per_page = get_page_args()
+    except InvalidLimitError as e:
+        return {'message': str(e)}, 400
+    
+    contractors = offset_page(select(ContractorModel).order_by(ContractorModel.id), page, per_page)
+    return jsonify(encode_many(contractor_public, contractors))
 
 
 @jwt_required()
+@query_budget(2)
 def get_all_contractor_jobs():
-    current_contractor = get_jwt_identity()
-    found_contractor = ContractorModel.query.filter_by(email=current_contractor['email']).first()
+    found_contractor = current_contractor()
     if found_contractor == None:
         return {"message": "Contractor account not found"}, 404
     data = request.args
-    page = request.args.get('page', 1, int)
-    per_page = request.args.get('per_page', 5, int)
     jobs = []
+    counter = 'total'
 
+    statement = select(JobModel).options(joinedload(JobModel.developer)).where(JobModel.contractor_id == found_contractor.id)
+    
+    if 'progress' in data:
+        progress = None if data['progress'] == 'None' else data['progress']
+        statement = statement.where(JobModel.progress == progress)
+        counter = PROGRESS_COUNTERS.get(progress)
+    
+    if is_stream_request():
+        return stream_ndjson(statement.order_by(JobModel.id), job_for_contractor)
+
+    if is_cursor_request():
+        try:
+            limit, after = get_cursor_args()
+            
+            statement = keyset(statement, [JobModel.id], limit, after)
+            
+        except (InvalidCursorError, InvalidLimitError) as e:
+            return {'message': str(e)}, 400
+        
+        query, next_cursor = next_page(current_app.db.session.execute(statement).scalars(), limit, lambda job: [job.id])
+        # None for a progress the counters don't break down
+        total = UserJobCountersModel.of('contractor', found_contractor.id).get(counter)
+        
+        return cursor_response(encode_many(job_for_contractor, query), next_cursor, total=total)
+
+    try:
+        page, per_page = get_page_args(default_limit=5)
+    except InvalidLimitError as e:
+        return {'message': str(e)}, 400
+    
+    query = offset_page(statement.order_by(JobModel.id), page, per_page)
+    headers = total_count_header(UserJobCountersModel.of('contractor', found_contractor.id).get(counter))
 
     if 'progress' not in data:
-        query = JobModel.query.filter(JobModel.contractor_id == found_contractor.id).paginate(page=page, per_page=per_page, error_out=True).items
-        formatted_job_list = [asdict(item) for item in query]
-        for d in formatted_job_list:
-            if d['developer']:
-                d['developer']['birthdate'] = datetime.strftime(d['developer']['birthdate'], "%d/%m/%y")
-            d['expiration_date'] = datetime.strftime(d['expiration_date'], "%d/%m/%y %H:%M")
-            del d['contractor']
-            jobs.append(d)
-        return jsonify(jobs)
+        jobs = encode_many(job_for_contractor, query)
+        return jsonify(jobs), 200, headers
     elif 'progress' in data:
-        if data['progress'] == 'None':
-            query = JobModel.query.filter(JobModel.contractor_id == found_contractor.id, JobModel.progress == None).paginate(page=page, per_page=per_page, error_out=True).items
-        else:
-            query = JobModel.query.filter(JobModel.contractor_id == found_contractor.id, JobModel.progress == data['progress']).paginate(page=page, per_page=per_page, error_out=True).items
         if query:
-            formatted_job_list = [asdict(item) for item in query]
+            jobs = encode_many(job_for_contractor, query)
             
-            for d in formatted_job_list:
-                if d['developer']:
-                    d['developer']['birthdate'] = datetime.strftime(d['developer']['birthdate'], "%d/%m/%y")
-                d['expiration_date'] = datetime.strftime(d['expiration_date'], "%d/%m/%y %H:%M")
-                del d['contractor']
-                jobs.append(d)
-            
-        return jsonify(jobs)
+        return jsonify(jobs), 200, headers
     else:
         return {"message": "The values for job progress are:  None, ongoing and completed"}, 406
-
-
-
-
-
-        
-
@@ -4,6 +4,7 @@ from datetime import datetime
 import psycopg2
 import sqlalchemy
 from app.configs.database import db
+from app.configs.query_counter import query_budget
 from app.exceptions.contractor_exceptions import EmailAlreadyRegisteredError
 from app.exceptions.developer_exceptions import InvalidFormatToBirthdateError
 from app.exceptions.invalid_email_exceptions import InvalidEmailError
@@ -12,6 +13,7 @@ from app.exceptions.invalid_field_create_developer_exceptions import \
 from app.exceptions.invalid_field_update_developer_exceptions import \
     FieldUpdateDeveloperError
 from app.exceptions.invalid_password_exceptions import InvalidPasswordError
+from app.exceptions.pagination_exceptions import InvalidCursorError, InvalidLimitError
 from app.exceptions.tech_exceptions import TechNotFoundError
 from app.exceptions.users_exceptions import UserNotFoundError
 from app.models.contractor_model import ContractorModel
@@ -19,10 +21,43 @@ from app.models.developer_model import DeveloperModel
 from app.models.developers_techs import DevelopersTechsModel
 from app.models.tech_model import TechModel
 from app.models.job_model import JobModel
+from app.models.user_job_counters import PROGRESS_COUNTERS, UserJobCountersModel
+from app.services.serializers import (developer_with_techs, encode_many,
+                                      job_for_developer)
+from app.services.pagination import (cursor_response, get_cursor_args,
+                                     get_page_args, is_cursor_request, keyset,
+                                     next_page, offset_page, total_count_header)
+from app.services.current_user import (current_developer, forget_user,
+                                       jwt_required)
+from app.services.response_cache import cached_response, invalidates
+from app.services.streaming import is_stream_request, stream_ndjson
 from flask import current_app, jsonify, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
 
 
+def _resolve_technologies(technologies):
+    """Split the submitted ``[{'name': ...}]`` into found tech ids, found names and unknown names with one query."""
+    names = [tech['name'] for tech in technologies]
+    found = {tech.name.lower(): tech.id for tech in TechModel.get_techs(names)} if names else {}
+
+    tech_ids = []
+    avaliable_technologies = []
+    technologies_not_avaliable = []
+
+    for name in names:
+        tech_id = found.get(name.strip().lower())
+
+        if tech_id is None:
+            technologies_not_avaliable.append(name)
+        else:
+            tech_ids.append(tech_id)
+            avaliable_technologies.append(name)
+
+    return tech_ids, avaliable_technologies, technologies_not_avaliable
+
+
+@invalidates('developers')
 def create_profile():
 
     try:
@@ -55,27 +90,13 @@ def create_profile():
         new_dev.password = password_input
 
         db.session.add(new_dev)
-        db.session.commit()
+        db.session.flush()
         
+        tech_ids, avaliable_technologies, technologies_not_avaliable = _resolve_technologies(technologies)
         
-        technologies_not_avaliable = []
-        avaliable_technologies = []
-        developer_techs = []
+        DevelopersTechsModel.replace_developer_techs(new_dev.id, tech_ids, current_ids=set())
         
-        for tech in technologies:
-            found_tech = TechModel.get_tech(tech['name'])
-            
-            if not found_tech:
-                technologies_not_avaliable.append(tech['name'])
-                
-            else:
-                developer_tech = DevelopersTechsModel(tech_id=found_tech.id, developer_id=new_dev.id)        
-                developer_techs.append(developer_tech)
-                
-                avaliable_technologies.append(tech['name'])
-                
-        for developer_tech in developer_techs:
-            DevelopersTechsModel.insert_developer_techs(developer_tech)
+        db.session.commit()
             
         new_dev.format_birthdate()
 
@@ -109,38 +130,41 @@ def create_profile():
     
 @jwt_required()
 def get_profile_info():
-    current_developer = get_jwt_identity()
+    found_developer = current_developer()
+    
+    if not found_developer:
+        return {'message': str(UserNotFoundError())}, 404
     
     session = current_app.db.session
     
-    rows = session.query(DeveloperModel, TechModel)\
-                             .filter(DeveloperModel.id==DevelopersTechsModel.developer_id)\
-                             .filter(TechModel.id==DevelopersTechsModel.tech_id)\
-                             .where(DeveloperModel.email==current_developer['email'])\
-                             .all()\
+    row = session.execute(DeveloperModel.select_with_technologies()\
+                                        .where(DeveloperModel.id==found_developer.id))\
+                 .first()
+                 
+    if not row:
+        return {'message': str(UserNotFoundError())}, 404
+                 
+    found_developer = developer_with_techs(row)
 
-    techs = []
-    
-    if rows:
-        
-        for index in range(len(rows)):
-            techs.append(asdict(rows[index][1]))
-            
-        found_developer = {**asdict(rows[0][0]), 'technologies': [*techs]}
-        
-    else:
-        found_developer = DeveloperModel.query.filter_by(email=current_developer['email']).first()
-        
-        found_developer = {**asdict(found_developer), 'technologies': []}
-        
-    found_developer["birthdate"] = datetime.strftime(found_developer["birthdate"], "%d/%m/%Y")
-        
 
     return jsonify(found_developer), 200
 
 
+@jwt_required()
+@query_budget(1)
+def get_dashboard():
+    found_developer = current_developer()
+
+    if not found_developer:
+        return {'message': str(UserNotFoundError())}, 404
+
+    # the jobs assigned to the developer, by progress, read from the counters rather than counted
+    return jsonify(UserJobCountersModel.of('developer', found_developer.id)), 200
+
+
 
 @jwt_required()
+@invalidates('developers')
 def update_profile_info():
      
     try:
@@ -149,7 +173,6 @@ def update_profile_info():
         
         technologies_not_avaliable = []
         avaliable_technologies = []
-        developer_techs = []
         
         if 'birthdate' in data.keys():
             
@@ -170,9 +193,7 @@ def update_profile_info():
                 if not DeveloperModel.verify_pattern_email(data['email']):
                     raise InvalidEmailError
                 
-        current_developer = get_jwt_identity()
-        
-        found_developer = DeveloperModel.query.filter_by(email=current_developer['email']).first()
+        found_developer = current_developer()
         
         if 'password' in data.keys():
             
@@ -187,52 +208,24 @@ def update_profile_info():
             
             technologies = data.pop('technologies')
             
-            for tech in technologies:
-                found_tech = TechModel.get_tech(tech['name'])
-                
-                if not found_tech:
-                    technologies_not_avaliable.append(tech['name'])
-                
-                else:                    
-                    developer_tech = DevelopersTechsModel(tech_id=found_tech.id, developer_id=found_developer.id)
-                                        
-                    developer_techs.append(developer_tech)
-                    
-                    avaliable_technologies.append(tech['name'])
-                
-                if avaliable_technologies:
-                    DevelopersTechsModel.delete_developer_techs(found_developer.id)
-                    
-            for developer_tech in developer_techs:
-                DevelopersTechsModel.insert_developer_techs(developer_tech)
+            tech_ids, avaliable_technologies, technologies_not_avaliable = _resolve_technologies(technologies)
+            
+            # only replace the current technologies when at least one of the new ones exists
+            if tech_ids:
+                DevelopersTechsModel.replace_developer_techs(found_developer.id, tech_ids)
                 
         if data:
             DeveloperModel.query.filter_by(id=found_developer.id).update(data)
                 
-            db.session.commit()
+        db.session.commit()
+            
+        forget_user(found_developer)
                     
-        rows = current_app.db.session.query(DeveloperModel, TechModel)\
-                            .filter(DeveloperModel.id==DevelopersTechsModel.developer_id)\
-                            .filter(TechModel.id==DevelopersTechsModel.tech_id)\
-                            .where(DeveloperModel.id==found_developer.id)\
-                            .all()
+        row = current_app.db.session.execute(DeveloperModel.select_with_technologies()\
+                                                           .where(DeveloperModel.id==found_developer.id))\
+                                    .first()
          
-        if not rows:
-            
-            row = DeveloperModel.query.get(found_developer.id)
-            
-            developer = {**asdict(row), 'technologies': []}
-            
-        else: 
-            developer = {**asdict(rows[0][0]), 'technologies': []}
-            
-        
-            
-        for row in rows:
-            tech = asdict(row[1])
-            developer['technologies'] = [*developer['technologies'], tech]
-            
-        developer['birthdate'] = datetime.strftime(developer['birthdate'], "%d/%m/%Y")
+        developer = developer_with_techs(row)
         
         if technologies_not_avaliable:
                 raise TechNotFoundError(avaliable_technologies, technologies_not_avaliable)
@@ -265,17 +258,19 @@ def update_profile_info():
         return {'message': str(e)}, 409
     
 @jwt_required()
+@invalidates('developers')
 def delete_profile():
-    current_developer = get_jwt_identity()
     
     try:
-        found_developer = DeveloperModel.query.filter_by(email=current_developer['email']).first()
+        found_developer = current_developer()
         if not found_developer:
             raise UserNotFoundError
         session = current_app.db.session
 
         session.delete(found_developer)
+        UserJobCountersModel.forget('developer', found_developer.id)
         session.commit()
+        forget_user(found_developer)
 
         return '', 204
     
@@ -283,86 +278,96 @@ def delete_profile():
         return {'message': str(e)}, 404
 
 
+@cached_response('developers')
+@query_budget(1)
 def get_all_developers():
-    rows = current_app.db.session.query(DeveloperModel, TechModel)\
-                            .filter(DeveloperModel.id==DevelopersTechsModel.developer_id)\
-                            .filter(TechModel.id==DevelopersTechsModel.tech_id)\
-                            .all()
-                       
-    rows_with_devs_without_tech = current_app.db.session.query(DeveloperModel)\
-                            .all()
-    found_developers = []
-    
+    session = current_app.db.session
     
+    statement = DeveloperModel.select_with_technologies()
     
+    if is_stream_request():
+        return stream_ndjson(statement.order_by(DeveloperModel.id), developer_with_techs, scalars=False)
     
-    for index in range(len(rows)):
+    if is_cursor_request():
+        try:
+            limit, after = get_cursor_args()
+            
+            statement = keyset(statement, [DeveloperModel.id], limit, after)
+            
+        except (InvalidCursorError, InvalidLimitError) as e:
+            return {'message': str(e)}, 400
         
-        developer = asdict(rows[index][0])
+        rows, next_cursor = next_page(session.execute(statement), limit, lambda row: [row[0].id])
         
-        developer['birthdate'] = datetime.strftime(developer['birthdate'], '%d/%m/%Y')
+        found_developers = encode_many(developer_with_techs, rows)
         
-        tech = asdict(rows[index][1])
-
-        if [found_developer for found_developer in found_developers if found_developer['email'] == developer['email']]:
-            
-            
-            for found_developer in found_developers:
-                
-                if found_developer['email'] == developer['email']:
-                    
-                    found_developer['technologies'] = [*found_developer['technologies'],
-                                                       { 'name': tech['name']}]
-                    
-        else:
-            serialized_data = {**developer, 'technologies': [tech]}
+        return cursor_response(found_developers, next_cursor), 200
     
-            found_developers.append(serialized_data)
+    try:
+        page, per_page = get_page_args()
+    except InvalidLimitError as e:
+        return {'message': str(e)}, 400
     
+    rows = offset_page(statement.order_by(DeveloperModel.id), page, per_page, scalars=False)
     
-    for developer in rows_with_devs_without_tech:
-        
-        developer = asdict(developer)
-        
-        if not [found_developer for found_developer in found_developers if found_developer['email'] == developer['email']]:
-            
-            developer['birthdate'] = datetime.strftime(developer['birthdate'], '%d/%m/%Y')
-            
-            found_developers.append({**developer, 'technologies': []})
+    found_developers = encode_many(developer_with_techs, rows)
     
     return jsonify(found_developers), 200
 
 
 
 @jwt_required()
+@query_budget(2)
 def get_job_by_status() :
-    current_developer = get_jwt_identity()
-    found_developer = DeveloperModel.query.filter_by(email=current_developer['email']).first()
+    found_developer = current_developer()
     
     if not found_developer:
         return {"message": "You're not registered as a developer"}, 403
     data = request.args
-    page = request.args.get('page', 1, int)
-    per_page = request.args.get('per_page', 5, int)
     jobs = []
-    if 'progress' not in data:
-        query = JobModel.query.filter(JobModel.developer_id == found_developer.id).paginate(page=page, per_page=per_page, error_out=True).items
+    counter = 'total'
+    
+    statement = select(JobModel).options(joinedload(JobModel.contractor)).where(JobModel.developer_id == found_developer.id)
+    
+    if 'progress' in data:
+        progress = None if data['progress'] == 'None' else data['progress']
+        statement = statement.where(JobModel.progress == progress)
+        counter = PROGRESS_COUNTERS.get(progress)
+    
+    if is_stream_request():
+        return stream_ndjson(statement.order_by(JobModel.id), job_for_developer)
+    
+    if is_cursor_request():
+        try:
+            limit, after = get_cursor_args()
+            
+            statement = keyset(statement, [JobModel.id], limit, after)
+            
+        except (InvalidCursorError, InvalidLimitError) as e:
+            return {'message': str(e)}, 400
         
-        formatted_job_list = [asdict(item) for item in query]
-        for d in formatted_job_list:
-            d['expiration_date'] = datetime.strftime(d['expiration_date'], "%d/%m/%y %H:%M")
-            del d['developer']
-            jobs.append(d)
-        return jsonify(jobs)
+        query, next_cursor = next_page(current_app.db.session.execute(statement).scalars(), limit, lambda job: [job.id])
+        # None for a progress the counters don't break down
+        total = UserJobCountersModel.of('developer', found_developer.id).get(counter)
+        
+        return cursor_response(encode_many(job_for_developer, query), next_cursor, total=total)
+    
+    try:
+        page, per_page = get_page_args(default_limit=5)
+    except InvalidLimitError as e:
+        return {'message': str(e)}, 400
+    
+    query = offset_page(statement.order_by(JobModel.id), page, per_page)
+    headers = total_count_header(UserJobCountersModel.of('developer', found_developer.id).get(counter))
+    
+    if 'progress' not in data:
+        jobs = encode_many(job_for_developer, query)
+        return jsonify(jobs), 200, headers
         
     elif 'progress' in data:
-        query = JobModel.query.filter(JobModel.developer_id == found_developer.id, JobModel.progress == data['progress']).paginate(page=page, per_page=per_page, error_out=True).items
         if query:
-            formatted_job_list = [asdict(item) for item in query]
-            for d in formatted_job_list:
-                d['expiration_date'] = datetime.strftime(d['expiration_date'], "%d/%m/%y %H:%M")
-                del d['developer']
+            formatted_job_list = encode_many(job_for_developer, query)
             jobs.append(formatted_job_list)
-        return jsonify(jobs)
+        return jsonify(jobs), 200, headers
     else:
         return {"message": "The values for job progress are:  ongoing or completed"}, 406
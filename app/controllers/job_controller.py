@@ -4,24 +4,49 @@ from datetime import datetime
 import psycopg2
 import sqlalchemy
 from app.configs.database import db
-from app.exceptions.job_exceptions import FieldCreateJobError
+from app.configs.query_counter import query_budget
+from app.exceptions.job_exceptions import (FieldCreateJobError,
+                                           InvalidDifficultyLevelError,
+                                           InvalidJobFilterError,
+                                           InvalidTechMatchError,
+                                           JobAlreadyTakenError,
+                                           JobVersionConflictError)
+from app.exceptions.pagination_exceptions import InvalidCursorError, InvalidLimitError
 from app.exceptions.users_exceptions import UserNotFoundError
-from app.models.contractor_model import ContractorModel
-from app.models.developer_model import DeveloperModel
 from app.models.job_model import JobModel
+from app.models.jobs_techs import JobsTechsModel
+from app.models.tech_model import TechModel
+from app.models.user_job_counters import UserJobCountersModel
+from app.services.current_user import (current_contractor, current_developer,
+                                       jwt_required)
+from app.services.job_facets import facet_counts, facets_response
+from app.services.job_filter import build_job_filter
+from app.services.job_search import search_open_jobs
+from app.services.serializers import (encode_many, job_authenticated,
+                                      job_http_dates, job_public,
+                                      job_tech_search)
+from app.services.pagination import (cursor_response, get_cursor_args,
+                                     get_page_args, is_cursor_request, keyset,
+                                     next_page, offset_page)
+from app.services.response_cache import (cached_response, invalidates,
+                                         response_cache)
+from app.services.streaming import is_stream_request, stream_ndjson
 from flask import current_app, jsonify, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
-from sqlalchemy import and_, exc
+from sqlalchemy import exc, select
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.exc import StaleDataError
+
+# every serialized job embeds its developer and contractor: load them with the job row
+JOB_WITH_USERS = (joinedload(JobModel.developer), joinedload(JobModel.contractor))
 
 
 @jwt_required()
+@invalidates('jobs')
 def create_job():
     
     try :
 
-        current_contractor = get_jwt_identity()
-        
-        found_contractor = ContractorModel.query.filter_by(email=current_contractor['email']).first()
+        found_contractor = current_contractor()
 
         if not found_contractor:
             raise UserNotFoundError
@@ -31,11 +56,18 @@ def create_job():
         data['contractor_id'] = found_contractor.id
         if 'progress' in data:
             data['progress'] = None
+        if 'difficulty_level' in data:
+            data['difficulty_level'] = JobModel.verify_difficulty_level(data['difficulty_level'])
         
         new_job = JobModel(**data)
                 
         db.session.add(new_job)
         
+        db.session.flush()
+        
+        JobsTechsModel.tag_job(new_job.id, f'{new_job.name} {new_job.description}')
+        UserJobCountersModel.move_job(None, (new_job.contractor_id, new_job.developer_id, new_job.progress))
+        
         db.session.commit()
         
         new_job.format_expiration_date()
@@ -51,6 +83,9 @@ def create_job():
     except UserNotFoundError as e:
         return {'message': str(e)}, 404
     
+    except InvalidDifficultyLevelError as e:
+        return {'message': str(e)}, 400
+    
     except sqlalchemy.exc.IntegrityError as e:
         
         if type(e.orig) == psycopg2.errors.NotNullViolation:
@@ -60,57 +95,78 @@ def create_job():
         e = FieldCreateJobError()
         return jsonify(e.message), 406
 
+@cached_response('job:{job_id}', 'developers', 'contractors')
+@query_budget(1)
 def get_job_by_id(job_id: int):
 
-        job = JobModel.query.filter_by(id=job_id).first()
+        job = JobModel.query.options(*JOB_WITH_USERS).filter_by(id=job_id).first()
         if job is None:
             return {"message": "This job does not exist"}, 404
         if job.developer_id:
             return {"message": "This specific job already has a developer assigned to it."}, 403
            
         else:
-            return jsonify(job)
+            return jsonify(job_http_dates(job))
 
 @jwt_required()
+@query_budget(1)
 def get_job_by_id_authenticated(job_id: int):
     try:
-        user = get_jwt_identity()
-        found_contractor = ContractorModel.query.filter_by(email=user['email']).first()
-        found_developer = DeveloperModel.query.filter_by(email=user['email']).first()
+        found_contractor = current_contractor()
+        found_developer = current_developer()
 
-        job = JobModel.query.filter_by(id=job_id).first()
-        job.format_expiration_date()
+        job = JobModel.query.options(*JOB_WITH_USERS).filter_by(id=job_id).first()
+        if job is None:
+            raise AttributeError
         if found_contractor:
             if job.contractor_id == found_contractor.id:
-                return jsonify(job)
+                return jsonify(job_authenticated(job))
         if found_developer:
             if job.developer_id == found_developer.id:
-                return jsonify(job)
+                return jsonify(job_authenticated(job))
         return jsonify({"message": "Only the contractor that created this job or the developer assigned to it can see it's information."}), 403
 
     except AttributeError:
         return {"message": "This job does not exist"}, 404
 
+def _retag_job(job, data):
+    if 'name' not in data and 'description' not in data:
+        return None
+    
+    return JobsTechsModel.tag_job(job.id, f"{data.get('name', job.name)} {data.get('description', job.description)}")
+
+
 @jwt_required()
+@invalidates('jobs', 'job:{job_id}')
 def update_job_by_id(job_id: int):
     try:
-        data = request.json
+        data = request.get_json(silent=True) or {}
         
-        contractor = get_jwt_identity()
-        found_contractor = ContractorModel.query.filter_by(email=contractor["email"]).first()
+        found_contractor = current_contractor()
         job = JobModel.query.filter_by(id=job_id).first()
 
-
-        if not job.contractor_id == found_contractor.id:
-            return jsonify({"message": "Only the contractor of this specific job can update it"}), 403
-
         if job is None:
             return {"message": "Job not found!"}, 404
+
+        if found_contractor is None or job.contractor_id != found_contractor.id:
+            return jsonify({"message": "Only the contractor of this specific job can update it"}), 403
+        
+        # the version the client read the job at, if it sent one; otherwise the one read above
+        if data.pop('version', job.version_id) != job.version_id:
+            raise JobVersionConflictError
+        
+        # nothing to write: don't bump the version of an unchanged job
+        if not data:
+            return {'message': "You need to send one of these keys to update a job: name, description, price, difficulty_level, expiration_date, progress and developer"}, 409
+        
+        if 'difficulty_level' in data:
+            data['difficulty_level'] = JobModel.verify_difficulty_level(data['difficulty_level'])
         
         if 'developer' in data: 
             if data['developer'] == None:
                 return JobModel.update_job_if_developer_or_progress_is_null(job)
             else:
+                _retag_job(job, data)
                 return JobModel.update_job_if_developer_in_data(data, job_id, job)
 
         if 'progress' in data:
@@ -118,13 +174,18 @@ def update_job_by_id(job_id: int):
                 return JobModel.update_job_if_developer_or_progress_is_null(job)
 
         elif job.developer_id:
+            _retag_job(job, data)
             return JobModel.update_job_if_developer_not_in_data(job, job_id, data)
 
+        _retag_job(job, data)
+        return JobModel.update_job_fields(job, data)
         
-        JobModel.query.filter_by(id=job.id).update(data)     
-        db.session.commit()
-        return jsonify({"name": job.name,  "description": job.description, "price": job.price, "difficulty_level": job.difficulty_level, "expiration_date": job.expiration_date, "progress": job.progress})
-        
+    except JobVersionConflictError as e:
+        return {'message': str(e)}, 409
+
+    except InvalidDifficultyLevelError as e:
+        return {'message': str(e)}, 400
+
     except exc.InvalidRequestError as e: 
         return {"message": "The available keys for job update are: name, description, price, difficulty_level, expiration_date, progress and developer"}, 409
 
@@ -135,96 +196,191 @@ def update_job_by_id(job_id: int):
         return {'message': "You need to send one of these keys to update a job: name, description, price, difficulty_level, expiration_date, progress and developer"}, 409
   
 @jwt_required()
+@invalidates('jobs', 'job:{job_id}')
 def delete_job_by_id(job_id: int):
     
     session = current_app.db.session
-    current_user = get_jwt_identity()
-    
-    found_contractor = ContractorModel.query.filter_by(email=current_user['email']).first()
+    found_contractor = current_contractor()
     
     try:
         job = JobModel.query.get(job_id)
         
         if job.contractor_id == found_contractor.id:
             session.delete(job)
+            UserJobCountersModel.move_job((job.contractor_id, job.developer_id, job.progress), None)
             session.commit()
             return '', 204
         
         else:
             return {'message': "You don't have permission to delete this job"}, 403
         
+    except StaleDataError:
+        return {'message': str(JobVersionConflictError())}, 409
+
     except AttributeError:
         return {'message': 'job not found'}, 404
 
+
+@jwt_required()
+# the claim and the counters' upsert; SQLite picks, updates and reads back the job in three
+@query_budget(4)
+def claim_job(job_id: int = None):
+    found_developer = current_developer()
+    
+    if not found_developer:
+        return {'message': 'Only developers can claim jobs'}, 403
+    
+    # POST /job/claim may narrow the race to the jobs the developer is interested in
+    job_ids = [job_id] if job_id is not None else (request.get_json(silent=True) or {}).get('jobs')
+    
+    if job_ids is not None and not (isinstance(job_ids, list) and all(type(candidate) is int for candidate in job_ids)):
+        return {'message': 'jobs must be a list of job ids'}, 400
+    
+    job = JobModel.claim(found_developer, job_ids)
+    
+    if job is None:
+        if job_id is None:
+            return {'message': 'There is no open job to claim'}, 404
+        if db.session.get(JobModel, job_id) is None:
+            return {"message": "This job does not exist"}, 404
+        return {'message': str(JobAlreadyTakenError())}, 409
+    
+    db.session.commit()
+    
+    # the claimed job is only known now, so the tags can't be declared with @invalidates
+    response_cache.invalidate('jobs', f'job:{job.id}')
+    
+    return jsonify({"id": job.id, "name": job.name,  "description": job.description, "price": job.price, "difficulty_level": job.difficulty_level, "expiration_date": datetime.strftime(job.expiration_date, "%d/%m/%Y %H:%M"), "progress": job.progress, "version": job.version_id}), 200
+
+@cached_response('jobs', 'developers', 'contractors')
+@query_budget(1)
 def get_all_jobs():
     session = current_app.db.session
     
-    jobs = session.query(JobModel)\
-                  .filter(JobModel.progress==None)\
-                  .all()
-                  
-    serialized_data = []
+    if is_stream_request():
+        return stream_ndjson(select(JobModel).options(*JOB_WITH_USERS).where(JobModel.progress == None).order_by(JobModel.id), job_public)
     
-    for job in jobs:
-        
-        job = asdict(job)
-        
-        job['expiration_date'] = datetime.strftime(job['expiration_date'], "%d/%m/%Y %H:%M")
-        
-        if job.get('developer'):
-            job['developer']['birthdate'] = datetime.strftime(job['developer']['birthdate'], "%d/%m/%Y")
+    if is_cursor_request():
+        try:
+            limit, after = get_cursor_args()
+            
+            statement = keyset(select(JobModel).options(*JOB_WITH_USERS).where(JobModel.progress == None), [JobModel.id], limit, after)
             
-        serialized_data.append(job)
+        except (InvalidCursorError, InvalidLimitError) as e:
+            return {'message': str(e)}, 400
         
+        jobs, next_cursor = next_page(session.execute(statement).scalars(), limit, lambda job: [job.id])
+        
+        return cursor_response(encode_many(job_public, jobs), next_cursor), 200
+    
+    try:
+        page, per_page = get_page_args()
+    except InvalidLimitError as e:
+        return {'message': str(e)}, 400
+    
+    jobs = offset_page(select(JobModel).options(*JOB_WITH_USERS).where(JobModel.progress == None).order_by(JobModel.id),
+                       page, per_page)
+                  
+    serialized_data = encode_many(job_public, jobs)
         
     return jsonify(serialized_data), 200
 
 
     
+def _get_jobs_by_tags(tech_ids, match):
+    
+    statement = select(JobModel).options(*JOB_WITH_USERS)\
+                                .where(JobModel.id.in_(JobsTechsModel.select_job_ids(tech_ids, match)), JobModel.developer_id == None)
+    
+    if is_cursor_request():
+        
+        limit, after = get_cursor_args()
+        
+        jobs, next_cursor = next_page(db.session.execute(keyset(statement, [JobModel.id], limit, after)).scalars(),
+                                      limit, lambda job: [job.id])
+        
+        return cursor_response(encode_many(job_tech_search, jobs), next_cursor), 200
+    
+    jobs = db.session.execute(statement.order_by(JobModel.id)).scalars()
+    
+    return jsonify(encode_many(job_tech_search, jobs)),200
+
+
+@query_budget(3)
 def get_job_by_tech() :
         
     data = request.args
     
-    if data :
+    techs = [tech for tech in data.getlist('tech') if tech.strip()]
+    
+    try:
+        
+        statement, order_by = search_open_jobs(techs, data.get('match', 'any'))
         
-        techs = data.getlist('tech')     
-        jobs = []
-        for tech in techs :
+        statement = statement.options(*JOB_WITH_USERS)
+        
+        known_techs = TechModel.get_techs(techs) if techs else []
+        
+        # known techs are answered from the tags, by id: ranking them would mean reading every
+        # tagged job before cutting a page; only the full-text search below orders by rank
+        if techs and len({tech.name.lower() for tech in known_techs}) == len({tech.strip().lower() for tech in techs}):
+            return _get_jobs_by_tags([tech.id for tech in known_techs], data.get('match', 'any'))
+        
+        if is_cursor_request():
             
-            query = JobModel.query.filter(and_(JobModel.description.ilike(f'%{tech}%'),JobModel.developer == None)).all()
+            limit, after = get_cursor_args()
             
-            if len(query) > 0 :
-             
-                new_arr = [{"job_id": item.id, "name":item.name,"description":item.description,"price":item.price,"difficulty_level":item.difficulty_level, "expiration_date":datetime.strftime(item.expiration_date, "%d/%m/%Y %H:%M"),"progress":item.progress,
-            "developer":item.developer,"contractor":item.contractor} for item in query ]
-             
-                jobs.append(new_arr)
+            if not techs:
+                return cursor_response([], None), 200
             
-        return jsonify(jobs),200
+            rows, next_cursor = next_page(db.session.execute(keyset(statement, order_by, limit, after)), limit, lambda row: [row.rank, row[0].id])
+            
+            return cursor_response([job_tech_search(row[0]) for row in rows], next_cursor), 200
+        
+    except (InvalidTechMatchError, InvalidCursorError, InvalidLimitError) as e:
+        return {'message': str(e)}, 400
     
-    return jsonify([]),200
+    if not techs:
+        return jsonify([]),200
+    
+    rows = db.session.execute(statement.order_by(*order_by))
+    
+    return jsonify([job_tech_search(row[0]) for row in rows]),200
     
 
 
-def get_price_difficulty_level():
+@cached_response('jobs', 'developers', 'contractors')
+@query_budget(1)
+def filter_jobs():
     
-    try :
+    try:
         
-        data = request.args
+        job_filter = build_job_filter(request.args)
         
-        if 'price' in data and 'difficulty' in data:
-
-            query = JobModel.query.filter(and_(JobModel.price >= int(data['price']) , JobModel.difficulty_level.ilike(data['difficulty'] ))).all()
-            return jsonify(query),200 
-
-        if 'price' in data and not 'difficulty' in data :
-            print('oi')
-            query = JobModel.query.filter(JobModel.price >= int(data['price'])).all()
-            return jsonify(query),200 
+        if not job_filter.filtered and not is_cursor_request():
+            raise InvalidJobFilterError('Send at least one filter, or page through every job with "limit" and "after".')
+        
+        statement = job_filter.statement.options(*JOB_WITH_USERS)
+        
+        # always one page: the default limit applies when none is sent
+        limit, after = get_cursor_args()
         
-        else :
-            query = JobModel.query.filter(JobModel.difficulty_level.ilike(data['difficulty'] )).all()
-            return jsonify(query),200 
+        jobs, next_cursor = next_page(db.session.execute(keyset(statement, job_filter.order_by, limit, after)).scalars(),
+                                      limit, job_filter.cursor_values)
         
-    except :
-        return jsonify([])
\ No newline at end of file
+    except (InvalidJobFilterError, InvalidCursorError, InvalidLimitError) as e:
+        return {'message': str(e)}, 400
+    
+    return cursor_response(encode_many(job_http_dates, jobs), next_cursor), 200
+
+
+@cached_response('jobs')
+@query_budget(1)
+def get_job_facets():
+    
+    try:
+        statement = facet_counts(request.args)
+    except InvalidJobFilterError as e:
+        return {'message': str(e)}, 400
+    
+    return jsonify(facets_response(db.session.execute(statement))), 200
@@ -0,0 +1,30 @@
+import hmac
+
+from app.configs.database import db
+from app.services.pool_metrics import pool_status
+from app.services.request_metrics import request_metrics
+from app.services.response_cache import response_cache
+from flask import Response, abort, current_app, jsonify, request
+
+
+def require_ops_token():
+    """Keep the ops routes to whoever holds ``OPS_TOKEN``; without one set they don't exist."""
+    token = current_app.config.get('OPS_TOKEN')
+    if not token:
+        abort(404)
+
+    sent = request.headers.get('Authorization', '')
+    if not hmac.compare_digest(sent.encode(), f'Bearer {token}'.encode()):
+        return {'message': 'Send the ops token as "Authorization: Bearer <OPS_TOKEN>".'}, 401
+
+
+def get_cache_stats():
+    return jsonify(response_cache.stats()), 200
+
+
+def get_pool_stats():
+    return jsonify(pool_status(db.engine)), 200
+
+
+def get_metrics():
+    return Response(request_metrics.render(), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,6 @@
+class InvalidBatchError(Exception):
+    def __init__(self, message):
+
+        self.message = message
+
+        super().__init__(self.message)
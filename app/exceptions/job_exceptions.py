@@ -17,4 +17,43 @@ class FieldCreateJobError(Exception):
             }
         }
         super().__init__(self.message)
-        
\ No newline at end of file
+        
+
+class InvalidTechMatchError(Exception):
+    def __init__(self):
+        
+        self.message = 'The values for match are: any and all'
+        
+        super().__init__(self.message)
+
+
+class JobVersionConflictError(Exception):
+    def __init__(self):
+        
+        self.message = 'This job was changed by someone else since you read it. Fetch it again and retry.'
+        
+        super().__init__(self.message)
+
+
+class JobAlreadyTakenError(Exception):
+    def __init__(self):
+        
+        self.message = 'This job is already taken or being claimed by another developer.'
+        
+        super().__init__(self.message)
+
+
+class InvalidJobFilterError(Exception):
+    def __init__(self, message):
+        
+        self.message = message
+        
+        super().__init__(self.message)
+
+
+class InvalidDifficultyLevelError(Exception):
+    def __init__(self, difficulties):
+        
+        self.message = f'"difficulty_level" must be one of: {", ".join(difficulties)}.'
+        
+        super().__init__(self.message)
@@ -0,0 +1,14 @@
+class InvalidCursorError(Exception):
+    def __init__(self):
+        
+        self.message = 'The cursor sent in "after" is not valid. Use the next_cursor returned by the previous page.'
+        
+        super().__init__(self.message)
+
+
+class InvalidLimitError(Exception):
+    def __init__(self, max_limit, name='limit'):
+        
+        self.message = f'"{name}" must be an integer between 1 and {max_limit}.'
+        
+        super().__init__(self.message)
@@ -0,0 +1,6 @@
+class QueryBudgetExceededError(AssertionError):
+    def __init__(self, view_name, statements, budget):
+        
+        self.message = f'{view_name} ran {statements} SQL statements, its budget is {budget}'
+        
+        super().__init__(self.message)
@@ -1,6 +1,6 @@
 from app.configs.database import db
 from dataclasses import dataclass
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.services.password_hashing import password_hasher
 import re
 from flask import request, jsonify
 @dataclass
@@ -26,11 +26,11 @@ class ContractorModel(db.Model):
 
     @password.setter
     def password(self, password_to_hash):
-        self.password_hash = generate_password_hash(password_to_hash)
+        self.password_hash = password_hasher.hash(password_to_hash)
 
 
     def verify_password(self, password_to_compare):
-        return check_password_hash(self.password_hash, password_to_compare)
+        return password_hasher.verify(self.password_hash, password_to_compare)
 
     @staticmethod
     def verify_pattern_email(email):
@@ -3,7 +3,13 @@ from dataclasses import dataclass
 from datetime import datetime
 
 from app.configs.database import db
-from werkzeug.security import check_password_hash, generate_password_hash
+from app.models.developers_techs import DevelopersTechsModel
+from app.models.tech_model import TechModel
+from app.services.password_hashing import password_hasher
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+TECH_IDS_SEPARATOR = ','
 
 
 @dataclass
@@ -32,10 +38,10 @@ class DeveloperModel(db.Model):
 
     @password.setter
     def password(self, password_to_hash):
-        self.password_hash = generate_password_hash(password_to_hash)
+        self.password_hash = password_hasher.hash(password_to_hash)
 
     def verify_password(self, password_to_compare):
-        return check_password_hash(self.password_hash, password_to_compare)
+        return password_hasher.verify(self.password_hash, password_to_compare)
     
     
     @staticmethod
@@ -72,3 +78,29 @@ class DeveloperModel(db.Model):
                 
     def format_birthdate(self):
         self.birthdate = datetime.strftime(self.birthdate, "%d/%m/%Y")
+
+    @staticmethod
+    def select_with_technologies():
+        """One row per developer with the ids of its technologies aggregated by the database.
+
+        Postgres builds an ordered array with ``array_agg``; other dialects (SQLite) get a
+        ``group_concat`` string. ``technology_names`` turns either into names through the tech
+        catalog, so the ``techs`` table is not joined.
+        """
+        if db.engine.dialect.name == 'postgresql':
+            technologies = func.array_agg(aggregate_order_by(DevelopersTechsModel.tech_id, DevelopersTechsModel.id))\
+                               .filter(DevelopersTechsModel.tech_id != None)
+        else:
+            technologies = func.group_concat(DevelopersTechsModel.tech_id, TECH_IDS_SEPARATOR)
+
+        return select(DeveloperModel, technologies.label('technologies'))\
+                   .outerjoin(DevelopersTechsModel, DevelopersTechsModel.developer_id == DeveloperModel.id)\
+                   .group_by(DeveloperModel.id)
+
+    @staticmethod
+    def technology_names(aggregated):
+        if not aggregated:
+            return []
+        if isinstance(aggregated, str):
+            aggregated = [int(tech_id) for tech_id in aggregated.split(TECH_IDS_SEPARATOR)]
+        return TechModel.get_names(aggregated)
@@ -1,21 +1,38 @@
 from app.configs.database import db
 from dataclasses import dataclass
+from sqlalchemy import insert, select
 
 
 @dataclass
 class DevelopersTechsModel(db.Model):
 
     __tablename__ = 'developers_techs'
+    __table_args__ = (db.Index('ix_developers_techs_developer_id_tech_id', 'developer_id', 'tech_id'),)
 
     id = db.Column(db.Integer, primary_key=True)
     developer_id = db.Column(db.Integer, db.ForeignKey('developers.id'))
     tech_id = db.Column(db.Integer, db.ForeignKey('techs.id'))
 
-    def insert_developer_techs(self):
-        db.session.add(self)
-        db.session.commit()
-        
     @staticmethod
-    def delete_developer_techs(developer_id: int):
-        DevelopersTechsModel.query.filter_by(developer_id=developer_id).delete()
-        db.session.commit()
\ No newline at end of file
+    def tech_ids(developer_id: int):
+        return set(db.session.execute(select(DevelopersTechsModel.tech_id)
+                                      .where(DevelopersTechsModel.developer_id == developer_id)).scalars())
+
+    @staticmethod
+    def replace_developer_techs(developer_id: int, tech_ids, current_ids=None):
+        """Make ``tech_ids`` the developer's technologies with one DELETE and one bulk INSERT, without committing.
+
+        Pass ``current_ids`` when they are already known (an empty set for a new developer).
+        """
+        tech_ids = set(tech_ids)
+        if current_ids is None:
+            current_ids = DevelopersTechsModel.tech_ids(developer_id)
+
+        if current_ids - tech_ids:
+            DevelopersTechsModel.query.filter(DevelopersTechsModel.developer_id == developer_id,
+                                              DevelopersTechsModel.tech_id.in_(current_ids - tech_ids))\
+                                      .delete(synchronize_session=False)
+
+        if tech_ids - current_ids:
+            db.session.execute(insert(DevelopersTechsModel),
+                               [{'developer_id': developer_id, 'tech_id': tech_id} for tech_id in sorted(tech_ids - current_ids)])
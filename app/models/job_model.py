@@ -4,7 +4,13 @@ from dataclasses import dataclass
 from datetime import datetime
 from app.models.developer_model import DeveloperModel
 from app.models.contractor_model import ContractorModel
+from app.models.user_job_counters import UserJobCountersModel
+from app.exceptions.job_exceptions import InvalidDifficultyLevelError, JobVersionConflictError
+from app.exceptions.users_exceptions import UserNotFoundError
 from flask import current_app, jsonify
+from sqlalchemy import select, update
+
+DIFFICULTIES = ('beginner', 'intermediate', 'advanced')
 
 @dataclass
 class JobModel(db.Model):
@@ -19,6 +25,13 @@ class JobModel(db.Model):
     contractor: 'ContractorModel'
 
     __tablename__ = 'jobs'
+    __table_args__ = (
+        db.Index('ix_jobs_open', 'id', postgresql_where=db.text('progress IS NULL'), sqlite_where=db.text('progress IS NULL')),
+        db.Index('ix_jobs_contractor_id_id', 'contractor_id', 'id'),
+        db.Index('ix_jobs_developer_id_id', 'developer_id', 'id'),
+        db.Index('ix_jobs_price_id', 'price', 'id'),
+        db.Index('ix_jobs_expiration_date_id', 'expiration_date', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String, nullable=False)
@@ -27,49 +40,176 @@ class JobModel(db.Model):
     difficulty_level = db.Column(db.String, nullable=False)
     expiration_date = db.Column(db.DateTime(timezone=True), nullable=False)
     progress = db.Column(db.String)
+    version_id = db.Column(db.Integer, nullable=False, server_default='1')
         
     contractor_id = db.Column(db.Integer, db.ForeignKey('contractors.id'))
     developer_id = db.Column(db.Integer, db.ForeignKey('developers.id'))
     
     developer = relationship('DeveloperModel', backref=backref('jobs'))
     contractor = relationship('ContractorModel', backref=backref('jobs'))
+    technologies = relationship('TechModel', secondary='jobs_techs', backref=backref('jobs', lazy='dynamic'), passive_deletes=True)
+
+    # the ORM's own writes (inserts, session.delete) check and bump it too
+    __mapper_args__ = {'version_id_col': version_id}
     
     def format_expiration_date(self):
         self.expiration_date = datetime.strftime(self.expiration_date, "%d/%m/%Y %H:%M")
 
+    @staticmethod
+    def verify_difficulty_level(difficulty):
+        """``difficulty`` as stored (trimmed, lower case); raises ``InvalidDifficultyLevelError`` unless it is one of ``DIFFICULTIES``."""
+        level = difficulty.strip().lower() if isinstance(difficulty, str) else None
+        if level not in DIFFICULTIES:
+            raise InvalidDifficultyLevelError(DIFFICULTIES)
+        return level
+
+    @staticmethod
+    def difficulty_level_is(difficulty: str):
+        """Case-insensitive match like ``ilike(difficulty)``, using the lower(difficulty_level) indexes unless ``difficulty`` has wildcards."""
+        if any(char in difficulty for char in '%_\\'):
+            return JobModel.difficulty_level.ilike(difficulty)
+        return db.func.lower(JobModel.difficulty_level) == difficulty.lower()
+
+
+    @staticmethod
+    def _update_returning(job, values, *columns, where=()):
+        """One compare-and-swap ``UPDATE`` of ``job`` returning ``columns`` of the new row.
+
+        The row is only written if it is still owned by the job's contractor and still at the
+        ``version_id`` ``job`` was read with, and the version is bumped. Only ``jobs`` is
+        written: values and ``where`` may use subqueries of other tables, and the developer of
+        the job is returned by the ``_DEVELOPER_COLUMNS`` subqueries. Dialects without
+        ``RETURNING`` (SQLite) read the row back in the same transaction.
+        The job counters of its contractor and developer follow the change.
+
+        Raises ``JobVersionConflictError`` if the job was written in the meantime; returns None
+        when it is gone or ``where`` matched nothing.
+        """
+        statement = update(JobModel)\
+                        .where(JobModel.id == job.id, JobModel.contractor_id == job.contractor_id,
+                               JobModel.version_id == job.version_id, *where)\
+                        .values({**values, 'version_id': JobModel.version_id + 1})\
+                        .execution_options(synchronize_session=False)
+        columns = (*columns, *_COUNTED_COLUMNS)
+
+        if db.engine.dialect.full_returning:
+            row = db.session.execute(statement.returning(*columns)).first()
+        elif db.session.execute(statement).rowcount:
+            row = db.session.execute(select(*columns).where(JobModel.id == job.id)).first()
+        else:
+            row = None
+
+        if row is None:
+            version_id = db.session.execute(select(JobModel.version_id).where(JobModel.id == job.id)).scalar()
+            if version_id is not None and version_id != job.version_id:
+                raise JobVersionConflictError
+            return None
+
+        # the update matched the version job was read at, so job holds the state it replaced
+        UserJobCountersModel.move_job((job.contractor_id, job.developer_id, job.progress),
+                                      (row.counted_contractor_id, row.counted_developer_id, row.counted_progress))
+
+        return row
+
+    @staticmethod
+    def claim(developer, job_ids=None):
+        """Assign to ``developer`` the open job with the lowest id, among ``job_ids`` if given.
+
+        The job is picked ``FOR UPDATE SKIP LOCKED``, so developers racing for jobs never wait
+        on each other: a job another transaction is claiming is skipped for the next candidate
+        (there is none when claiming a single job). Returns the claimed row, or None.
+        """
+        row = JobModel._claim(developer, job_ids)
+        if row is not None:
+            UserJobCountersModel.move_job((row.contractor_id, None, None), (row.contractor_id, developer.id, 'ongoing'))
+        return row
+
+    @staticmethod
+    def _claim(developer, job_ids):
+        candidate = select(JobModel.id).where(JobModel.progress == None, JobModel.developer_id == None)
+        if job_ids is not None:
+            candidate = candidate.where(JobModel.id.in_(job_ids))
+        candidate = candidate.order_by(JobModel.id).limit(1).with_for_update(skip_locked=True)
+
+        values = {'developer_id': developer.id, 'progress': 'ongoing', 'version_id': JobModel.version_id + 1}
+        columns = (JobModel.id, JobModel.contractor_id, *_RESPONSE_COLUMNS)
+
+        if db.engine.dialect.full_returning:
+            statement = update(JobModel)\
+                            .where(JobModel.id == candidate.scalar_subquery(), JobModel.progress == None)\
+                            .values(values)\
+                            .returning(*columns)\
+                            .execution_options(synchronize_session=False)
+            return db.session.execute(statement).first()
+
+        # SQLite has no row locks (it runs one writer at a time): re-check the job is open
+        job_id = db.session.execute(candidate).scalar()
+        if job_id is None:
+            return None
+
+        statement = update(JobModel)\
+                        .where(JobModel.id == job_id, JobModel.progress == None, JobModel.developer_id == None)\
+                        .values(values)\
+                        .execution_options(synchronize_session=False)
+        if not db.session.execute(statement).rowcount:
+            return None
+
+        return db.session.execute(select(*columns).where(JobModel.id == job_id)).first()
 
     def update_job_if_developer_or_progress_is_null(job):
-        session = current_app.db.session   
-        new_job = JobModel( 
-        id = job.id,
-        name = job.name,
-        expiration_date= job.expiration_date,
-        contractor_id= job.contractor_id,
-        description =    job.description,
-        difficulty_level = job.difficulty_level,
-        price = job.price         
-    )   
-        session.delete(job)
-        session.commit()
-        session.add(new_job)
-        session.commit()
-
-        return jsonify({"name": new_job.name,  "description": new_job.description, "price": new_job.price, "difficulty_level": new_job.difficulty_level, "expiration_date": new_job.format_expiration_date(), "progress": new_job.progress}), 200
+        row = JobModel._update_returning(job, {'developer_id': None, 'progress': None}, *_RESPONSE_COLUMNS)
+        if row is None:
+            return jsonify({"message": "Job not found!"}), 404
+
+        current_app.db.session.commit()
+
+        return jsonify({"name": row.name,  "description": row.description, "price": row.price, "difficulty_level": row.difficulty_level, "expiration_date": datetime.strftime(row.expiration_date, "%d/%m/%Y %H:%M"), "progress": row.progress, "version": row.version_id}), 200
 
     def update_job_if_developer_in_data(data, job_id, job):
         developer_email = data.pop('developer')
-        developer = DeveloperModel.query.filter_by(email=developer_email).first()
-        data['developer_id'] = developer.id
-        JobModel.query.filter_by(id=job_id).update(data)
+        developer = select(DeveloperModel.id).where(DeveloperModel.email == developer_email)
+        row = JobModel._update_returning(job, {'progress': 'ongoing', **data, 'developer_id': developer.scalar_subquery()},
+                                         *_RESPONSE_COLUMNS, *_DEVELOPER_COLUMNS,
+                                         where=[developer.exists()])
+        if row is None:
+            if DeveloperModel.query.filter_by(email=developer_email).first() is None:
+                return jsonify({"message": str(UserNotFoundError())}), 404
+            return jsonify({"message": "Job not found!"}), 404
+
         current_app.db.session.commit()
-        job.progress = "ongoing"
-        developer_birthdate = datetime.strftime(developer.birthdate, "%d/%m/%Y")
-        return jsonify({"name": job.name,  "description": job.description, "price": job.price, "difficulty_level": job.difficulty_level, "expiration_date": job.format_expiration_date(), "progress": job.progress, "developer": [{"name": developer.name, "email": developer.email, "birthdate": developer_birthdate}]})
+        developer_birthdate = datetime.strftime(row.developer_birthdate, "%d/%m/%Y")
+        return jsonify({"name": row.name,  "description": row.description, "price": row.price, "difficulty_level": row.difficulty_level, "expiration_date": datetime.strftime(row.expiration_date, "%d/%m/%Y %H:%M"), "progress": row.progress, "version": row.version_id, "developer": [{"name": row.developer_name, "email": row.developer_email, "birthdate": developer_birthdate}]})
 
 
     def update_job_if_developer_not_in_data(job, job_id, data):
-        JobModel.query.filter_by(id=job.id).update(data) 
-        db.session.commit()  
-        developer = DeveloperModel.query.filter_by(id=job.developer_id).first()  
-        developer_birthdate = datetime.strftime(developer.birthdate, "%d/%m/%Y")          
-        return jsonify({"name": job.name,  "description": job.description, "price": job.price, "difficulty_level": job.difficulty_level, "expiration_date": job.expiration_date, "progress": job.progress, "developer": [{"name": developer.name, "email": developer.email, "birthdate": developer_birthdate}]})
\ No newline at end of file
+        row = JobModel._update_returning(job, data, *_RESPONSE_COLUMNS, *_DEVELOPER_COLUMNS,
+                                         where=[JobModel.developer_id != None])
+        if row is None:
+            return jsonify({"message": "Job not found!"}), 404
+
+        db.session.commit()
+        developer_birthdate = datetime.strftime(row.developer_birthdate, "%d/%m/%Y")
+        return jsonify({"name": row.name,  "description": row.description, "price": row.price, "difficulty_level": row.difficulty_level, "expiration_date": row.expiration_date, "progress": row.progress, "version": row.version_id, "developer": [{"name": row.developer_name, "email": row.developer_email, "birthdate": developer_birthdate}]})
+
+    def update_job_fields(job, data):
+        row = JobModel._update_returning(job, data, *_RESPONSE_COLUMNS)
+        if row is None:
+            return jsonify({"message": "Job not found!"}), 404
+
+        db.session.commit()
+        return jsonify({"name": row.name,  "description": row.description, "price": row.price, "difficulty_level": row.difficulty_level, "expiration_date": row.expiration_date, "progress": row.progress, "version": row.version_id})
+
+
+# what the update_job_* responses show, read back from the updated row
+_RESPONSE_COLUMNS = (JobModel.name, JobModel.description, JobModel.price, JobModel.difficulty_level,
+                     JobModel.expiration_date, JobModel.progress, JobModel.version_id)
+# the developer of the updated row, as subqueries so the UPDATE itself only touches jobs
+_DEVELOPER_COLUMNS = tuple(select(column).where(DeveloperModel.id == JobModel.developer_id)
+                           .correlate(JobModel).scalar_subquery().label(f'developer_{column.key}')
+                           for column in (DeveloperModel.name, DeveloperModel.email, DeveloperModel.birthdate))
+# what the job counters need to know of the updated row
+_COUNTED_COLUMNS = (JobModel.contractor_id.label('counted_contractor_id'), JobModel.developer_id.label('counted_developer_id'),
+                    JobModel.progress.label('counted_progress'))
+
+db.Index('ix_jobs_difficulty_price', db.func.lower(JobModel.difficulty_level), JobModel.price, JobModel.id)
+db.Index('ix_jobs_difficulty_expiration', db.func.lower(JobModel.difficulty_level), JobModel.expiration_date, JobModel.id)
@@ -0,0 +1,43 @@
+from app.configs.database import db
+from app.models.tech_model import TechModel
+from dataclasses import dataclass
+from sqlalchemy import func, select
+
+
+@dataclass
+class JobsTechsModel(db.Model):
+
+    __tablename__ = 'jobs_techs'
+    __table_args__ = (db.UniqueConstraint('job_id', 'tech_id'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id', ondelete='CASCADE'), nullable=False)
+    tech_id = db.Column(db.Integer, db.ForeignKey('techs.id', ondelete='CASCADE'), nullable=False, index=True)
+
+    @staticmethod
+    def tag_job(job_id: int, text: str):
+        """Sync the job's tags with the technologies named in ``text``, without committing."""
+        tech_ids = {tech.id for tech in TechModel.find_in_text(text)}
+        current_ids = JobsTechsModel.tech_ids(job_id)
+
+        if current_ids - tech_ids:
+            JobsTechsModel.query.filter(JobsTechsModel.job_id == job_id, JobsTechsModel.tech_id.in_(current_ids - tech_ids))\
+                                .delete(synchronize_session=False)
+
+        db.session.add_all([JobsTechsModel(job_id=job_id, tech_id=tech_id) for tech_id in tech_ids - current_ids])
+
+        return tech_ids
+
+    @staticmethod
+    def tech_ids(job_id: int):
+        return set(db.session.execute(select(JobsTechsModel.tech_id).where(JobsTechsModel.job_id == job_id)).scalars())
+
+    @staticmethod
+    def select_job_ids(tech_ids, match='any'):
+        """Ids of the jobs tagged with any (or all) of ``tech_ids``, for use in an IN clause."""
+        statement = select(JobsTechsModel.job_id).where(JobsTechsModel.tech_id.in_(tech_ids))
+
+        if match == 'all':
+            statement = statement.group_by(JobsTechsModel.job_id).having(func.count() == len(set(tech_ids)))
+
+        return statement
@@ -1,4 +1,7 @@
+import re
+
 from app.configs.database import db
+from app.services.tech_catalog import tech_catalog
 from dataclasses import dataclass
 
 
@@ -13,9 +16,28 @@ class TechModel(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String, nullable=False)
     
+    # the lookups below read the in-memory catalog (app/services/tech_catalog.py) and return
+    # ``CatalogTech(id, name)`` tuples, not instances attached to the session
+
     @staticmethod
     def get_tech(tech_name):
-        found_tech = TechModel.query.filter_by(name=tech_name.capitalize()).first()
-        return found_tech
+        return tech_catalog.get(tech_name)
+
+    @staticmethod
+    def get_techs(tech_names):
+        return tech_catalog.get_many(tech_names)
+
+    @staticmethod
+    def get_names(tech_ids):
+        return tech_catalog.names(tech_ids)
+
+    @staticmethod
+    def find_in_text(text):
+        """Techs whose name shows up in ``text`` as a whole word, ignoring case."""
+        text = text.casefold()
+        return [
+            tech for tech in tech_catalog.all()
+            if re.search(r'(?<!\w)' + re.escape(tech.name.casefold()) + r'(?!\w)', text)
+        ]
     
          
\ No newline at end of file
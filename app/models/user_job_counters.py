@@ -0,0 +1,124 @@
+from app.configs.database import db
+from dataclasses import dataclass
+from sqlalchemy import case, func, literal_column, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+
+# the counter column of each job progress; total counts every job, whatever its progress
+PROGRESS_COUNTERS = {None: 'open', 'ongoing': 'ongoing', 'completed': 'completed'}
+COUNTERS = ('total', 'open', 'ongoing', 'completed')
+
+
+@dataclass
+class UserJobCountersModel(db.Model):
+    """How many jobs each contractor created and each developer is assigned, by progress.
+
+    Kept in step with ``jobs`` by the writes to it, in their transaction, so the job lists and
+    dashboards never count rows; ``flask counters reconcile`` repairs any drift.
+    """
+    role: str
+    user_id: int
+    total: int
+    open: int
+    ongoing: int
+    completed: int
+
+    __tablename__ = 'user_job_counters'
+
+    role = db.Column(db.String(10), primary_key=True)
+    user_id = db.Column(db.Integer, primary_key=True)
+    total = db.Column(db.Integer, nullable=False, server_default='0')
+    open = db.Column(db.Integer, nullable=False, server_default='0')
+    ongoing = db.Column(db.Integer, nullable=False, server_default='0')
+    completed = db.Column(db.Integer, nullable=False, server_default='0')
+
+    @staticmethod
+    def _upsert(rows, add: bool):
+        """``INSERT`` ``rows``, adding them to (or replacing) the counters of users that have some."""
+        dialect = postgresql if db.engine.dialect.name == 'postgresql' else sqlite
+        table = UserJobCountersModel.__table__
+        statement = dialect.insert(table).values(rows)
+
+        return statement.on_conflict_do_update(
+            index_elements=[table.c.role, table.c.user_id],
+            set_={counter: table.c[counter] + statement.excluded[counter] if add else statement.excluded[counter]
+                  for counter in COUNTERS},
+        )
+
+    @staticmethod
+    def move_job(before, after, count: int = 1):
+        """Count ``count`` jobs going from state ``before`` to ``after``, without committing.
+
+        States are ``(contractor_id, developer_id, progress)`` tuples, None for a job being
+        created or deleted. Every user concerned is updated by one statement, in key order so
+        concurrent writers lock the rows in the same order.
+        """
+        deltas = {}
+        for state, sign in ((before, -count), (after, count)):
+            if state is None:
+                continue
+            contractor_id, developer_id, progress = state
+            for key in (('contractor', contractor_id), ('developer', developer_id)):
+                if key[1] is None:
+                    continue
+                counts = deltas.setdefault(key, dict.fromkeys(COUNTERS, 0))
+                counts['total'] += sign
+                if progress in PROGRESS_COUNTERS:
+                    counts[PROGRESS_COUNTERS[progress]] += sign
+
+        rows = [{'role': role, 'user_id': user_id, **counts}
+                for (role, user_id), counts in sorted(deltas.items()) if any(counts.values())]
+        if rows:
+            db.session.execute(UserJobCountersModel._upsert(rows, add=True))
+
+    @staticmethod
+    def of(role: str, user_id: int):
+        """The user's counters by name, zeros if they have no job."""
+        row = db.session.get(UserJobCountersModel, (role, user_id))
+        return {counter: getattr(row, counter) if row else 0 for counter in COUNTERS}
+
+    @staticmethod
+    def forget(role: str, user_id: int):
+        UserJobCountersModel.query.filter_by(role=role, user_id=user_id).delete(synchronize_session=False)
+
+    @staticmethod
+    def select_recount():
+        """The counters recomputed from ``jobs``: rows of ``role, user_id`` and ``COUNTERS``."""
+        from app.models.job_model import JobModel
+
+        def grouped(role, column):
+            return select(literal_column(f"'{role}'").label('role'), column.label('user_id'),
+                          func.count().label('total'),
+                          *[func.sum(case((JobModel.progress == None if progress is None else JobModel.progress == progress, 1),
+                                          else_=0)).label(counter)
+                            for progress, counter in PROGRESS_COUNTERS.items()])\
+                       .where(column != None)\
+                       .group_by(column)
+
+        return union_all(grouped('contractor', JobModel.contractor_id), grouped('developer', JobModel.developer_id))
+
+    @staticmethod
+    def reconcile(apply: bool = True):
+        """Compare the counters with a recount of ``jobs`` and, if ``apply``, fix them, without committing.
+
+        Returns the drifted users as ``{(role, user_id): (stored, recounted)}``, zeros standing
+        for missing rows.
+        """
+        zeros = dict.fromkeys(COUNTERS, 0)
+        expected = {(row.role, row.user_id): {counter: row[counter] for counter in COUNTERS}
+                    for row in db.session.execute(UserJobCountersModel.select_recount()).mappings()}
+        stored = {(row.role, row.user_id): {counter: getattr(row, counter) for counter in COUNTERS}
+                  for row in UserJobCountersModel.query.all()}
+
+        drifted = {key: (stored.get(key, zeros), expected.get(key, zeros))
+                   for key in sorted(expected.keys() | stored.keys())
+                   if stored.get(key, zeros) != expected.get(key, zeros)}
+
+        if apply and drifted:
+            fixed = [{'role': role, 'user_id': user_id, **recounted}
+                     for (role, user_id), (_, recounted) in drifted.items() if (role, user_id) in expected]
+            if fixed:
+                db.session.execute(UserJobCountersModel._upsert(fixed, add=False))
+            for role, user_id in drifted.keys() - expected.keys():
+                UserJobCountersModel.forget(role, user_id)
+
+        return drifted
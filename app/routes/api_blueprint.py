@@ -1,6 +1,7 @@
-from . import contractor_blueprint, developer_blueprint, job_blueprint
+from . import contractor_blueprint, developer_blueprint, job_blueprint, ops_blueprint
 from flask import Blueprint
 from app.controllers.api_controller import login
+from app.controllers.batch_controller import run_batch
 from app.controllers.job_controller import get_all_jobs
 
 bp = Blueprint('bp_api', __name__, url_prefix='/api')
@@ -9,5 +10,7 @@ bp = Blueprint('bp_api', __name__, url_prefix='/api')
 bp.register_blueprint(contractor_blueprint.bp)
 bp.register_blueprint(developer_blueprint.bp)
 bp.register_blueprint(job_blueprint.bp)
+bp.register_blueprint(ops_blueprint.bp)
 bp.post('/login')(login)
+bp.post('/batch')(run_batch)
 bp.get('')(get_all_jobs)
\ No newline at end of file
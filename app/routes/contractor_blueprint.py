@@ -1,5 +1,5 @@
 from flask import Blueprint
-from app.controllers.contractor_controller import create_profile, get_all_contractor_jobs, update_profile_info, delete_profile, get_all_contractors, get_profile_info
+from app.controllers.contractor_controller import create_profile, get_all_contractor_jobs, update_profile_info, delete_profile, get_all_contractors, get_profile_info, get_dashboard
 
 bp = Blueprint('bp_contractor', __name__, url_prefix='/contractors')
 
@@ -9,6 +9,7 @@ bp.get('/profile')(get_profile_info)
 
 bp.get('')(get_all_contractors)
 bp.get('/jobs')(get_all_contractor_jobs)
+bp.get('/dashboard')(get_dashboard)
 
 bp.patch('/update')(update_profile_info)
 
@@ -1,5 +1,5 @@
 from flask import Blueprint
-from app.controllers.developer_controller import create_profile, update_profile_info, delete_profile, get_all_developers, get_profile_info, get_job_by_status
+from app.controllers.developer_controller import create_profile, update_profile_info, delete_profile, get_all_developers, get_profile_info, get_job_by_status, get_dashboard
 
 bp = Blueprint('bp_developer', __name__, url_prefix='/developers')
 
@@ -8,6 +8,7 @@ bp.post('/signup')(create_profile)
 bp.get('/profile')(get_profile_info)
 bp.get('')(get_all_developers)
 bp.get('/jobs')(get_job_by_status)
+bp.get('/dashboard')(get_dashboard)
 bp.patch('/update')(update_profile_info)
 
 bp.delete('/delete')(delete_profile)
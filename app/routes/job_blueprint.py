@@ -1,5 +1,5 @@
 from flask import Blueprint
-from app.controllers.job_controller import get_job_by_tech ,create_job, update_job_by_id, delete_job_by_id, get_all_jobs,  get_job_by_id, get_job_by_id_authenticated ,get_price_difficulty_level
+from app.controllers.job_controller import get_job_by_tech ,create_job, update_job_by_id, delete_job_by_id, get_all_jobs,  get_job_by_id, get_job_by_id_authenticated ,filter_jobs, get_job_facets, claim_job
 
 bp = Blueprint('bp_job', __name__, url_prefix='/job')
 
@@ -15,4 +15,10 @@ bp.patch('/update/<int:job_id>')(update_job_by_id)
 
 bp.delete('/delete/<int:job_id>')(delete_job_by_id)
 
-bp.get('/info')(get_price_difficulty_level)
\ No newline at end of file
+bp.get('/info')(filter_jobs)
+
+bp.get('/facets')(get_job_facets)
+
+bp.post('/claim')(claim_job)
+
+bp.post('/claim/<int:job_id>')(claim_job)
\ No newline at end of file
@@ -0,0 +1,10 @@
+from flask import Blueprint
+from app.controllers.ops_controller import get_cache_stats, get_metrics, get_pool_stats, require_ops_token
+
+bp = Blueprint('bp_ops', __name__, url_prefix='/ops')
+
+bp.before_request(require_ops_token)
+
+bp.get('/cache')(get_cache_stats)
+bp.get('/pool')(get_pool_stats)
+bp.get('/metrics')(get_metrics)
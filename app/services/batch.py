@@ -0,0 +1,207 @@
+"""Several API requests answered by one: POST /api/batch.
+
+Each sub-request is routed and run by the app's own views, in a request context of its own
+pushed on the batch's app context: they share its ``g`` and its database session. The
+batch's token is verified and its user loaded once for all of them (see
+``shared_authentication``); a request sending another token verifies it as usual. The before
+and after request hooks only run for the batch, which is timed and counted as one request.
+
+With ``parallel``, each run of consecutive GET requests is sent at once to a pool of
+``BATCH_READ_WORKERS`` threads, each with its own app context and session (a session can't
+be shared between threads). Every other request waits for the ones before it, so a read
+that follows a write sees it.
+"""
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import NamedTuple, Optional
+
+from app.configs.database import db
+from app.configs.query_counter import statement_count
+from app.exceptions.batch_exceptions import InvalidBatchError
+from flask import current_app, g, request
+from flask_jwt_extended import verify_jwt_in_request
+from werkzeug.test import EnvironBuilder
+
+BATCH_PATH = '/api/batch'
+METHODS = ('GET', 'POST', 'PATCH', 'PUT', 'DELETE')
+
+# response headers the JSON of each sub-request already stands for
+_DROPPED_HEADERS = {'content-length', 'content-type'}
+
+
+class SubRequest(NamedTuple):
+    method: str
+    path: str
+    headers: dict
+    body: Optional[object]
+
+
+def parse_batch(data, max_requests: int):
+    """The ``SubRequest``s of a batch body and whether its reads may run in parallel.
+
+    Raises ``InvalidBatchError`` with what is wrong: every request needs a ``path`` under
+    ``/api`` (but not a batch), and may have a ``method`` (GET), ``headers`` and a JSON ``body``.
+    """
+    if not isinstance(data, dict) or not isinstance(data.get('requests'), list) or not data['requests']:
+        raise InvalidBatchError('"requests" must be a non empty list of requests')
+    if len(data['requests']) > max_requests:
+        raise InvalidBatchError(f'A batch holds at most {max_requests} requests')
+    if not isinstance(data.get('parallel', False), bool):
+        raise InvalidBatchError('"parallel" must be true or false')
+
+    items = []
+    for index, item in enumerate(data['requests']):
+        path = item.get('path') if isinstance(item, dict) else None
+        if not isinstance(path, str) or not (path == '/api' or path.startswith(('/api/', '/api?'))):
+            raise InvalidBatchError(f'requests[{index}]: "path" must be an /api path')
+        if path.split('?', 1)[0].rstrip('/') == BATCH_PATH:
+            raise InvalidBatchError(f'requests[{index}]: batches can not be nested')
+
+        method = item.get('method', 'GET')
+        if not isinstance(method, str) or method.upper() not in METHODS:
+            raise InvalidBatchError(f'requests[{index}]: "method" must be one of {", ".join(METHODS)}')
+
+        headers = item.get('headers') or {}
+        if not isinstance(headers, dict) or not all(isinstance(value, str) for value in headers.values()):
+            raise InvalidBatchError(f'requests[{index}]: "headers" must map names to strings')
+
+        items.append(SubRequest(method.upper(), path, headers, item.get('body')))
+
+    return items, data.get('parallel', False)
+
+
+@contextmanager
+def shared_authentication():
+    """Verify the batch's token once and load the user of each token once for the requests run inside the block.
+
+    A bad token raises as ``jwt_required`` would; without one, only the requests needing one
+    fail. The header and claims of the token are kept in ``g.batch_token`` for ``jwt_required``
+    (``app.services.current_user``), which lets the requests sending the same header through
+    without decoding it again. ``load_user`` keeps the users in ``g.batch_users`` by token id;
+    ``forget_user`` drops them when a profile changes.
+    """
+    header_name = current_app.config.get('JWT_HEADER_NAME', 'Authorization')
+    app_globals = g._get_current_object()
+    app_globals.batch_users = {}
+    app_globals.batch_token = None
+    try:
+        verified = verify_jwt_in_request(optional=True)
+        if verified:
+            app_globals.batch_token = (request.headers[header_name], *verified)
+        yield
+    finally:
+        del app_globals.batch_users
+        del app_globals.batch_token
+
+
+def _response_item(response):
+    if response.is_json:
+        body = response.get_json()
+    else:
+        body = response.get_data(as_text=True) or None
+
+    return {
+        'status': response.status_code,
+        'headers': {name: value for name, value in response.headers.items() if name.lower() not in _DROPPED_HEADERS},
+        'body': body,
+    }
+
+
+def _dispatch(app, environ):
+    """Route and run one sub-request in the current app context, as its response item."""
+    with app.request_context(environ):
+        try:
+            try:
+                rv = app.dispatch_request()
+            except Exception as e:
+                # HTTP errors and the handlers registered for them (e.g. missing or bad tokens)
+                rv = app.handle_user_exception(e)
+            response = app.make_response(rv)
+            try:
+                return _response_item(response)
+            finally:
+                response.close()
+        except Exception:
+            app.log_exception(sys.exc_info())
+            return {'status': 500, 'headers': {}, 'body': {'message': 'Internal Server Error'}}
+
+
+class BatchRunner:
+    """Run the sub-requests of batches, the reads on a shared pool of ``BATCH_READ_WORKERS`` threads."""
+
+    def __init__(self):
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        workers = current_app.config.get('BATCH_READ_WORKERS', 4)
+        if not workers:
+            return None
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='batch-reads')
+            return self._executor
+
+    def _environ(self, item: SubRequest):
+        headers = dict(item.headers)
+        # the batch's token, unless the request brings its own
+        header_name = current_app.config.get('JWT_HEADER_NAME', 'Authorization')
+        if header_name in request.headers and not any(name.lower() == header_name.lower() for name in headers):
+            headers[header_name] = request.headers[header_name]
+
+        builder = EnvironBuilder(path=item.path, method=item.method, headers=headers, base_url=request.url_root,
+                                 environ_base={'REMOTE_ADDR': request.remote_addr},
+                                 **({'json': item.body} if item.body is not None else {}))
+        try:
+            return builder.get_environ()
+        finally:
+            builder.close()
+
+    def _run_one(self, app, environ):
+        item = _dispatch(app, environ)
+        if item['status'] >= 400:
+            # nothing a failed request left half written may leak into the next ones
+            db.session.rollback()
+        return item
+
+    def _run_in_thread(self, app, environ, batch_token):
+        with app.app_context():
+            # the user comes from the user cache the batch filled
+            g.batch_users = {}
+            g.batch_token = batch_token
+            return _dispatch(app, environ), statement_count(), g.get('sql_seconds', 0.0)
+
+    def run(self, items, parallel: bool):
+        """The response items of ``items``, in order."""
+        app = current_app._get_current_object()
+        environs = [self._environ(item) for item in items]
+        pool = self._pool() if parallel else None
+        results = []
+
+        index = 0
+        while index < len(items):
+            reads = index
+            while pool is not None and reads < len(items) and items[reads].method == 'GET':
+                reads += 1
+
+            if reads - index > 1:
+                futures = [pool.submit(self._run_in_thread, app, environ, g.get('batch_token'))
+                           for environ in environs[index:reads]]
+                for future in futures:
+                    item, statements, sql_seconds = future.result()
+                    results.append(item)
+                    # counted towards the batch like the statements of the requests run here
+                    g.statement_count = statement_count() + statements
+                    g.sql_seconds = g.get('sql_seconds', 0.0) + sql_seconds
+                index = reads
+            else:
+                results.append(self._run_one(app, environs[index]))
+                index += 1
+
+        return results
+
+
+batch_runner = BatchRunner()
@@ -0,0 +1,181 @@
+import threading
+from functools import wraps
+
+from app.configs.database import db
+from app.exceptions.users_exceptions import UserNotFoundError
+from app.models.contractor_model import ContractorModel
+from app.models.developer_model import DeveloperModel
+from app.services.response_cache import TTLCache
+from flask import current_app, g, request
+from flask_jwt_extended import get_current_user
+from flask_jwt_extended import jwt_required as verify_jwt_required
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+
+ROLES = {'developer': DeveloperModel, 'contractor': ContractorModel}
+
+
+class UserCache:
+    """Column values of recently seen users by ``(role, id)``, so tokens resolve without a query.
+
+    Entries are dropped by ``forget`` when the profile changes in this process; profiles changed
+    by other workers are reloaded once ``USER_CACHE_TTL`` is over.
+    """
+
+    def __init__(self):
+        self._cache = None
+        self._lock = threading.Lock()
+
+    def _get_cache(self):
+        with self._lock:
+            if self._cache is None:
+                self._cache = TTLCache(current_app.config.get('USER_CACHE_SIZE', 1024),
+                                       current_app.config.get('USER_CACHE_TTL', 60))
+            return self._cache
+
+    def get(self, role, user_id):
+        return self._get_cache().get((role, user_id))
+
+    def remember(self, role, user):
+        values = {attr.key: getattr(user, attr.key) for attr in inspect(type(user)).column_attrs}
+        self._get_cache().set((role, user.id), values)
+
+    def forget(self, role, user_id):
+        self._get_cache().delete((role, user_id))
+
+    def clear(self):
+        if self._cache is not None:
+            self._cache.clear()
+
+
+user_cache = UserCache()
+
+
+def role_of(user):
+    for role, model in ROLES.items():
+        if isinstance(user, model):
+            return role
+
+
+def user_identity(user):
+    """Claims stored in the token: only what is needed to find the user again."""
+    role = role_of(user)
+    if role is None:
+        return user
+    return {'id': user.id, 'role': role}
+
+
+def _attach(model, values):
+    # rebuild the instance from the cached columns and hand it to the session as if it had
+    # just been loaded, without a SELECT
+    user = model(**values)
+    make_transient_to_detached(user)
+    return db.session.merge(user, load=False)
+
+
+def _load_legacy_user(identity):
+    # tokens issued before the claims were compacted carry the whole serialized user
+    email = identity.get('email') if isinstance(identity, dict) else None
+    if email is None:
+        return None
+
+    return DeveloperModel.query.filter_by(email=email).first() \
+        or ContractorModel.query.filter_by(email=email).first()
+
+
+def load_user(jwt_header, jwt_data):
+    # the requests of a batch share the user of their token
+    users = g.get('batch_users')
+    if users is not None and jwt_data.get('jti') in users:
+        return users[jwt_data['jti']]
+
+    user = _find_user(jwt_data['sub'])
+    if users is not None and user is not None and 'jti' in jwt_data:
+        users[jwt_data['jti']] = user
+
+    return user
+
+
+def _find_user(identity):
+    if not isinstance(identity, dict) or identity.get('role') not in ROLES:
+        return _load_legacy_user(identity)
+
+    role, user_id = identity['role'], identity['id']
+    model = ROLES[role]
+
+    values = user_cache.get(role, user_id)
+    if values is not None:
+        return _attach(model, values)
+
+    user = db.session.get(model, user_id)
+    if user is not None:
+        user_cache.remember(role, user)
+
+    return user
+
+
+def user_not_found(jwt_header, jwt_data):
+    return {'message': str(UserNotFoundError())}, 404
+
+
+def _batch_token():
+    """``(jwt_header, jwt_data)`` of the batch's token when the request sends it, else None.
+
+    POST /api/batch verified that token already (see ``shared_authentication``).
+    """
+    token = g.get('batch_token')
+    header_name = current_app.config.get('JWT_HEADER_NAME', 'Authorization')
+    if token is None or request.headers.get(header_name) != token[0]:
+        return None
+    return token[1:]
+
+
+def jwt_required():
+    """``flask_jwt_extended.jwt_required()``, except for the requests of a batch sending its token.
+
+    Those take the claims the batch verified instead of decoding the token again.
+    """
+    def wrapper(view):
+        verified_view = verify_jwt_required()(view)
+
+        @wraps(view)
+        def decorator(*args, **kwargs):
+            token = _batch_token()
+            if token is None:
+                return verified_view(*args, **kwargs)
+
+            if load_user(*token) is None:
+                return user_not_found(*token)
+            return current_app.ensure_sync(view)(*args, **kwargs)
+
+        return decorator
+
+    return wrapper
+
+
+def request_user():
+    """The user of the request's token, once ``jwt_required`` let the request through."""
+    token = _batch_token()
+    if token is not None:
+        return load_user(*token)
+    return get_current_user()
+
+
+def current_developer():
+    """The developer the request's token belongs to, or None if it belongs to a contractor."""
+    user = request_user()
+    return user if isinstance(user, DeveloperModel) else None
+
+
+def current_contractor():
+    """The contractor the request's token belongs to, or None if it belongs to a developer."""
+    user = request_user()
+    return user if isinstance(user, ContractorModel) else None
+
+
+def forget_user(user):
+    user_cache.forget(role_of(user), user.id)
+    # later requests of a batch load the changed (or deleted) profile again
+    if 'batch_users' in g:
+        g.batch_users.clear()
@@ -0,0 +1,70 @@
+"""Counts of the open jobs by difficulty, price band and technology, for GET /api/job/facets."""
+from app.models.job_model import JobModel
+from app.models.jobs_techs import JobsTechsModel
+from app.models.tech_model import TechModel
+from app.services.job_filter import DIFFICULTIES, filter_conditions
+from sqlalchemy import String, case, cast, func, literal_column, select, union_all
+
+
+# lower bounds of the price bands after the first, which starts at 0; the last one is open ended
+PRICE_BANDS = (500, 1000, 2500, 5000, 10000)
+
+
+def _price_band(price):
+    # the bounds are inlined so the expression is the same in SELECT and GROUP BY; drivers
+    # sending typed parameters would otherwise make them two different expressions
+    return case(*[(price < literal_column(str(bound)), literal_column(str(band))) for band, bound in enumerate(PRICE_BANDS)],
+                else_=literal_column(str(len(PRICE_BANDS))))
+
+
+def facet_counts(args):
+    """One statement counting the open jobs matching ``args`` (as ``filter_conditions``) per facet.
+
+    Rows are ``facet, value, count``: ``difficulty`` with the lowercased level, ``price``
+    with the index of the band in ``PRICE_BANDS`` and ``tech`` with the technology name. The
+    matching jobs are selected once, in a CTE the three groupings read.
+    """
+    jobs = select(JobModel.id, JobModel.price, func.lower(JobModel.difficulty_level).label('difficulty'))\
+               .where(JobModel.progress == None, *filter_conditions(args))\
+               .cte('facet_jobs')
+
+    band = cast(_price_band(jobs.c.price), String)
+
+    # counted per tech id first: the names are only joined to the (few) groups
+    tech_counts = select(JobsTechsModel.tech_id, func.count().label('count'))\
+                      .join(jobs, jobs.c.id == JobsTechsModel.job_id)\
+                      .group_by(JobsTechsModel.tech_id)\
+                      .subquery('tech_counts')
+
+    return union_all(
+        select(literal_column("'difficulty'").label('facet'), jobs.c.difficulty.label('value'), func.count().label('count'))
+            .group_by(jobs.c.difficulty),
+        select(literal_column("'price'"), band, func.count())
+            .group_by(band),
+        select(literal_column("'tech'"), TechModel.name, tech_counts.c.count)
+            .join(tech_counts, tech_counts.c.tech_id == TechModel.id),
+    )
+
+
+def facets_response(rows):
+    """The ``facet_counts`` rows as the JSON body: every difficulty and price band, the tagged techs by count."""
+    difficulty = dict.fromkeys(DIFFICULTIES, 0)
+    bands = [0] * (len(PRICE_BANDS) + 1)
+    techs = []
+
+    for facet, value, count in rows:
+        if facet == 'difficulty':
+            difficulty[value] = count
+        elif facet == 'price':
+            bands[int(value)] = count
+        else:
+            techs.append((value, count))
+
+    bounds = (0, *PRICE_BANDS, None)
+
+    return {
+        'total': sum(difficulty.values()),
+        'difficulty': difficulty,
+        'price': [{'min': bounds[band], 'max': bounds[band + 1], 'count': count} for band, count in enumerate(bands)],
+        'tech': [{'name': name, 'count': count} for name, count in sorted(techs, key=lambda tech: (-tech[1], tech[0]))],
+    }
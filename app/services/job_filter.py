@@ -0,0 +1,128 @@
+"""The filters and orderings of GET /api/job/info, composed into one statement."""
+import math
+from datetime import datetime, timezone
+from typing import NamedTuple
+
+from app.exceptions.job_exceptions import InvalidJobFilterError
+from app.models.job_model import DIFFICULTIES, JobModel
+from sqlalchemy import desc, func, select
+from sqlalchemy.sql import Select
+
+
+# ?sort= keys (``-`` in front for descending) and the columns they order by; each ends with
+# the id so the ordering is total and can be used as a keyset
+SORT_COLUMNS = {
+    'id': (JobModel.id,),
+    'price': (JobModel.price, JobModel.id),
+    'expiration': (JobModel.expiration_date, JobModel.id),
+}
+
+DATE_FORMATS = ('%d/%m/%Y %H:%M', '%d/%m/%Y')
+
+
+class JobFilter(NamedTuple):
+    statement: Select
+    order_by: list
+    columns: tuple
+    filtered: bool
+
+    def cursor_values(self, job):
+        return [getattr(job, column.key) for column in self.columns]
+
+
+def _price(args, name):
+    value = args.get(name, '').strip()
+    if not value:
+        return None
+
+    try:
+        price = float(value)
+    except ValueError:
+        price = math.nan
+
+    if not math.isfinite(price):
+        raise InvalidJobFilterError(f'"{name}" must be a number.')
+
+    return price
+
+
+def _date(args, name):
+    value = args.get(name, '').strip()
+    if not value:
+        return None
+
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).replace(tzinfo=timezone.utc)
+        except ValueError:
+            pass
+
+    raise InvalidJobFilterError(f'"{name}" must be a date as dd/mm/yyyy or dd/mm/yyyy hh:mm (UTC).')
+
+
+def _flag(args, name):
+    value = args.get(name, '').strip().lower()
+    if value not in ('', 'true', 'false', '1', '0'):
+        raise InvalidJobFilterError(f'"{name}" must be true or false.')
+
+    return value in ('true', '1')
+
+
+def filter_conditions(args):
+    """The ``WHERE`` conditions for the filters in the query string ``args``.
+
+    ``min_price`` (or ``price``, its former name) and ``max_price`` bound the price,
+    ``difficulty`` (repeatable) is one of ``DIFFICULTIES``, ``open=true`` keeps the jobs
+    nobody has taken and ``expires_after``/``expires_before`` bound the expiration date.
+
+    Raises ``InvalidJobFilterError`` for values it can't use.
+    """
+    conditions = []
+
+    min_price = _price(args, 'min_price' if 'min_price' in args else 'price')
+    max_price = _price(args, 'max_price')
+    if min_price is not None and max_price is not None and min_price > max_price:
+        raise InvalidJobFilterError('"min_price" must not be greater than "max_price".')
+    if min_price is not None:
+        conditions.append(JobModel.price >= min_price)
+    if max_price is not None:
+        conditions.append(JobModel.price <= max_price)
+
+    difficulties = sorted({difficulty.strip().lower() for difficulty in args.getlist('difficulty') if difficulty.strip()})
+    if any(difficulty not in DIFFICULTIES for difficulty in difficulties):
+        raise InvalidJobFilterError(f'"difficulty" must be one of: {", ".join(DIFFICULTIES)}.')
+    if len(difficulties) == 1:
+        conditions.append(JobModel.difficulty_level_is(difficulties[0]))
+    elif difficulties:
+        conditions.append(func.lower(JobModel.difficulty_level).in_(difficulties))
+
+    if _flag(args, 'open'):
+        conditions.append(JobModel.progress == None)
+
+    expires_after = _date(args, 'expires_after')
+    expires_before = _date(args, 'expires_before')
+    if expires_after is not None:
+        conditions.append(JobModel.expiration_date >= expires_after)
+    if expires_before is not None:
+        conditions.append(JobModel.expiration_date < expires_before)
+
+    return conditions
+
+
+def build_job_filter(args):
+    """Compose the statement selecting the jobs matching the query string ``args``.
+
+    Filters as ``filter_conditions``; ``sort`` is a key of ``SORT_COLUMNS``, ``-`` in front
+    for descending. ``filtered`` tells whether any filter was given.
+    """
+    conditions = filter_conditions(args)
+
+    sort = args.get('sort', 'id').strip()
+    descending = sort.startswith('-')
+    columns = SORT_COLUMNS.get(sort.lstrip('-'))
+    if columns is None:
+        raise InvalidJobFilterError(f'"sort" must be one of: {", ".join(SORT_COLUMNS)}, with a - in front for descending.')
+
+    order_by = [desc(column) if descending else column for column in columns]
+
+    return JobFilter(select(JobModel).where(*conditions), order_by, columns, bool(conditions))
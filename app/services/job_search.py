@@ -0,0 +1,55 @@
+from app.configs.database import db
+from app.exceptions.job_exceptions import InvalidTechMatchError
+from app.models.job_model import JobModel
+from sqlalchemy import Float, cast, desc, func, literal_column, select, table
+
+
+MATCH_MODES = ('any', 'all')
+
+jobs_fts = table('jobs_fts')
+
+
+def _postgres_query(techs, match):
+    terms = ['"{}"'.format(tech.replace('"', ' ')) for tech in techs]
+    # the configuration is inlined: drivers that send typed parameters (asyncpg) would pass it
+    # as a varchar, for which there is no websearch_to_tsquery
+    query = func.websearch_to_tsquery(literal_column("'simple'::regconfig"), (' or ' if match == 'any' else ' ').join(terms))
+    vector = literal_column('jobs.search_vector')
+
+    rank = cast(func.ts_rank(vector, query), Float).label('rank')
+
+    return select(JobModel, rank).where(vector.op('@@')(query)), rank
+
+
+def _sqlite_query(techs, match):
+    terms = ['"{}"'.format(tech.replace('"', '""')) for tech in techs]
+    query = (' OR ' if match == 'any' else ' AND ').join(terms)
+
+    rank = (-func.bm25(literal_column('jobs_fts'))).label('rank')
+
+    statement = select(JobModel, rank)\
+                    .join(jobs_fts, literal_column('jobs_fts.rowid') == JobModel.id)\
+                    .where(literal_column('jobs_fts').op('MATCH')(query))
+
+    return statement, rank
+
+
+def search_open_jobs(techs, match='any'):
+    """Build the ranked full-text search over the name and description of open jobs.
+
+    Returns the statement (rows of ``JobModel, rank``) and the ordering to apply, best match
+    first and job id as tie-breaker so it can also be used as a keyset.
+    """
+    if match not in MATCH_MODES:
+        raise InvalidTechMatchError
+
+    techs = [tech.strip() for tech in techs if tech.strip()]
+
+    if db.engine.dialect.name == 'postgresql':
+        statement, rank = _postgres_query(techs, match)
+    else:
+        statement, rank = _sqlite_query(techs, match)
+
+    statement = statement.where(JobModel.developer_id == None)
+
+    return statement, [desc(rank), JobModel.id]
@@ -0,0 +1,170 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from decimal import Decimal
+
+from app.exceptions.pagination_exceptions import InvalidCursorError, InvalidLimitError
+from flask import abort, current_app, jsonify, request
+from sqlalchemy import and_, or_
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import UnaryExpression
+
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+def is_cursor_request():
+    """True when the client asked for keyset pagination (``?limit=`` and/or ``?after=``)."""
+    return 'limit' in request.args or 'after' in request.args
+
+
+def get_cursor_args():
+    default_limit = current_app.config.get('PAGINATION_DEFAULT_LIMIT', DEFAULT_LIMIT)
+    max_limit = current_app.config.get('PAGINATION_MAX_LIMIT', MAX_LIMIT)
+
+    limit = request.args.get('limit', default_limit)
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise InvalidLimitError(max_limit)
+
+    if not 1 <= limit <= max_limit:
+        raise InvalidLimitError(max_limit)
+
+    return limit, request.args.get('after') or None
+
+
+def get_page_args(default_limit=None):
+    """``page`` and ``per_page`` of the page-numbered lists; ``per_page`` defaults and is capped as ``limit``."""
+    default_limit = default_limit or current_app.config.get('PAGINATION_DEFAULT_LIMIT', DEFAULT_LIMIT)
+    max_limit = current_app.config.get('PAGINATION_MAX_LIMIT', MAX_LIMIT)
+
+    page = request.args.get('page', 1, int)
+    per_page = request.args.get('per_page', default_limit, int)
+    if not 1 <= per_page <= max_limit:
+        raise InvalidLimitError(max_limit, 'per_page')
+
+    return page, per_page
+
+
+def encode_cursor(values):
+    values = [{'$dt': value.isoformat()} if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(values, separators=(',', ':')).encode()
+
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, size):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise InvalidCursorError
+
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursorError
+
+    decoded = []
+    for value in values:
+        if isinstance(value, dict):
+            try:
+                value = datetime.fromisoformat(value['$dt'])
+            except (KeyError, TypeError, ValueError):
+                raise InvalidCursorError
+        decoded.append(value)
+
+    return decoded
+
+
+def _check_cursor_types(keys, values):
+    """Raise ``InvalidCursorError`` unless every value fits the type of its key column.
+
+    A tampered cursor would otherwise be compared with the column as is, which Postgres
+    rejects with a ``DataError``. Keys of an unknown type (SQLite's bm25 rank) are not checked.
+    """
+    for (column, _), value in zip(keys, values):
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            continue
+
+        expected = (int, float) if python_type in (float, Decimal) else (python_type,)
+        if isinstance(value, bool) or not isinstance(value, expected):
+            raise InvalidCursorError
+
+
+def _split_order(order_by):
+    keys = []
+    for clause in order_by:
+        if isinstance(clause, UnaryExpression) and clause.modifier is operators.desc_op:
+            keys.append((clause.element, True))
+        elif isinstance(clause, UnaryExpression) and clause.modifier is operators.asc_op:
+            keys.append((clause.element, False))
+        else:
+            keys.append((clause, False))
+    return keys
+
+
+def _after_clause(keys, values):
+    """Expand ``(k1, k2, ...) > (v1, v2, ...)`` honouring the direction of every key."""
+    branches = []
+    for position, (column, descending) in enumerate(keys):
+        equal_prefix = [keys[index][0] == values[index] for index in range(position)]
+        step = column < values[position] if descending else column > values[position]
+        branches.append(and_(*equal_prefix, step))
+    return or_(*branches)
+
+
+def keyset(statement, order_by, limit, after=None):
+    """Order ``statement`` by ``order_by`` and restrict it to the page that follows ``after``.
+
+    ``order_by`` must end with a unique column (usually the primary key) so the ordering is
+    total. ``after`` is checked against the types of the ``order_by`` columns. One extra row is fetched so ``next_page`` can tell whether another page exists.
+    """
+    keys = _split_order(order_by)
+
+    if after:
+        values = decode_cursor(after, len(keys))
+        _check_cursor_types(keys, values)
+        statement = statement.where(_after_clause(keys, values))
+
+    return statement.order_by(*order_by).limit(limit + 1)
+
+
+def next_page(rows, limit, cursor_values):
+    """Trim the look-ahead row and build the cursor pointing after the last row returned."""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    return rows, encode_cursor(cursor_values(rows[-1]))
+
+
+def offset_page(statement, page, per_page, scalars=True):
+    """The ``page``-th page of ``per_page`` rows of ``statement``, which must be ordered.
+
+    404s as ``paginate(error_out=True)`` does, but never counts the rows: the callers take the
+    total from the job counters. ``scalars=False`` keeps whole rows, for statements selecting
+    more than the entity.
+    """
+    if page < 1 or per_page < 0:
+        abort(404)
+
+    result = current_app.db.session.execute(statement.limit(per_page).offset((page - 1) * per_page))
+    rows = (result.scalars() if scalars else result).all()
+    if not rows and page != 1:
+        abort(404)
+
+    return rows
+
+
+def total_count_header(total):
+    """``X-Total-Count`` for the page-numbered lists, whose bodies are bare arrays; none if unknown."""
+    return {} if total is None else {'X-Total-Count': str(total)}
+
+
+def cursor_response(items, next_cursor, **metadata):
+    return jsonify({'data': items, 'next_cursor': next_cursor, **metadata})
@@ -0,0 +1,63 @@
+import threading
+
+from app.services.request_metrics import timed
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class PasswordHasher:
+    """Hash and check passwords with the parameters set in the config.
+
+    ``PASSWORD_HASH_METHOD`` and ``PASSWORD_SALT_LENGTH`` are passed to werkzeug (e.g.
+    ``pbkdf2:sha256:260000``). The hashing runs on the request's thread; PBKDF2 releases the
+    GIL, so several requests hash on several cores. With ``PASSWORD_HASH_CONCURRENCY`` set, at
+    most that many hash at once and the others wait for their turn, so a burst of logins can't
+    take every core from the requests that do not hash.
+    """
+
+    def __init__(self):
+        self._semaphore = None
+        self._method_labels = {}
+        self._lock = threading.Lock()
+
+    def _config(self):
+        return current_app.config.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256'), \
+               current_app.config.get('PASSWORD_SALT_LENGTH', 16)
+
+    def _run(self, function, *args):
+        concurrency = current_app.config.get('PASSWORD_HASH_CONCURRENCY', 0)
+        if not concurrency:
+            return function(*args)
+
+        with self._lock:
+            if self._semaphore is None:
+                self._semaphore = threading.BoundedSemaphore(concurrency)
+
+        with self._semaphore:
+            return function(*args)
+
+    def hash(self, password):
+        method, salt_length = self._config()
+        with timed('hash'):
+            return self._run(generate_password_hash, password, method, salt_length)
+
+    def verify(self, password_hash, password):
+        with timed('hash'):
+            return self._run(check_password_hash, password_hash, password)
+
+    def _method_label(self, method):
+        # werkzeug fills in defaults (e.g. the iteration count) in the label it stores in front
+        # of the salt; hash once to learn it
+        if method not in self._method_labels:
+            self._method_labels[method] = generate_password_hash('', method, 1).split('$', 1)[0]
+        return self._method_labels[method]
+
+    def needs_rehash(self, password_hash):
+        method, salt_length = self._config()
+        label, _, rest = password_hash.partition('$')
+        salt = rest.partition('$')[0]
+
+        return label != self._method_label(method) or len(salt) != salt_length
+
+
+password_hasher = PasswordHasher()
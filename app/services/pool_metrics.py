@@ -0,0 +1,79 @@
+import os
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+
+class InstrumentedQueuePool(QueuePool):
+    """``QueuePool`` that also records how long checkouts take and how many connections it opens.
+
+    A checkout is slow when it had to wait for a connection to be returned or to open a new
+    one; many slow checkouts with few new connections mean the pool is too small for the
+    worker's threads.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.connects = 0
+        self.slow_checkouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+        self._stats_lock = threading.Lock()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+                # handing out an idle connection takes microseconds
+                if waited > 0.001:
+                    self.slow_checkouts += 1
+                if timed_out:
+                    self.timeouts += 1
+
+
+    def _create_connection(self):
+        with self._stats_lock:
+            self.connects += 1
+        return super()._create_connection()
+
+
+def pool_status(engine):
+    """Connections of this worker's pool: in use, idle, overflow and checkout waits."""
+    pool = engine.pool
+    status = {'pid': os.getpid(), 'pool': type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        status.update({
+            'size': pool.size(),
+            'checked_out': pool.checkedout(),
+            'idle': pool.checkedin(),
+            'overflow': max(pool.overflow(), 0),
+            'max_overflow': pool._max_overflow,
+        })
+
+    if isinstance(pool, InstrumentedQueuePool):
+        with pool._stats_lock:
+            status.update({
+                'connects': pool.connects,
+                'checkouts': pool.checkouts,
+                'slow_checkouts': pool.slow_checkouts,
+                'wait_ms_total': round(pool.wait_seconds * 1000, 3),
+                'wait_ms_max': round(pool.max_wait_seconds * 1000, 3),
+                'timeouts': pool.timeouts,
+            })
+
+    return status
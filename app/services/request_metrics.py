@@ -0,0 +1,120 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from flask import g, has_app_context
+
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+# the parts of a request timed besides SQL, in Server-Timing order
+PHASES = ('hash', 'serialize', 'json')
+
+
+def add_time(phase: str, seconds: float):
+    """Count ``seconds`` spent in ``phase`` towards the current request, if there is one."""
+    if has_app_context():
+        app_globals = g._get_current_object()
+        timings = getattr(app_globals, 'phase_timings', None)
+        if timings is None:
+            timings = app_globals.phase_timings = {}
+        timings[phase] = timings.get(phase, 0.0) + seconds
+
+
+@contextmanager
+def timed(phase: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_time(phase, time.perf_counter() - started)
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count per label values, as Prometheus reads them."""
+
+    def __init__(self, name: str, help: str, labels, buckets):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}
+
+    def observe(self, label_values, value):
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def clear(self):
+        self._series.clear()
+
+    def render(self):
+        yield f'# HELP {self.name} {self.help}'
+        yield f'# TYPE {self.name} histogram'
+        for label_values, series in sorted(self._series.items()):
+            labels = _labels(self.labels, label_values)
+            cumulative = 0
+            for bound, count in zip((*self.buckets, '+Inf'), series):
+                cumulative += count
+                yield f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+            yield f'{self.name}_sum{{{labels}}} {series[-1]:.6f}'
+            yield f'{self.name}_count{{{labels}}} {cumulative}'
+
+
+def _labels(names, values):
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for value in values)
+    return ','.join(f'{name}="{value}"' for name, value in zip(names, escaped))
+
+
+class RequestMetrics:
+    """Per endpoint histograms of where requests spend their time, for this process.
+
+    Each worker process keeps its own: a scrape of ``/api/ops/metrics`` reads the worker
+    that answers it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = {}
+        self.duration = Histogram('freeladev_request_duration_seconds', 'Time to build the response.',
+                                  ('endpoint', 'method'), DURATION_BUCKETS)
+        self.sql_duration = Histogram('freeladev_request_sql_duration_seconds', 'Time spent in SQL statements per request.',
+                                      ('endpoint', 'method'), DURATION_BUCKETS)
+        self.sql_statements = Histogram('freeladev_request_sql_statements', 'SQL statements sent per request.',
+                                        ('endpoint', 'method'), STATEMENT_BUCKETS)
+        self.phase_duration = Histogram('freeladev_request_phase_duration_seconds',
+                                        'Time spent hashing passwords, serializing models and encoding JSON, '
+                                        'in the requests that did.', ('endpoint', 'method', 'phase'), DURATION_BUCKETS)
+
+    def observe(self, endpoint, method, status, total, sql_seconds, statements, phases):
+        with self._lock:
+            key = (endpoint, method, str(status))
+            self._requests[key] = self._requests.get(key, 0) + 1
+            self.duration.observe((endpoint, method), total)
+            self.sql_duration.observe((endpoint, method), sql_seconds)
+            self.sql_statements.observe((endpoint, method), statements)
+            for phase, seconds in phases.items():
+                self.phase_duration.observe((endpoint, method, phase), seconds)
+
+    def render(self):
+        """The metrics in the Prometheus text exposition format."""
+        with self._lock:
+            lines = ['# HELP freeladev_requests_total Requests answered.', '# TYPE freeladev_requests_total counter']
+            lines += [f"freeladev_requests_total{{{_labels(('endpoint', 'method', 'status'), key)}}} {count}"
+                      for key, count in sorted(self._requests.items())]
+            for histogram in (self.duration, self.sql_duration, self.sql_statements, self.phase_duration):
+                lines += histogram.render()
+
+        return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        with self._lock:
+            self._requests.clear()
+            for histogram in (self.duration, self.sql_duration, self.sql_statements, self.phase_duration):
+                histogram.clear()
+
+
+request_metrics = RequestMetrics()
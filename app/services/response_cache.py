@@ -0,0 +1,199 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from app.services.streaming import is_stream_request
+from flask import Response, current_app, make_response, request
+from werkzeug.utils import import_string
+
+
+class TTLCache:
+    """Per-process LRU cache whose entries also expire ``ttl`` seconds after being stored."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ResponseCache:
+    """Cache of whole GET responses, invalidated by tag.
+
+    Every cached view declares the tags its response depends on (``jobs``, ``job:<id>``,
+    ``developers``, ``contractors``) and every write view the tags it changes. Each tag has a
+    generation that is part of the cache key, so bumping it makes the old entries unreachable
+    (they age out of the LRU) and a response computed while a write was committing can never
+    be stored under the new generation.
+
+    The backend is built on first use from ``RESPONSE_CACHE_BACKEND`` (an import path, called
+    with ``RESPONSE_CACHE_SIZE`` and ``RESPONSE_CACHE_TTL``); it only needs ``get``, ``set``
+    and ``clear``. Entries live in each worker: writes made by another worker are seen once
+    the TTL is over.
+    """
+
+    def __init__(self):
+        self.backend = None
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def _get_backend(self):
+        if self.backend is None:
+            backend_class = import_string(current_app.config.get('RESPONSE_CACHE_BACKEND', 'app.services.response_cache.TTLCache'))
+            self.backend = backend_class(current_app.config.get('RESPONSE_CACHE_SIZE', 1024),
+                                         current_app.config.get('RESPONSE_CACHE_TTL', 30))
+        return self.backend
+
+    def key(self, tags):
+        with self._lock:
+            generations = tuple(self._generations.get(tag, 0) for tag in tags)
+
+        return request.path, request.query_string, tags, generations
+
+    def get(self, key):
+        entry = self._get_backend().get(key)
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        return entry
+
+    def set(self, key, entry):
+        self._get_backend().set(key, entry)
+
+    def record_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+
+    def invalidate(self, *tags):
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+            self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._generations.clear()
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'not_modified': self.not_modified,
+            'invalidations': self.invalidations,
+            'evictions': getattr(self.backend, 'evictions', 0),
+            'size': len(self.backend) if self.backend is not None else 0,
+        }
+
+
+response_cache = ResponseCache()
+
+
+def _tags_for(tags, view_args):
+    return tuple(tag.format(**view_args) for tag in tags)
+
+
+def _conditional(response):
+    response = response.make_conditional(request)
+    if response.status_code == 304:
+        response_cache.record_not_modified()
+    return response
+
+
+def cached_response(*tags):
+    """Serve the view from ``response_cache`` and answer ``If-None-Match`` with 304.
+
+    ``tags`` may use the view arguments, e.g. ``'job:{job_id}'``. Only complete 200 responses
+    are stored; NDJSON requests go straight to the view.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not current_app.config.get('RESPONSE_CACHE_TTL', 30) or is_stream_request():
+                return view(*args, **kwargs)
+
+            key = response_cache.key(_tags_for(tags, kwargs))
+            entry = response_cache.get(key)
+
+            if entry is not None:
+                body, mimetype, etag = entry
+                response = Response(body, mimetype=mimetype)
+                response.set_etag(etag)
+                response.headers['X-Cache'] = 'HIT'
+                return _conditional(response)
+
+            response = make_response(view(*args, **kwargs))
+
+            if response.status_code != 200 or response.is_streamed:
+                return response
+
+            body = response.get_data()
+            etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+            response_cache.set(key, (body, response.mimetype, etag))
+
+            response.set_etag(etag)
+            response.headers['X-Cache'] = 'MISS'
+            return _conditional(response)
+        return wrapper
+    return decorator
+
+
+def invalidates(*tags):
+    """Bump ``tags`` (which may use the view arguments) after the view succeeds."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            response = make_response(view(*args, **kwargs))
+
+            if response.status_code < 400:
+                response_cache.invalidate(*_tags_for(tags, kwargs))
+
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,38 @@
+from app.configs.database import db
+from flask import Response, current_app, json, request, stream_with_context
+
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def is_stream_request():
+    """Whether the client asked for the collection as NDJSON (``?stream=1`` or ``Accept``)."""
+    if request.args.get('stream', '').lower() in ('1', 'true'):
+        return True
+
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def stream_ndjson(statement, encoder, scalars=True):
+    """Stream ``statement`` as one JSON document per line.
+
+    Rows are fetched through a server-side cursor ``STREAM_YIELD_PER`` at a time and each batch
+    is encoded and sent before the next one is read, so memory stays flat whatever the size of
+    the result. The statement runs before the view returns; only the fetching is deferred.
+    """
+    yield_per = current_app.config.get('STREAM_YIELD_PER', 500)
+
+    result = db.session.execute(statement.execution_options(stream_results=True, yield_per=yield_per))
+
+    rows = result.scalars() if scalars else result
+
+    # the server-side cursor is closed with the session when the request context is torn
+    # down, which ``stream_with_context`` defers until the client has the last line (or left)
+    def generate():
+        for partition in rows.partitions(yield_per):
+            yield ''.join(json.dumps(encoder(row), separators=(',', ':')) + '\n' for row in partition)
+
+    response = Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+    response.vary.add('Accept')
+
+    return response
@@ -0,0 +1,111 @@
+import threading
+import time
+from collections import namedtuple
+
+from app.configs.database import db
+from app.configs.query_counter import uncounted
+from flask import current_app
+from sqlalchemy import column, func, literal, select, table
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+
+CatalogTech = namedtuple('CatalogTech', ['id', 'name'])
+
+techs = table('techs', column('id'), column('name'))
+
+
+def normalize(tech_name):
+    return tech_name.strip().casefold()
+
+
+class TechCatalog:
+    """Process-local copy of the ``techs`` table, by id and by normalized name.
+
+    It is loaded before the first request and, at most once every
+    ``TECH_CATALOG_CHECK_INTERVAL`` seconds, checked against a fingerprint of the table
+    (row count and an md5 of the rows on Postgres) and reloaded only when that changed.
+    Lookups in between only touch the database for names the catalog doesn't know, which
+    may have been added since it was loaded.
+    """
+
+    def __init__(self):
+        self._by_id = {}
+        self._by_name = {}
+        self._version = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def _fetch_version(self):
+        if db.engine.dialect.name != 'postgresql':
+            return None
+
+        rows = func.string_agg(func.concat(techs.c.id, literal(':'), techs.c.name),
+                               aggregate_order_by(literal(','), techs.c.id))
+        return tuple(db.session.execute(select(func.count(), func.md5(func.coalesce(rows, '')))
+                                        .select_from(techs)).one())
+
+    def _fetch(self):
+        return {tech_id: CatalogTech(tech_id, name)
+                for tech_id, name in db.session.execute(select(techs.c.id, techs.c.name))}
+
+    def refresh(self, force=False):
+        # the lock only guards the swap: under the ASGI server the requests of a worker share a
+        # thread and wait for the database on its event loop, so a lock held across the queries
+        # would block every other request, including the one holding it
+        with uncounted():
+            version = self._fetch_version()
+            by_id = self._fetch() if force or version is None or version != self._version else None
+
+        with self._lock:
+            if by_id is not None:
+                self._by_id = by_id
+                self._by_name = {normalize(tech.name): tech for tech in by_id.values()}
+                self._version = version
+            self._checked_at = time.monotonic()
+
+    def _load_names(self, names):
+        """Add the techs named ``names`` (normalized) that the table has and the catalog misses."""
+        with uncounted():
+            rows = db.session.execute(select(techs.c.id, techs.c.name)
+                                      .where(func.lower(func.trim(techs.c.name)).in_(names))).all()
+
+        with self._lock:
+            for tech_id, name in rows:
+                tech = CatalogTech(tech_id, name)
+                self._by_id[tech.id] = tech
+                self._by_name[normalize(tech.name)] = tech
+
+    def _ensure_fresh(self):
+        interval = current_app.config.get('TECH_CATALOG_CHECK_INTERVAL', 30)
+        if self._checked_at is None or time.monotonic() - self._checked_at > interval:
+            self.refresh()
+
+    def get(self, tech_name):
+        found = self.get_many([tech_name])
+        return found[0] if found else None
+
+    def get_many(self, tech_names):
+        self._ensure_fresh()
+        names = [normalize(tech_name) for tech_name in tech_names]
+
+        missing = {name for name in names if name not in self._by_name}
+        if missing:
+            self._load_names(missing)
+
+        found = (self._by_name.get(name) for name in names)
+        return list({tech.id: tech for tech in found if tech is not None}.values())
+
+    def all(self):
+        self._ensure_fresh()
+        return list(self._by_id.values())
+
+    def names(self, tech_ids):
+        """Names of ``tech_ids`` in order; an id missing from the catalog triggers one reload."""
+        self._ensure_fresh()
+        if any(tech_id not in self._by_id for tech_id in tech_ids):
+            self.refresh(force=True)
+
+        return [self._by_id[tech_id].name for tech_id in tech_ids if tech_id in self._by_id]
+
+
+tech_catalog = TechCatalog()
@@ -0,0 +1,22 @@
+"""Fixtures for test suites of the app, loaded with ``pytest_plugins = ['app.testing']`` in a conftest.
+
+Needs pytest, which is in requirements-dev.txt.
+"""
+import pytest
+
+from app.configs.query_inspection import repeated_statements
+
+
+@pytest.fixture
+def no_n_plus_one():
+    """Fail the test if a request it makes sends the same statement shape three times or more.
+
+    The patterns found so far are available as the fixture's value.
+    """
+    with repeated_statements(threshold=3) as found:
+        yield found
+
+    if found:
+        pytest.fail('N+1 queries:\n' + '\n'.join(
+            f"  {item['request']}: {item['count']} x from {item['origin']}: {item['statement']}" for item in found
+        ), pytrace=False)
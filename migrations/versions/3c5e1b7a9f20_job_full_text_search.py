@@ -0,0 +1,53 @@
+"""job full text search
+
+Revision ID: 3c5e1b7a9f20
+Revises: 9d63531dce8b
+Create Date: 2026-10-18 09:10:42.118204
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3c5e1b7a9f20'
+down_revision = '9d63531dce8b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(
+            "ALTER TABLE jobs ADD COLUMN search_vector tsvector "
+            "GENERATED ALWAYS AS (to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, ''))) STORED"
+        )
+        op.create_index('ix_jobs_search_vector', 'jobs', ['search_vector'], postgresql_using='gin')
+
+    else:
+        op.execute("CREATE VIRTUAL TABLE jobs_fts USING fts5(name, description, content='jobs', content_rowid='id')")
+        op.execute(
+            "CREATE TRIGGER jobs_fts_insert AFTER INSERT ON jobs BEGIN "
+            "INSERT INTO jobs_fts(rowid, name, description) VALUES (new.id, new.name, new.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER jobs_fts_delete AFTER DELETE ON jobs BEGIN "
+            "INSERT INTO jobs_fts(jobs_fts, rowid, name, description) VALUES ('delete', old.id, old.name, old.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER jobs_fts_update AFTER UPDATE OF name, description ON jobs BEGIN "
+            "INSERT INTO jobs_fts(jobs_fts, rowid, name, description) VALUES ('delete', old.id, old.name, old.description); "
+            "INSERT INTO jobs_fts(rowid, name, description) VALUES (new.id, new.name, new.description); END"
+        )
+        op.execute("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_jobs_search_vector', table_name='jobs')
+        op.drop_column('jobs', 'search_vector')
+
+    else:
+        op.execute('DROP TRIGGER jobs_fts_update')
+        op.execute('DROP TRIGGER jobs_fts_delete')
+        op.execute('DROP TRIGGER jobs_fts_insert')
+        op.execute('DROP TABLE jobs_fts')
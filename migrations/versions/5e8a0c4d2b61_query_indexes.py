@@ -0,0 +1,39 @@
+"""query indexes
+
+Revision ID: 5e8a0c4d2b61
+Revises: 7b2d4e6f8a13
+Create Date: 2026-10-18 11:02:47.310522
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e8a0c4d2b61'
+down_revision = '7b2d4e6f8a13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # GET /api and its keyset pages: the jobs nobody has taken yet, by id
+    op.create_index('ix_jobs_open', 'jobs', ['id'], unique=False,
+                    postgresql_where=sa.text('progress IS NULL'), sqlite_where=sa.text('progress IS NULL'))
+    # the per-user job lists (optionally by progress) and the open jobs (developer_id IS NULL)
+    op.create_index('ix_jobs_contractor_id_id', 'jobs', ['contractor_id', 'id'], unique=False)
+    op.create_index('ix_jobs_developer_id_id', 'jobs', ['developer_id', 'id'], unique=False)
+    # GET /api/job/info
+    op.create_index(op.f('ix_jobs_price'), 'jobs', ['price'], unique=False)
+    op.create_index('ix_jobs_difficulty_level_lower', 'jobs', [sa.text('lower(difficulty_level)')], unique=False)
+    # the developers' technologies, aggregated per developer
+    op.create_index('ix_developers_techs_developer_id_tech_id', 'developers_techs', ['developer_id', 'tech_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_developers_techs_developer_id_tech_id', table_name='developers_techs')
+    op.drop_index('ix_jobs_difficulty_level_lower', table_name='jobs')
+    op.drop_index(op.f('ix_jobs_price'), table_name='jobs')
+    op.drop_index('ix_jobs_developer_id_id', table_name='jobs')
+    op.drop_index('ix_jobs_contractor_id_id', table_name='jobs')
+    op.drop_index('ix_jobs_open', table_name='jobs')
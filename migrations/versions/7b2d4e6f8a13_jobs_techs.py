@@ -0,0 +1,49 @@
+"""jobs techs
+
+Revision ID: 7b2d4e6f8a13
+Revises: 3c5e1b7a9f20
+Create Date: 2026-10-18 09:58:03.527741
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b2d4e6f8a13'
+down_revision = '3c5e1b7a9f20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('jobs_techs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('tech_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['tech_id'], ['techs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('job_id', 'tech_id')
+    )
+    op.create_index(op.f('ix_jobs_techs_tech_id'), 'jobs_techs', ['tech_id'], unique=False)
+
+    # tag the jobs that already exist through the full-text index created in 3c5e1b7a9f20
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(
+            "INSERT INTO jobs_techs (job_id, tech_id) "
+            "SELECT jobs.id, techs.id FROM jobs JOIN techs "
+            "ON jobs.search_vector @@ plainto_tsquery('simple', techs.name)"
+        )
+
+    else:
+        op.execute(
+            "INSERT INTO jobs_techs (job_id, tech_id) "
+            "SELECT jobs_fts.rowid, techs.id FROM techs JOIN jobs_fts "
+            "ON jobs_fts MATCH '\"' || replace(techs.name, '\"', '\"\"') || '\"'"
+        )
+
+
+def downgrade():
+    op.drop_index(op.f('ix_jobs_techs_tech_id'), table_name='jobs_techs')
+    op.drop_table('jobs_techs')
@@ -0,0 +1,25 @@
+"""job version
+
+Revision ID: a4c9e2f7d310
+Revises: 5e8a0c4d2b61
+Create Date: 2026-10-18 13:20:05.118214
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4c9e2f7d310'
+down_revision = '5e8a0c4d2b61'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # bumped by every write to the job, so a write can require the version it was based on
+    op.add_column('jobs', sa.Column('version_id', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    op.drop_column('jobs', 'version_id')
@@ -0,0 +1,36 @@
+"""job filter indexes
+
+Revision ID: c7f3a9d2e5b4
+Revises: a4c9e2f7d310
+Create Date: 2026-10-18 16:42:19.503871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7f3a9d2e5b4'
+down_revision = 'a4c9e2f7d310'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # GET /api/job/info: a difficulty, then a price range or expiration window in sort order,
+    # the id breaking ties as in the keyset. They replace the single column indexes they start with
+    op.create_index('ix_jobs_difficulty_price', 'jobs', [sa.text('lower(difficulty_level)'), 'price', 'id'], unique=False)
+    op.create_index('ix_jobs_difficulty_expiration', 'jobs', [sa.text('lower(difficulty_level)'), 'expiration_date', 'id'], unique=False)
+    op.create_index('ix_jobs_price_id', 'jobs', ['price', 'id'], unique=False)
+    op.create_index('ix_jobs_expiration_date_id', 'jobs', ['expiration_date', 'id'], unique=False)
+    op.drop_index('ix_jobs_difficulty_level_lower', table_name='jobs')
+    op.drop_index('ix_jobs_price', table_name='jobs')
+
+
+def downgrade():
+    op.create_index('ix_jobs_price', 'jobs', ['price'], unique=False)
+    op.create_index('ix_jobs_difficulty_level_lower', 'jobs', [sa.text('lower(difficulty_level)')], unique=False)
+    op.drop_index('ix_jobs_expiration_date_id', table_name='jobs')
+    op.drop_index('ix_jobs_price_id', table_name='jobs')
+    op.drop_index('ix_jobs_difficulty_expiration', table_name='jobs')
+    op.drop_index('ix_jobs_difficulty_price', table_name='jobs')
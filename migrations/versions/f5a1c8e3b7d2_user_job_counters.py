@@ -0,0 +1,43 @@
+"""user job counters
+
+Revision ID: f5a1c8e3b7d2
+Revises: c7f3a9d2e5b4
+Create Date: 2026-10-18 19:31:08.642117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5a1c8e3b7d2'
+down_revision = 'c7f3a9d2e5b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user_job_counters',
+    sa.Column('role', sa.String(length=10), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('open', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('ongoing', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('completed', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('role', 'user_id')
+    )
+
+    # count the jobs that already exist, as flask counters reconcile does
+    for role, column in (('contractor', 'contractor_id'), ('developer', 'developer_id')):
+        op.execute(
+            "INSERT INTO user_job_counters (role, user_id, total, open, ongoing, completed) "
+            f"SELECT '{role}', {column}, count(*), "
+            "sum(CASE WHEN progress IS NULL THEN 1 ELSE 0 END), "
+            "sum(CASE WHEN progress = 'ongoing' THEN 1 ELSE 0 END), "
+            "sum(CASE WHEN progress = 'completed' THEN 1 ELSE 0 END) "
+            f"FROM jobs WHERE {column} IS NOT NULL GROUP BY {column}"
+        )
+
+
+def downgrade():
+    op.drop_table('user_job_counters')
@@ -0,0 +1,126 @@
+import logging
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from flask_migrate import upgrade
+
+pytest_plugins = ['app.testing']
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """The app on a migrated SQLite database of its own, with query budgets enforced."""
+    from app import create_app
+    from app.services.current_user import user_cache
+    from app.services.response_cache import response_cache
+
+    monkeypatch.setenv('SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setenv('JWT_SECRET_KEY', 'test')
+    monkeypatch.setenv('ENFORCE_QUERY_BUDGETS', '1')
+    monkeypatch.setenv('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:1000')
+    monkeypatch.setenv('BATCH_READ_WORKERS', '0')
+
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        upgrade(directory=MIGRATIONS)
+    # the migrations' logging config disables the loggers that already exist
+    logging.getLogger('app.queries').disabled = False
+
+    # the caches are per process and would carry rows of the previous test's database
+    for cache in (user_cache, response_cache):
+        cache.clear()
+
+    yield app
+
+
+@pytest.fixture
+def postgres_app(monkeypatch):
+    """The app on the Postgres database named by ``TEST_POSTGRES_URI``, migrated for the test and emptied after it.
+
+    Tests using it are skipped when the variable is not set.
+    """
+    from app import create_app
+    from app.configs.database import db
+    from app.services.current_user import user_cache
+    from app.services.response_cache import response_cache
+    from flask_migrate import downgrade
+
+    uri = os.environ.get('TEST_POSTGRES_URI')
+    if not uri:
+        pytest.skip('TEST_POSTGRES_URI is not set')
+
+    monkeypatch.setenv('SQLALCHEMY_DATABASE_URI', uri)
+    monkeypatch.setenv('JWT_SECRET_KEY', 'test')
+    monkeypatch.setenv('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:1000')
+
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        upgrade(directory=MIGRATIONS)
+    logging.getLogger('app.queries').disabled = False
+    for cache in (user_cache, response_cache):
+        cache.clear()
+
+    yield app
+
+    with app.app_context():
+        db.session.remove()
+        downgrade(directory=MIGRATIONS, revision='base')
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user(app):
+    """``make_user(role, **columns)``: a saved developer or contractor and the headers of its token."""
+    from app.configs.database import db
+    from app.services.current_user import ROLES
+    from flask_jwt_extended import create_access_token
+
+    made = []
+
+    def make_user(role, **columns):
+        number = len(made) + 1
+        defaults = {'name': f'{role} {number}', 'email': f'{role}{number}@mail.com', 'password': 'Pass@123'}
+        if role == 'developer':
+            defaults['birthdate'] = datetime(1990, 1, 1)
+        else:
+            defaults['cnpj'] = f'00.000.000/0000-{number:02d}'
+
+        with app.app_context():
+            user = ROLES[role](**{**defaults, **columns})
+            db.session.add(user)
+            db.session.commit()
+            token = create_access_token(user)
+            made.append(user.id)
+            return user.id, {'Authorization': f'Bearer {token}'}
+
+    return make_user
+
+
+@pytest.fixture
+def make_job(app):
+    """``make_job(contractor_id, **columns)``: the id of a saved job, counted like the API counts it."""
+    from app.configs.database import db
+    from app.models.job_model import JobModel
+    from app.models.user_job_counters import UserJobCountersModel
+
+    def make_job(contractor_id, **columns):
+        values = {'name': 'Job', 'description': 'A job', 'price': 100.0, 'difficulty_level': 'easy',
+                  'expiration_date': datetime.now() + timedelta(days=30), **columns}
+        with app.app_context():
+            job = JobModel(contractor_id=contractor_id, **values)
+            db.session.add(job)
+            db.session.flush()
+            UserJobCountersModel.move_job(None, (job.contractor_id, job.developer_id, job.progress))
+            db.session.commit()
+            return job.id
+
+    return make_job
@@ -0,0 +1,99 @@
+import asyncio
+import json
+
+import pytest
+
+
+async def _request(asgi_app, method, path, query=b'', headers=(), body=b''):
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': method,
+             'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': query, 'root_path': '',
+             'headers': [(name.lower().encode(), value.encode()) for name, value in headers],
+             'client': ('127.0.0.1', 50000), 'server': ('testserver', 80)}
+    await asgi_app(scope, receive, send)
+
+    start = next(message for message in sent if message['type'] == 'http.response.start')
+    body = b''.join(message.get('body', b'') for message in sent if message['type'] == 'http.response.body')
+    return start['status'], json.loads(body) if body else None
+
+
+async def _shutdown(asgi_app):
+    messages = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        pass
+
+    await asgi_app({'type': 'lifespan'}, receive, send)
+
+
+def _serve(requests):
+    """Run ``requests(asgi_app)`` on one event loop against the app ``create_asgi_app`` builds."""
+    from app.asgi import create_asgi_app
+
+    asgi_app = create_asgi_app()
+
+    async def main():
+        try:
+            return await requests(asgi_app)
+        finally:
+            await _shutdown(asgi_app)
+
+    return asyncio.run(main())
+
+
+def test_the_asgi_app_serves_reads_and_writes(app, make_user, make_job):
+    contractor_id, headers = make_user('contractor')
+    job_id = make_job(contractor_id, name='Old name')
+    update = json.dumps({'name': 'New name'}).encode()
+
+    async def requests(asgi_app):
+        return await asyncio.gather(
+            _request(asgi_app, 'GET', f'/api/job/info/{job_id}'),
+            _request(asgi_app, 'GET', '/api'),
+            _request(asgi_app, 'PATCH', f'/api/job/update/{job_id}', body=update,
+                     headers=[*headers.items(), ('Content-Type', 'application/json'),
+                              ('Content-Length', str(len(update)))]),
+        )
+
+    (status, job), (listed_status, jobs), (updated_status, updated) = _serve(requests)
+
+    assert (status, job['id']) == (200, job_id)
+    assert listed_status == 200 and [job['id'] for job in jobs] == [job_id]
+    assert (updated_status, updated['name']) == (200, 'New name')
+
+
+class TestAsyncReads:
+    """The read views on the asyncpg engine; they only run on Postgres."""
+
+    @pytest.fixture
+    def app(self, postgres_app):
+        return postgres_app
+
+    def test_read_views_answer_like_the_wsgi_app(self, app, client, make_user, make_job):
+        contractor_id, _ = make_user('contractor')
+        job_ids = [make_job(contractor_id, difficulty_level=level) for level in ('beginner', 'advanced')]
+        paths = [('/api', b''), ('/api', b'limit=1'), (f'/api/job/info/{job_ids[0]}', b''),
+                 ('/api/job/info', b'difficulty=advanced'),
+                 ('/api/job', b'tech=python'), ('/api/contractors', b'')]
+
+        async def requests(asgi_app):
+            assert asgi_app.engine is not None
+            return await asyncio.gather(*(_request(asgi_app, 'GET', path, query) for path, query in paths))
+
+        answers = _serve(requests)
+
+        for (path, query), (status, body) in zip(paths, answers):
+            expected = client.get(f'{path}?{query.decode()}')
+            assert status == 200, path
+            assert body == expected.get_json(), path
@@ -0,0 +1,68 @@
+import pytest
+
+from app.services import current_user
+
+
+def test_a_batch_loads_the_user_of_its_token_once(client, make_user, make_job, monkeypatch):
+    contractor_id, headers = make_user('contractor')
+    job_id = make_job(contractor_id)
+    lookups = []
+    find_user = current_user._find_user
+    monkeypatch.setattr(current_user, '_find_user', lambda identity: lookups.append(identity) or find_user(identity))
+
+    response = client.post('/api/batch', headers=headers, json={'requests': [
+        {'path': '/api/contractors/profile'},
+        {'path': f'/api/job/update/{job_id}', 'method': 'PATCH', 'body': {'price': 5.0}},
+        {'path': f'/api/job/info/aut/{job_id}'},
+        {'path': '/api/contractors/dashboard'},
+    ]})
+
+    assert response.status_code == 200
+    assert [item['status'] for item in response.get_json()['responses']] == [200, 200, 200, 200]
+    assert response.get_json()['responses'][2]['body']['price'] == 5.0
+    assert len(lookups) == 1
+
+
+def test_each_request_of_a_batch_checks_its_token(client, make_user):
+    _, headers = make_user('contractor')
+
+    response = client.post('/api/batch', json={'requests': [
+        {'path': '/api/contractors/profile'},
+        {'path': '/api/contractors/profile', 'headers': headers},
+        {'path': '/api/contractors/profile', 'headers': {'Authorization': 'Bearer not-a-token'}},
+    ]})
+
+    assert [item['status'] for item in response.get_json()['responses']] == [401, 200, 422]
+
+
+@pytest.mark.parametrize('parallel', [False, True])
+def test_a_batch_decodes_its_token_once(app, client, make_user, make_job, monkeypatch, parallel):
+    import jwt
+
+    app.config['BATCH_READ_WORKERS'] = 2
+    contractor_id, headers = make_user('contractor')
+    _, other_headers = make_user('contractor')
+    job_id = make_job(contractor_id)
+    verified = []
+    decode = jwt.decode
+
+    def counted_decode(*args, **kwargs):
+        if (kwargs.get('options') or {}).get('verify_signature', True):
+            verified.append(args[0])
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(jwt, 'decode', counted_decode)
+
+    response = client.post('/api/batch', headers=headers, json={'parallel': parallel, 'requests': [
+        {'path': '/api/contractors/profile'},
+        {'path': f'/api/job/info/aut/{job_id}'},
+        {'path': '/api/contractors/dashboard'},
+        {'path': '/api/contractors/profile', 'headers': other_headers},
+    ]})
+
+    responses = response.get_json()['responses']
+    assert [item['status'] for item in responses] == [200, 200, 200, 200]
+    assert responses[0]['body']['email'] == 'contractor1@mail.com'
+    assert responses[3]['body']['email'] == 'contractor2@mail.com'
+    # the batch's token, then the one request sending another
+    assert verified == [headers['Authorization'].split()[1], other_headers['Authorization'].split()[1]]
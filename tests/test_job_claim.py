@@ -0,0 +1,27 @@
+from app.configs.database import db
+from app.models.job_model import JobModel
+from app.models.user_job_counters import UserJobCountersModel
+
+
+def test_claim_stays_within_its_query_budget(app, client, make_user, make_job):
+    contractor_id, _ = make_user('contractor')
+    developer_id, headers = make_user('developer')
+    job_id = make_job(contractor_id)
+
+    response = client.post(f'/api/job/claim/{job_id}', headers=headers)
+
+    assert response.status_code == 200
+    assert response.get_json()['progress'] == 'ongoing'
+    with app.app_context():
+        assert db.session.get(JobModel, job_id).developer_id == developer_id
+        assert UserJobCountersModel.of('developer', developer_id)['ongoing'] == 1
+        assert UserJobCountersModel.of('contractor', contractor_id)['open'] == 0
+
+
+def test_claiming_a_taken_job_conflicts(client, make_user, make_job):
+    contractor_id, _ = make_user('contractor')
+    developer_id, headers = make_user('developer')
+    job_id = make_job(contractor_id, developer_id=developer_id, progress='ongoing')
+
+    assert client.post(f'/api/job/claim/{job_id}', headers=headers).status_code == 409
+    assert client.post('/api/job/claim', headers=headers).status_code == 404
@@ -0,0 +1,37 @@
+def test_filtered_jobs_come_in_pages_of_the_default_limit(app, client, make_user, make_job):
+    app.config['PAGINATION_DEFAULT_LIMIT'] = 2
+    contractor_id, _ = make_user('contractor')
+    job_ids = [make_job(contractor_id, price=100.0 * number) for number in range(1, 6)]
+
+    first = client.get('/api/job/info?min_price=100&sort=price').get_json()
+    second = client.get(f"/api/job/info?min_price=100&sort=price&after={first['next_cursor']}").get_json()
+
+    assert [job['id'] for job in first['data']] == job_ids[:2]
+    assert [job['id'] for job in second['data']] == job_ids[2:4]
+
+
+def test_unfiltered_jobs_need_a_limit(client, make_user, make_job):
+    contractor_id, _ = make_user('contractor')
+    make_job(contractor_id)
+
+    assert client.get('/api/job/info').status_code == 400
+    assert client.get('/api/job/info?sort=-price').status_code == 400
+    assert client.get('/api/job/info?limit=101').status_code == 400
+
+    response = client.get('/api/job/info?limit=10')
+    assert response.status_code == 200
+    assert len(response.get_json()['data']) == 1
+
+
+def test_jobs_are_written_with_a_filterable_difficulty(client, make_user, make_job):
+    contractor_id, headers = make_user('contractor')
+    job_id = make_job(contractor_id)
+
+    created = client.post('/api/job/create', headers=headers, json={
+        'name': 'Job', 'description': 'A job', 'price': 1.0, 'difficulty_level': 'easy', 'expiration_date': '12/12/2031 23:59'})
+    assert created.status_code == 400
+    assert client.patch(f'/api/job/update/{job_id}', headers=headers, json={'difficulty_level': 'easy'}).status_code == 400
+
+    updated = client.patch(f'/api/job/update/{job_id}', headers=headers, json={'difficulty_level': ' Advanced'})
+    assert updated.get_json()['difficulty_level'] == 'advanced'
+    assert [job['id'] for job in client.get('/api/job/info?difficulty=advanced').get_json()['data']] == [job_id]
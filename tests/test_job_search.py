@@ -0,0 +1,53 @@
+import pytest
+from app.configs.database import db
+from app.models.jobs_techs import JobsTechsModel
+from app.models.tech_model import TechModel
+
+
+@pytest.fixture
+def python_jobs(app, make_user, make_job):
+    contractor_id, _ = make_user('contractor')
+    with app.app_context():
+        db.session.add(TechModel(name='Python'))
+        db.session.commit()
+
+    job_ids = []
+    for description in ('a python job', 'python scripts, python services and python tests'):
+        job_id = make_job(contractor_id, description=description)
+        with app.app_context():
+            JobsTechsModel.tag_job(job_id, description)
+            db.session.commit()
+        job_ids.append(job_id)
+
+    return job_ids
+
+
+def test_full_text_search_puts_the_best_match_first(client, python_jobs):
+    # cobol is not in the catalog, so the name and description are searched
+    response = client.get('/api/job?tech=python&tech=cobol')
+
+    assert [job['job_id'] for job in response.get_json()] == python_jobs[::-1]
+
+
+def test_known_techs_list_the_tagged_jobs_by_id(client, python_jobs):
+    response = client.get('/api/job?tech=python')
+    page = client.get('/api/job?tech=python&limit=1').get_json()
+
+    assert [job['job_id'] for job in response.get_json()] == python_jobs
+    assert [job['job_id'] for job in page['data']] == python_jobs[:1]
+
+
+def test_jobs_tagged_elsewhere_are_listed_with_and_without_a_cursor(app, client, make_user, make_job, python_jobs):
+    assert client.get('/api/job?tech=python&limit=5').status_code == 200
+
+    # tagged by another worker, after this one answered
+    contractor_id, _ = make_user('contractor')
+    job_id = make_job(contractor_id, description='python')
+    with app.app_context():
+        JobsTechsModel.tag_job(job_id, 'python')
+        db.session.commit()
+
+    listed = [job['job_id'] for job in client.get('/api/job?tech=python').get_json()]
+    paged = [job['job_id'] for job in client.get('/api/job?tech=python&limit=5').get_json()['data']]
+
+    assert listed == paged == [*python_jobs, job_id]
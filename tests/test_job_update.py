@@ -0,0 +1,105 @@
+import threading
+
+from app.configs.database import db
+from app.models.job_model import JobModel
+from app.models.user_job_counters import UserJobCountersModel
+
+
+def test_assigning_a_developer_updates_only_the_job(app, client, make_user, make_job):
+    contractor_id, headers = make_user('contractor')
+    developer_id, _ = make_user('developer', email='dev@mail.com')
+    job_id = make_job(contractor_id)
+
+    response = client.patch(f'/api/job/update/{job_id}', headers=headers, json={'developer': 'dev@mail.com'})
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['progress'] == 'ongoing'
+    assert body['version'] == 2
+    assert body['developer'] == [{'name': 'developer 2', 'email': 'dev@mail.com', 'birthdate': '01/01/1990'}]
+    with app.app_context():
+        assert db.session.get(JobModel, job_id).developer_id == developer_id
+        assert UserJobCountersModel.of('developer', developer_id)['ongoing'] == 1
+
+
+def test_assigning_an_unknown_developer_is_not_found(client, make_user, make_job):
+    contractor_id, headers = make_user('contractor')
+    job_id = make_job(contractor_id)
+
+    response = client.patch(f'/api/job/update/{job_id}', headers=headers, json={'developer': 'nobody@mail.com'})
+
+    assert response.status_code == 404
+
+
+def test_updating_an_assigned_job_keeps_its_developer(client, make_user, make_job):
+    contractor_id, headers = make_user('contractor')
+    developer_id, _ = make_user('developer', email='dev@mail.com')
+    job_id = make_job(contractor_id, developer_id=developer_id, progress='ongoing')
+
+    response = client.patch(f'/api/job/update/{job_id}', headers=headers, json={'price': 250.0})
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['price'] == 250.0
+    assert body['progress'] == 'ongoing'
+    assert body['developer'] == [{'name': 'developer 2', 'email': 'dev@mail.com', 'birthdate': '01/01/1990'}]
+
+
+def test_updating_a_missing_job_is_not_found(client, make_user):
+    _, headers = make_user('contractor')
+
+    assert client.patch('/api/job/update/999', headers=headers, json={'price': 1.0}).status_code == 404
+
+
+def test_only_the_contractor_of_the_job_updates_it(client, make_user, make_job):
+    contractor_id, _ = make_user('contractor')
+    _, other_contractor = make_user('contractor')
+    _, developer = make_user('developer')
+    job_id = make_job(contractor_id)
+
+    for headers in (other_contractor, developer):
+        assert client.patch(f'/api/job/update/{job_id}', headers=headers, json={'price': 1.0}).status_code == 403
+
+
+def test_an_update_from_a_stale_version_conflicts(client, make_user, make_job):
+    contractor_id, headers = make_user('contractor')
+    job_id = make_job(contractor_id)
+
+    assert client.patch(f'/api/job/update/{job_id}', headers=headers, json={'price': 1.0, 'version': 1}).status_code == 200
+    assert client.patch(f'/api/job/update/{job_id}', headers=headers, json={'price': 2.0, 'version': 1}).status_code == 409
+
+
+def test_concurrent_updates_of_one_version_apply_once(app, make_user, make_job):
+    contractor_id, headers = make_user('contractor')
+    job_id = make_job(contractor_id)
+    writers = 4
+    start = threading.Barrier(writers)
+    statuses = []
+
+    def update(price):
+        client = app.test_client()
+        start.wait()
+        statuses.append(client.patch(f'/api/job/update/{job_id}', headers=headers,
+                                     json={'price': price, 'version': 1}).status_code)
+
+    threads = [threading.Thread(target=update, args=(float(price),)) for price in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(statuses) == [200] + [409] * (writers - 1)
+    with app.app_context():
+        job = db.session.get(JobModel, job_id)
+        assert job.version_id == 2
+        assert UserJobCountersModel.of('contractor', contractor_id)['total'] == 1
+
+
+def test_an_empty_update_is_rejected_without_a_new_version(app, client, make_user, make_job):
+    contractor_id, headers = make_user('contractor')
+    job_id = make_job(contractor_id)
+
+    assert client.patch(f'/api/job/update/{job_id}', headers=headers, json={}).status_code == 409
+    assert client.patch(f'/api/job/update/{job_id}', headers=headers, json={'version': 1}).status_code == 409
+    with app.app_context():
+        assert db.session.get(JobModel, job_id).version_id == 1
@@ -0,0 +1,60 @@
+import pytest
+
+
+@pytest.fixture
+def listed(app, make_user, make_job):
+    app.config['PAGINATION_DEFAULT_LIMIT'] = 2
+    contractor_id, _ = make_user('contractor')
+    make_user('contractor')
+    make_user('contractor')
+    for _ in range(3):
+        make_user('developer')
+        make_job(contractor_id)
+
+
+@pytest.mark.parametrize('path', ['/api', '/api/developers', '/api/contractors'])
+def test_lists_answer_one_page_by_default(client, listed, path):
+    first = client.get(path)
+    last = client.get(f'{path}?page=2')
+
+    assert first.status_code == 200
+    assert len(first.get_json()) == 2
+    assert len(last.get_json()) == 1
+    assert client.get(f'{path}?per_page=3').get_json() == first.get_json() + last.get_json()
+
+
+@pytest.mark.parametrize('path', ['/api', '/api/developers', '/api/contractors'])
+def test_lists_cap_the_page_size(client, listed, path):
+    assert client.get(f'{path}?per_page=101').status_code == 400
+    assert client.get(f'{path}?page=3').status_code == 404
+
+
+@pytest.mark.parametrize('user', ['contractor', 'developer'])
+def test_job_lists_of_a_user_cap_the_page_size(client, make_user, make_job, user):
+    contractor_id, contractor_headers = make_user('contractor')
+    developer_id, developer_headers = make_user('developer')
+    for _ in range(6):
+        make_job(contractor_id, developer_id=developer_id, progress='ongoing')
+    headers = contractor_headers if user == 'contractor' else developer_headers
+    path = f'/api/{user}s/jobs'
+
+    assert len(client.get(path, headers=headers).get_json()) == 5
+    assert len(client.get(f'{path}?per_page=6', headers=headers).get_json()) == 6
+    assert client.get(f'{path}?per_page=101', headers=headers).status_code == 400
+    assert client.get(f'{path}?per_page=0', headers=headers).status_code == 400
+
+
+@pytest.mark.parametrize('path', ['/api', '/api/developers', '/api/contractors', '/api/contractors/jobs',
+                                  '/api/developers/jobs', '/api/job?tech=python', '/api/job/info?sort=price'])
+@pytest.mark.parametrize('values', [['x'], [True], [1.5], [None]])
+def test_tampered_cursors_are_rejected(client, make_user, path, values):
+    from app.services.pagination import encode_cursor
+
+    _, headers = make_user('developer' if path.startswith('/api/developers/') else 'contractor')
+    if path.endswith('price'):
+        values = [100.0, *values]
+    separator = '&' if '?' in path else '?'
+
+    response = client.get(f'{path}{separator}after={encode_cursor(values)}', headers=headers)
+
+    assert response.status_code == 400
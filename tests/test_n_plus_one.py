@@ -0,0 +1,73 @@
+import pytest
+from app.configs.database import db
+from app.configs.query_inspection import repeated_statements
+from app.models.developer_model import DeveloperModel
+from app.models.jobs_techs import JobsTechsModel
+from app.models.tech_model import TechModel
+from sqlalchemy import select
+
+
+@pytest.fixture
+def dataset(app, make_user, make_job):
+    """Three contractors with two jobs each, a third of them taken by one of four developers knowing two techs."""
+    with app.app_context():
+        db.session.add_all([TechModel(name='Python'), TechModel(name='Go')])
+        db.session.commit()
+        techs = TechModel.query.all()
+
+    contractors = [make_user('contractor') for _ in range(3)]
+    developers = [make_user('developer') for _ in range(4)]
+    with app.app_context():
+        for developer in DeveloperModel.query.all():
+            developer.technologies = techs
+        db.session.commit()
+
+    for index in range(6):
+        developer_id = developers[index % 4][0] if index % 3 == 0 else None
+        job_id = make_job(contractors[index % 3][0], description='python and go',
+                          developer_id=developer_id, progress='ongoing' if developer_id else None)
+        with app.app_context():
+            JobsTechsModel.tag_job(job_id, 'python and go')
+            db.session.commit()
+
+    return {'contractor': contractors[0][1], 'developer': developers[0][1]}
+
+
+@pytest.mark.parametrize('path', [
+    '/api', '/api?limit=2', '/api?stream=1',
+    '/api/developers', '/api/developers?limit=2', '/api/developers?stream=1',
+    '/api/contractors', '/api/contractors?limit=2',
+    '/api/job?tech=python', '/api/job?tech=python&limit=2', '/api/job?tech=python&tech=cobol',
+    '/api/job/info?min_price=0', '/api/job/info?limit=2&sort=-price',
+])
+def test_public_lists_send_no_repeated_statements(client, dataset, no_n_plus_one, path):
+    response = client.get(path)
+
+    assert response.status_code == 200
+    response.get_data()
+
+
+@pytest.mark.parametrize('role, path', [
+    ('contractor', '/api/contractors/jobs'), ('contractor', '/api/contractors/jobs?limit=1'),
+    ('contractor', '/api/contractors/jobs?stream=1'),
+    ('developer', '/api/developers/jobs'), ('developer', '/api/developers/jobs?limit=1'),
+])
+def test_job_lists_send_no_repeated_statements(client, dataset, no_n_plus_one, role, path):
+    response = client.get(path, headers=dataset[role])
+
+    assert response.status_code == 200
+    response.get_data()
+
+
+def test_repeated_statements_are_found(app, client):
+    @app.get('/test/one-query-per-tech')
+    def one_query_per_tech():
+        for name in ('Python', 'Go', 'Rust'):
+            db.session.execute(select(TechModel).where(TechModel.name == name)).first()
+        return {}
+
+    with repeated_statements(threshold=3) as found:
+        client.get('/test/one-query-per-tech')
+
+    assert [item['count'] for item in found] == [3]
+    assert found[0]['request'] == 'GET /test/one-query-per-tech'
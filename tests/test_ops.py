@@ -0,0 +1,25 @@
+import pytest
+
+OPS_PATHS = ['/api/ops/cache', '/api/ops/pool', '/api/ops/metrics']
+
+
+@pytest.mark.parametrize('path', OPS_PATHS)
+def test_ops_routes_need_the_ops_token(app, client, path):
+    assert client.get(path).status_code == 404
+
+    app.config['OPS_TOKEN'] = 'secret'
+
+    assert client.get(path).status_code == 401
+    assert client.get(path, headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    assert client.get(path, headers={'Authorization': 'Bearer secret'}).status_code == 200
+
+
+@pytest.mark.parametrize('value, enabled', [('1', True), ('true', True), ('0', False), ('false', False), ('', False)])
+def test_request_metrics_can_be_turned_off(app, monkeypatch, value, enabled):
+    from app import create_app
+
+    monkeypatch.setenv('REQUEST_METRICS', value)
+    response = create_app().test_client().get('/api/contractors')
+
+    assert response.status_code == 200
+    assert ('Server-Timing' in response.headers) is enabled
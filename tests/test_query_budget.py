@@ -0,0 +1,50 @@
+import logging
+
+import pytest
+from app.configs.database import db
+from app.configs.query_counter import query_budget
+from app.exceptions.query_budget_exceptions import QueryBudgetExceededError
+from app.models.tech_model import TechModel
+from sqlalchemy import select
+
+
+@pytest.fixture
+def budgeted_views(app):
+    @app.post('/test/write-over-budget')
+    @query_budget(1)
+    def write_over_budget():
+        db.session.add(TechModel(name='Cobol'))
+        db.session.flush()
+        db.session.execute(select(TechModel.id))
+        db.session.commit()
+        return {}, 201
+
+    @app.post('/test/read-after-commit')
+    @query_budget(1)
+    def read_after_commit():
+        db.session.add(TechModel(name='Cobol'))
+        db.session.commit()
+        db.session.execute(select(TechModel.id))
+        return {}, 201
+
+
+def tech_names(app):
+    with app.app_context():
+        return db.session.execute(select(TechModel.name)).scalars().all()
+
+
+def test_an_over_budget_view_fails_before_its_commit(app, client, budgeted_views):
+    with pytest.raises(QueryBudgetExceededError):
+        client.post('/test/write-over-budget')
+
+    assert 'Cobol' not in tech_names(app)
+
+
+def test_statements_after_the_commit_are_only_logged(app, client, budgeted_views, caplog):
+    with caplog.at_level(logging.WARNING, logger='app.queries'):
+        response = client.post('/test/read-after-commit')
+
+    assert response.status_code == 201
+    assert 'read_after_commit ran 2 SQL statements, its budget is 1' in caplog.text
+    assert 'Cobol' in tech_names(app)
+
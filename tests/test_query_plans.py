@@ -0,0 +1,21 @@
+from app.commands.plan_commands import _sequential_scans
+
+
+def test_controller_queries_use_indexes(postgres_app):
+    result = postgres_app.test_cli_runner().invoke(args=['plans', 'check'])
+
+    assert result.exit_code == 0, result.output
+
+
+def test_plans_report_tables_read_whole():
+    seq_scan = {'Node Type': 'Seq Scan', 'Relation Name': 'jobs', 'Total Cost': 1000.0}
+    index_walk = {'Node Type': 'Index Scan', 'Relation Name': 'jobs', 'Index Name': 'jobs_pkey',
+                  'Filter': '(progress IS NULL)', 'Total Cost': 1000.0}
+    index_lookup = {**index_walk, 'Index Cond': '(id = 1)'}
+
+    assert list(_sequential_scans(seq_scan)) == ['jobs']
+    assert list(_sequential_scans(index_walk)) == ['jobs via jobs_pkey']
+    assert list(_sequential_scans(index_lookup)) == []
+    # a page read in index order stops early
+    assert list(_sequential_scans({'Node Type': 'Limit', 'Total Cost': 20.0, 'Plans': [index_walk]})) == []
+    assert list(_sequential_scans({'Node Type': 'Limit', 'Total Cost': 900.0, 'Plans': [index_walk]})) == ['jobs via jobs_pkey']
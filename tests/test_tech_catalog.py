@@ -0,0 +1,20 @@
+def test_techs_added_after_the_catalog_loaded_are_found(app, client, make_user):
+    from app.configs.database import db
+    from app.models.tech_model import TechModel
+
+    _, headers = make_user('developer')
+    assert client.get('/api/developers').status_code == 200
+    with app.app_context():
+        db.session.add(TechModel(name='Rust'))
+        db.session.commit()
+
+    response = client.patch('/api/developers/update', headers=headers, json={'technologies': [{'name': 'rust'}]})
+
+    assert response.status_code == 200, response.get_json()
+    assert [tech['name'] for tech in response.get_json()['technologies']] == ['Rust']
+
+    response = client.patch('/api/developers/update', headers=headers,
+                            json={'technologies': [{'name': 'rust'}, {'name': 'cobol'}]})
+
+    assert response.status_code == 201
+    assert response.get_json()['technologies'] == {'technologies_added': ['rust'], 'technologies_not_found': ['cobol']}